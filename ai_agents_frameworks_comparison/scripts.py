@@ -34,14 +34,33 @@ def test_llama_index():
     env = os.environ.copy()
     env["PYTHONPATH"] = str(llama_index_dir / "src")
 
-    # Only run tests that work (excluding agent_workflow tests)
+    # Only run tests that work, without the agent workflow test calling the
+    # OpenAI API
     result = subprocess.run(
         [
             sys.executable,
             "-m",
             "pytest",
             "tests/test_agent.py",
+            "tests/test_agent_workflow.py",
+            "--deselect",
+            "tests/test_agent_workflow.py::TestAgent",
             "tests/tests_tools/test_select_from_db.py",
+            "tests/tests_tools/test_database.py",
+            "tests/tests_tools/test_query_cache.py",
+            "tests/tests_tools/test_paging.py",
+            "tests/tests_tools/test_serialization.py",
+            "tests/tests_tools/test_migrations.py",
+            "tests/tests_tools/test_search_influencers.py",
+            "tests/tests_tools/test_query_governor.py",
+            "tests/tests_tools/test_http_client.py",
+            "tests/tests_tools/test_async_http_client.py",
+            "tests/tests_tools/test_http_cache.py",
+            "tests/tests_tools/test_parsing.py",
+            "tests/tests_tools/test_paper_store.py",
+            "tests/tests_tools/test_single_flight.py",
+            "tests/tests_tools/test_rate_limiter.py",
+            "tests/tests_tools/test_local_database.py",
             "-v",
         ],
         cwd=llama_index_dir,
@@ -66,6 +85,21 @@ def test_smolagents():
     return result.returncode
 
 
+def test_scripts():
+    """Run tests for the data scripts."""
+    root_dir = get_root_dir()
+    scripts_dir = root_dir / "scripts"
+
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(scripts_dir)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "tests", "-v"], cwd=scripts_dir, env=env
+    )
+
+    return result.returncode
+
+
 def test_all():
     """Run tests for all frameworks."""
     print("Running LangGraph tests...")
@@ -77,11 +111,17 @@ def test_all():
     print("\nRunning Smolagents tests...")
     smolagents_result = test_smolagents()
 
-    total_failed = langgraph_result + llama_index_result + smolagents_result
+    print("\nRunning scripts tests...")
+    scripts_result = test_scripts()
+
+    total_failed = (
+        langgraph_result + llama_index_result + smolagents_result + scripts_result
+    )
 
     print(f"\n=== SUMMARY ===")
     print(f"LangGraph: {'PASSED' if langgraph_result == 0 else 'FAILED'}")
     print(f"LlamaIndex: {'PASSED' if llama_index_result == 0 else 'FAILED'}")
     print(f"Smolagents: {'PASSED' if smolagents_result == 0 else 'FAILED'}")
+    print(f"Scripts: {'PASSED' if scripts_result == 0 else 'FAILED'}")
 
     return total_failed
@@ -1,20 +1,27 @@
 """LangGraph Technology Scout Agent."""
 
-from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import create_react_agent
+from typing import TYPE_CHECKING
+
 from langchain_core.tools import BaseTool
 
+# The OpenAI client and the prebuilt agents take most of the startup time, so
+# they are only imported when the agent is created.
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 
 DEFAULT_MODEL_ID = "gpt-4o"
 
 
-def get_model(model_id: str = DEFAULT_MODEL_ID) -> ChatOpenAI:
+def get_model(model_id: str = DEFAULT_MODEL_ID) -> "ChatOpenAI":
     """Get a model."""
+    from langchain_openai import ChatOpenAI
+
     return ChatOpenAI(model=model_id, temperature=0)
 
 
 def create_agent(
-    model: ChatOpenAI | None = None,
+    model: "ChatOpenAI | None" = None,
     tools: list[BaseTool] | None = None,
     system_prompt: str = """You are a helpful technology scout assistant that can help users find and analyze technology trends, AI personalities, and research papers.
 
@@ -52,6 +59,8 @@ Remember to think through your approach before acting, and be systematic in your
     Returns:
         The compiled LangGraph agent.
     """
+    from langgraph.prebuilt import create_react_agent
+
     if model is None:
         model = get_model()
 
@@ -1,15 +1,51 @@
 """Main module for LangGraph Technology Scout Agent."""
 
-from technology_scout.agent import create_agent
-from technology_scout.tools.select_from_db import select_from_db_tool
+import threading
+from concurrent.futures import Future
+
+
+def build_agent() -> object:
+    """Imports the tools and creates the agent."""
+    from technology_scout.agent import create_agent
+    from technology_scout.tools.search_influencers import search_influencers_tool
+    from technology_scout.tools.select_from_db import (
+        fetch_next_page_tool,
+        select_from_db_paged_tool,
+        select_from_db_tool,
+    )
+
+    return create_agent(
+        tools=[
+            select_from_db_tool,
+            select_from_db_paged_tool,
+            fetch_next_page_tool,
+            search_influencers_tool,
+        ],
+    )
+
+
+def build_agent_in_background() -> Future:
+    """Builds the agent in a daemon thread, so that quitting does not wait for it.
+
+    Importing LangChain and creating the agent takes seconds, this lets the
+    user type the first question meanwhile.
+    """
+    agent_future = Future()
+
+    def build() -> None:
+        try:
+            agent_future.set_result(build_agent())
+        except BaseException as error:
+            agent_future.set_exception(error)
+
+    threading.Thread(target=build, daemon=True).start()
+    return agent_future
 
 
 def main() -> None:
     """Main function."""
 
-    agent = create_agent(
-        tools=[select_from_db_tool],
-    )
+    agent_future = build_agent_in_background()
 
     # For LangGraph, we can't use GradioUI directly like in smolagents
     # Instead, we'll provide a simple command line interface
@@ -22,6 +58,7 @@ def main() -> None:
             break
 
         try:
+            agent = agent_future.result()
             # LangGraph agents expect messages in a specific format
             response = agent.invoke(
                 {"messages": [{"role": "user", "content": user_input}]}
@@ -0,0 +1,159 @@
+"""Shared read-only SQLite connection manager for the database tools."""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+
+
+class ConnectionManager:
+    """Hands out one read-only SQLite connection per thread.
+
+    Connections are opened through a `mode=ro` URI (optionally `immutable=1`)
+    with memory-mapped I/O enabled, and are reused for every query issued from
+    the same thread. This keeps the cost of opening the file and parsing the
+    schema out of the tool calls, and is safe for both LangGraph's threaded
+    ToolNode and an asyncio loop (which always runs on a single thread).
+
+    When `in_memory` is set, the database is copied once into a shared-cache
+    in-memory database, and per-thread connections point to that copy.
+
+    Args:
+        path_to_database (Path): The SQLite file to serve.
+        immutable (bool): Open the file with `immutable=1`. Only use it when
+            nothing writes to the file while the process is running.
+        in_memory (bool): Serve queries from an in-memory copy of the file.
+        mmap_size (int): Value of `PRAGMA mmap_size` for file connections.
+    """
+
+    def __init__(
+        self,
+        path_to_database: Path,
+        immutable: bool = False,
+        in_memory: bool = False,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+    ) -> None:
+        self.path_to_database = Path(path_to_database)
+        self.immutable = immutable
+        self.in_memory = in_memory
+        self.mmap_size = mmap_size
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._memory_keeper: sqlite3.Connection | None = None
+        self._generation = 0
+
+    @property
+    def uri(self) -> str:
+        """The URI used by per-thread connections."""
+        if self.in_memory:
+            return f"file:technology_scout_{id(self)}?mode=memory&cache=shared"
+
+        uri = f"{self.path_to_database.resolve().as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Returns the connection of the calling thread, opening it if needed."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._open()
+            self._local.connection = connection
+        return connection
+
+    def data_version(self) -> tuple[int, int]:
+        """Returns a token that changes whenever the database content changes.
+
+        The token combines the modification time of the file with the
+        `PRAGMA data_version` of the calling thread's connection, so that it
+        also catches commits that do not touch the file timestamp. The
+        in-memory copy never changes once loaded.
+        """
+        if self.in_memory:
+            return (0, 0)
+
+        connection = self.get_connection()
+        (data_version,) = connection.execute("PRAGMA data_version").fetchone()
+        if data_version != getattr(self._local, "data_version", data_version):
+            with self._lock:
+                self._generation += 1
+        self._local.data_version = data_version
+
+        return (os.stat(self.path_to_database).st_mtime_ns, self._generation)
+
+    def open_connection(self) -> sqlite3.Connection:
+        """Opens a new connection that is not bound to the calling thread.
+
+        The caller owns the connection and is responsible for closing it and
+        for serializing its use across threads.
+        """
+        self._ensure_source()
+        return self._connect()
+
+    def close(self) -> None:
+        """Closes every connection opened by the manager."""
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+            if self._memory_keeper is not None:
+                self._memory_keeper.close()
+                self._memory_keeper = None
+
+        self._local = threading.local()
+
+    def _open(self) -> sqlite3.Connection:
+        self._ensure_source()
+        connection = self._connect()
+
+        with self._lock:
+            self._prune_dead_threads()
+            previous = self._connections.pop(threading.get_ident(), None)
+            if previous is not None:
+                previous.close()
+            self._connections[threading.get_ident()] = connection
+
+        return connection
+
+    def _connect(self) -> sqlite3.Connection:
+        # Per-thread connections are only ever used by their owner thread, but
+        # `close` may run on another one, hence `check_same_thread=False`.
+        connection = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        if not self.in_memory:
+            connection.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def _ensure_source(self) -> None:
+        if not self.path_to_database.exists():
+            raise FileNotFoundError(
+                f"Database file not found at {self.path_to_database}"
+            )
+
+        if not self.in_memory or self._memory_keeper is not None:
+            return
+
+        with self._lock:
+            if self._memory_keeper is not None:
+                return
+
+            keeper = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+            source = sqlite3.connect(
+                f"{self.path_to_database.resolve().as_uri()}?mode=ro", uri=True
+            )
+            try:
+                source.backup(keeper)
+            finally:
+                source.close()
+            self._memory_keeper = keeper
+
+    def _prune_dead_threads(self) -> None:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in list(self._connections):
+            if ident not in alive:
+                self._connections.pop(ident).close()
@@ -0,0 +1,221 @@
+"""Paging of query results under a token budget."""
+
+import contextlib
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, ContextManager
+
+from technology_scout.tools.query_cache import normalize_sql
+from technology_scout.tools.query_governor import QueryGovernor, QueryRejected
+from technology_scout.tools.serialization import to_compact_table
+
+# Rough average for English text, good enough to budget prompt space.
+CHARS_PER_TOKEN = 4
+MIN_CHARS_PER_COLUMN = 16
+DEFAULT_MAX_OPEN_CURSORS = 32
+DEFAULT_CURSOR_TTL = 600.0
+
+
+@dataclass
+class Page:
+    """A page of rendered rows."""
+
+    columns: list[str]
+    rows: list[tuple[Any, ...]]
+    first_row: int
+    continuation_token: str | None
+    max_chars_per_column: int
+
+
+@dataclass
+class _OpenCursor:
+    query: str
+    columns: list[str]
+    pending: deque = field(default_factory=deque)
+    rows_read: int = 0
+    rows_served: int = 0
+    exhausted: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class CursorRegistry:
+    """Keeps the position of paged queries between tool calls.
+
+    Paged queries run on a single connection, so that a continuation token
+    can be redeemed from any thread. Rows are only read from SQLite when a
+    page needs them, by running the query again from the position of the
+    cursor with `LIMIT` and `OFFSET`: no statement is left unfinished between
+    two pages, as it would hold a shared lock on the database and block the
+    writers, e.g. the ingestion script, until the cursor expires. The pages
+    of a query may thus miss or repeat rows written in between.
+
+    Args:
+        connection (sqlite3.Connection): A connection usable from any thread.
+        max_open_cursors (int): Oldest cursors are closed beyond this number.
+        ttl (float): Seconds after which an unused cursor is dropped.
+        governor (QueryGovernor | None): Checks the queries before opening
+            their cursor, and limits the time spent reading each page.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        max_open_cursors: int = DEFAULT_MAX_OPEN_CURSORS,
+        ttl: float = DEFAULT_CURSOR_TTL,
+        governor: QueryGovernor | None = None,
+    ) -> None:
+        self.connection = connection
+        self.max_open_cursors = max_open_cursors
+        self.ttl = ttl
+        self.governor = governor
+
+        self._cursors: OrderedDict[str, _OpenCursor] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, query: str) -> str:
+        """Checks a query and returns the token of its cursor."""
+        with self._lock:
+            self._expire()
+
+            if self.governor is not None:
+                # Paging already bounds what is read, so no LIMIT is added.
+                query = self.governor.prepare(
+                    self.connection, query, inject_limit=False
+                )
+            else:
+                query = normalize_sql(query)
+            # Pragmas cannot be run as a subquery, and return few rows: they
+            # are read at once.
+            is_pragma = query.startswith("pragma")
+            with self._time_limit():
+                cursor = self.connection.execute(
+                    query if is_pragma else f"select * from ({query}) limit 0"
+                )
+                rows = cursor.fetchall()
+            cursor.close()
+            columns = [column[0] for column in cursor.description or []]
+            token = secrets.token_urlsafe(8)
+            self._cursors[token] = _OpenCursor(
+                query=query,
+                columns=columns,
+                pending=deque(rows),
+                exhausted=is_pragma,
+            )
+
+            while len(self._cursors) > self.max_open_cursors:
+                self._cursors.popitem(last=False)
+
+        return token
+
+    def next_page(self, token: str, page_size: int, token_budget: int) -> Page:
+        """Reads the next page of a cursor.
+
+        At most `page_size` rows are returned. The token budget caps the
+        number of characters rendered per column and the number of rows: rows
+        that do not fit are kept for the next page. At least one row is always
+        returned when any is left.
+
+        Args:
+            token (str): The token returned by `open` or by a previous page.
+            page_size (int): Maximum number of rows of the page.
+            token_budget (int): Approximate number of tokens of the page.
+
+        Returns:
+            Page: The rows of the page.
+        """
+        with self._lock:
+            self._expire()
+
+            open_cursor = self._cursors.get(token)
+            if open_cursor is None:
+                raise KeyError(f"Unknown or expired continuation token: {token}")
+            open_cursor.last_used = time.monotonic()
+
+            # One row more than needed tells whether the cursor is exhausted.
+            missing = page_size + 1 - len(open_cursor.pending)
+            if missing > 0 and not open_cursor.exhausted:
+                try:
+                    with self._time_limit():
+                        rows = self.connection.execute(
+                            f"select * from ({open_cursor.query}) "
+                            f"limit {missing} offset {open_cursor.rows_read}"
+                        ).fetchall()
+                except QueryRejected:
+                    self._cursors.pop(token)
+                    raise
+                open_cursor.exhausted = len(rows) < missing
+                open_cursor.rows_read += len(rows)
+                open_cursor.pending.extend(rows)
+
+            budget_chars = token_budget * CHARS_PER_TOKEN
+            n_columns = max(1, len(open_cursor.columns))
+            max_chars = max(
+                MIN_CHARS_PER_COLUMN, budget_chars // (max(1, page_size) * n_columns)
+            )
+
+            rows: list[tuple[Any, ...]] = []
+            used_chars = sum(len(column) + 1 for column in open_cursor.columns)
+            while open_cursor.pending and len(rows) < page_size:
+                row_chars = sum(
+                    min(len(str(value)), max_chars) + 1
+                    for value in open_cursor.pending[0]
+                )
+                if rows and used_chars + row_chars > budget_chars:
+                    break
+                rows.append(open_cursor.pending.popleft())
+                used_chars += row_chars
+
+            first_row = open_cursor.rows_served
+            open_cursor.rows_served += len(rows)
+
+            done = open_cursor.exhausted and not open_cursor.pending
+            if done:
+                self._cursors.pop(token)
+
+        return Page(
+            columns=open_cursor.columns,
+            rows=rows,
+            first_row=first_row,
+            continuation_token=None if done else token,
+            max_chars_per_column=max_chars,
+        )
+
+    def _time_limit(self) -> ContextManager[None]:
+        if self.governor is None:
+            return contextlib.nullcontext()
+        return self.governor.time_limit(self.connection)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for token, open_cursor in list(self._cursors.items()):
+            if now - open_cursor.last_used > self.ttl:
+                self._cursors.pop(token)
+
+
+def render_page(page: Page) -> str:
+    """Renders a page as a compact text table followed by its paging status."""
+    if not page.rows:
+        return "[no rows]"
+
+    table = to_compact_table(
+        page.columns,
+        page.rows,
+        max_field_chars=page.max_chars_per_column,
+        max_rows=None,
+        drop_null_columns=False,
+    )
+
+    last_row = page.first_row + len(page.rows)
+    if page.continuation_token is None:
+        status = f"[rows {page.first_row + 1}-{last_row}, end of results]"
+    else:
+        status = (
+            f"[rows {page.first_row + 1}-{last_row}, more rows available: "
+            f'call fetch_next_page with continuation_token="{page.continuation_token}"]'
+        )
+
+    return f"{table}\n{status}"
@@ -0,0 +1,312 @@
+"""Local SQLite store of the papers fetched from Papers with Code.
+
+The papers the tools fetch are written through to the store, keyed by their
+id, with a full-text index over their titles and abstracts, and the links to
+the authors they were fetched for. A paper is then found by id, by words of
+its title or abstract, or among the papers of an author, with an index lookup
+instead of paging through the API. The papers of an author are answered from
+the store only once all of them were fetched, e.g. by `get_all_author_papers`,
+and for `author_ttl` seconds.
+
+Papers can also be imported in bulk from a crawl, i.e. JSON files holding
+pages of the API, lists of papers, or one paper per line:
+
+    python -m technology_scout.tools.paper_store import crawl/*.json --author yann-lecun
+    python -m technology_scout.tools.paper_store stats
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from technology_scout.tools.local_database import LocalDatabase
+
+DEFAULT_PATH = Path(__file__).parents[4] / "data" / "papers.db"
+DEFAULT_AUTHOR_TTL = 24 * 60 * 60
+DEFAULT_TOP_K = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    published TEXT,
+    data TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_papers_published ON papers (published);
+
+CREATE TABLE IF NOT EXISTS author_papers (
+    author_id TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    PRIMARY KEY (author_id, paper_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS crawled_authors (
+    author_id TEXT PRIMARY KEY,
+    n_papers INTEGER NOT NULL,
+    crawled_at REAL NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5 (
+    title, abstract,
+    content='papers',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_after_insert
+AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, abstract)
+    VALUES (new.rowid, new.title, new.abstract);
+END;
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_after_delete
+AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+    VALUES ('delete', old.rowid, old.title, old.abstract);
+END;
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_after_update
+AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+    VALUES ('delete', old.rowid, old.title, old.abstract);
+    INSERT INTO papers_fts (rowid, title, abstract)
+    VALUES (new.rowid, new.title, new.abstract);
+END;
+"""
+
+# Matches in the title weigh more than in the abstract.
+_BM25_WEIGHTS = (5.0, 1.0)
+
+_UPSERT = """
+INSERT INTO papers (id, title, abstract, published, data, stored_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    title = excluded.title,
+    abstract = excluded.abstract,
+    published = excluded.published,
+    data = excluded.data,
+    stored_at = excluded.stored_at
+"""
+
+
+def to_fts_query(text: str) -> str:
+    """Turns free text into an FTS5 query matching all of its words.
+
+    Every word is quoted, so that FTS5 operators in the text are searched for
+    literally, and used as a prefix, so that "plan" also matches "planning".
+    """
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+
+@dataclass
+class StoreStats:
+    """Counters of the lookups of a store."""
+
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+
+
+class PaperStore:
+    """Stores papers, as the JSON objects of the API, in a SQLite file.
+
+    The file is opened on first use.
+
+    Args:
+        path (Path): The SQLite file of the store.
+        author_ttl (float): Seconds the complete list of papers of an author
+            is answered from the store.
+    """
+
+    def __init__(
+        self, path: Path = DEFAULT_PATH, author_ttl: float = DEFAULT_AUTHOR_TTL
+    ) -> None:
+        self.path = Path(path)
+        self.author_ttl = author_ttl
+
+        self._database = LocalDatabase(self.path, SCHEMA)
+        self._stats = StoreStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> StoreStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return StoreStats(**vars(self._stats))
+
+    def put_papers(
+        self,
+        papers: Iterable[dict[str, Any]],
+        author_id: str | None = None,
+        complete: bool = False,
+    ) -> int:
+        """Stores papers, in one transaction, and returns how many.
+
+        Args:
+            papers (Iterable[dict[str, Any]]): The papers, as the API returns
+                them.
+            author_id (str | None): The author the papers were fetched for.
+            complete (bool): Whether these are all the papers of the author.
+        """
+        now = time.time()
+        rows, links = [], []
+        for paper in papers:
+            rows.append(
+                (
+                    paper["id"],
+                    paper["title"],
+                    paper.get("abstract") or "",
+                    paper.get("published"),
+                    json.dumps(paper),
+                    now,
+                )
+            )
+            if author_id is not None:
+                links.append((str(author_id), paper["id"]))
+
+        with self._lock:
+            connection = self._database.connect()
+            with connection:
+                connection.executemany(_UPSERT, rows)
+                connection.executemany(
+                    "INSERT OR IGNORE INTO author_papers VALUES (?, ?)", links
+                )
+                if author_id is not None and complete:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO crawled_authors VALUES (?, ?, ?)",
+                        (str(author_id), len(rows), now),
+                    )
+            self._stats.stored += len(rows)
+        return len(rows)
+
+    def get_paper(self, paper_id: str) -> dict[str, Any] | None:
+        """Returns a stored paper by id, if there is one."""
+        rows = self._query("SELECT data FROM papers WHERE id = ?", (paper_id,))
+        return self._count(json.loads(rows[0][0]) if rows else None)
+
+    def search(self, text: str, top_k: int = DEFAULT_TOP_K) -> list[dict[str, Any]]:
+        """Returns the stored papers matching all the words of a text, best first.
+
+        The words are searched for in the titles and the abstracts.
+        """
+        fts_query = to_fts_query(text)
+        if not fts_query:
+            return []
+        weights = ", ".join(map(str, _BM25_WEIGHTS))
+        rows = self._query(
+            f"""
+            SELECT p.data FROM papers_fts
+            JOIN papers AS p ON p.rowid = papers_fts.rowid
+            WHERE papers_fts MATCH ?
+            ORDER BY bm25(papers_fts, {weights})
+            LIMIT ?
+            """,
+            (fts_query, top_k),
+        )
+        papers = [json.loads(data) for (data,) in rows]
+        self._count(papers or None)
+        return papers
+
+    def papers_by_author(
+        self, author_id: str, since: str | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Returns the stored papers of an author, most recent first.
+
+        Args:
+            author_id (str): The ID of the author.
+            since (str | None): The earliest publication date, as YYYY-MM-DD.
+
+        Returns:
+            list[dict[str, Any]] | None: The papers, or None if not all the
+                papers of the author were stored in the last `author_ttl`
+                seconds.
+        """
+        crawled = self._query(
+            "SELECT 1 FROM crawled_authors WHERE author_id = ? AND crawled_at > ?",
+            (str(author_id), time.time() - self.author_ttl),
+        )
+        if not crawled:
+            return self._count(None)
+
+        rows = self._query(
+            """
+            SELECT p.data FROM author_papers AS a
+            JOIN papers AS p ON p.id = a.paper_id
+            WHERE a.author_id = ? AND (? IS NULL OR p.published >= ?)
+            ORDER BY p.published DESC
+            """,
+            (str(author_id), since, since),
+        )
+        return self._count([json.loads(data) for (data,) in rows])
+
+    def import_file(self, path: Path, author_id: str | None = None) -> int:
+        """Stores the papers of a crawl file, and returns how many.
+
+        The file holds a page of the API, a list of papers, or one paper per
+        line. With `author_id`, the file holds all the papers of the author.
+        """
+        text = Path(path).read_text()
+        try:
+            content = json.loads(text)
+        except json.JSONDecodeError:
+            content = [json.loads(line) for line in text.splitlines() if line.strip()]
+        papers = content["results"] if isinstance(content, dict) else content
+        return self.put_papers(papers, author_id, complete=author_id is not None)
+
+    def size(self) -> tuple[int, int]:
+        """Returns the number of stored papers and of completely stored authors."""
+        ((n_papers,),) = self._query("SELECT COUNT(*) FROM papers")
+        ((n_authors,),) = self._query("SELECT COUNT(*) FROM crawled_authors")
+        return n_papers, n_authors
+
+    def close(self) -> None:
+        """Closes the connection to the file."""
+        with self._lock:
+            self._database.close()
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._database.connect().execute(sql, params).fetchall()
+
+    def _count(self, result: Any) -> Any:
+        """Counts a lookup as a hit or a miss, and returns its result."""
+        with self._lock:
+            if result is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import papers into the store.")
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Import crawl files.")
+    import_parser.add_argument("files", type=Path, nargs="+")
+    import_parser.add_argument(
+        "--author", help="The author all the papers of the files belong to."
+    )
+    commands.add_parser("stats", help="Number of stored papers and authors.")
+    args = parser.parse_args()
+
+    store = PaperStore(args.path)
+    if args.command == "import":
+        start = time.perf_counter()
+        n_papers = sum(store.import_file(path, args.author) for path in args.files)
+        print(f"Imported {n_papers} papers in {time.perf_counter() - start:.2f}s")
+    else:
+        n_papers, n_authors = store.size()
+        print(f"{args.path}: {n_papers} papers, {n_authors} complete authors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Fast validation of the JSON responses of the APIs.
+
+Building a pydantic validator is far slower than running it, so the
+validators are built once per type and cached. They validate the raw bodies of
+the responses with `validate_json`, which parses the JSON in Rust instead of
+building a dict of Python objects first.
+
+For bulk crawls, a projection keeps only some fields of a model in a slotted
+dataclass: the other fields, e.g. the long abstracts of the papers, are
+skipped while parsing and never materialized as Python strings, and the
+records have no per-instance `__dict__`.
+"""
+
+import dataclasses
+import functools
+from collections.abc import Sequence
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+
+@functools.cache
+def type_adapter(type_: Any) -> TypeAdapter:
+    """Returns the cached validator of a type."""
+    return TypeAdapter(type_)
+
+
+def projection(model: type[BaseModel], fields: Sequence[str]) -> type:
+    """Returns a slotted dataclass holding only some fields of a model.
+
+    Projections are cached, so the same fields give the same class.
+
+    Args:
+        model (type[BaseModel]): The model to take the fields from.
+        fields (Sequence[str]): The names of the fields to keep.
+
+    Returns:
+        type: A frozen dataclass with `__slots__`, named after the model.
+
+    Raises:
+        ValueError: If a field is not a field of the model.
+    """
+    return _projection(model, tuple(fields))
+
+
+@functools.cache
+def _projection(model: type[BaseModel], fields: tuple[str, ...]) -> type:
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields {unknown} of {model.__name__}, expected some of "
+            f"{list(model.model_fields)}"
+        )
+
+    definitions = []
+    for name in dict.fromkeys(fields):
+        field = model.model_fields[name]
+        if field.is_required():
+            definitions.append((name, field.annotation))
+        else:
+            definitions.append(
+                (name, field.annotation, dataclasses.field(default=field.default))
+            )
+    return dataclasses.make_dataclass(
+        f"{model.__name__}Projection",
+        definitions,
+        frozen=True,
+        slots=True,
+        kw_only=True,
+    )
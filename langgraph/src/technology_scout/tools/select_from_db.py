@@ -1,59 +1,229 @@
-import sqlite3
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
+
+from technology_scout.tools.database import ConnectionManager
+from technology_scout.tools.paging import CursorRegistry, render_page
+from technology_scout.tools.query_cache import (
+    QueryResultCache,
+    is_cacheable,
+    normalize_sql,
+)
+from technology_scout.tools.query_governor import (
+    DEFAULT_MAX_ROWS,
+    DEFAULT_TIME_BUDGET,
+    QueryGovernor,
+)
+from technology_scout.tools.serialization import compact_output
+from technology_scout.tools.single_flight import SingleFlight
+
+# pandas takes most of the import time of the tools, so it is only imported
+# when a query runs.
+if TYPE_CHECKING:
+    import pandas as pd
 
 influences_table_name = "influencers"
 path_to_database = Path(__file__).parents[4] / "data" / "ai_watch.db"
 
+connection_manager = ConnectionManager(
+    path_to_database,
+    in_memory=os.getenv("TECHNOLOGY_SCOUT_DB_IN_MEMORY", "").lower() in ("1", "true"),
+)
+query_cache = QueryResultCache(
+    maxsize=int(os.getenv("TECHNOLOGY_SCOUT_QUERY_CACHE_SIZE", "256")),
+)
+query_governor = QueryGovernor(
+    max_rows=int(os.getenv("TECHNOLOGY_SCOUT_QUERY_MAX_ROWS", DEFAULT_MAX_ROWS)),
+    time_budget=float(
+        os.getenv("TECHNOLOGY_SCOUT_QUERY_TIME_BUDGET", DEFAULT_TIME_BUDGET)
+    ),
+)
+
+# Collapses the identical queries running at the same time, e.g. from
+# parallel sessions on a cold cache, into one execution.
+query_flight = SingleFlight()
+
+# Bounds the threads, hence the SQLite connections, running the queries of the
+# async tools. Building the dataframes holds the GIL, so more workers barely
+# add throughput but delay the event loop more.
+query_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("TECHNOLOGY_SCOUT_DB_MAX_WORKERS", "4")),
+    thread_name_prefix="select_from_db",
+)
+
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_TOKEN_BUDGET = 1500
+
+_cursor_registry: CursorRegistry | None = None
+_cursor_registry_lock = threading.Lock()
+
+database_description = """Database Description:
+
+Table:
 
-def select_from_db(query: str) -> pd.DataFrame:
-    """Queries the AI personalities database and returns the data as a pandas dataframe.
+- {influences_table_name}:
 
-    Database Description:
+    - name: str
+        - The name of the influencer.
+    - rank: int
+        - The rank of the influencer in the database.
+    - bio: str
+        - A short bio of the influencer.
+    - twitter_username: str
+        - The twitter username of the influencer.
+    - nb_twitter_followers: str
+        - The number of twitter followers of the influencer.
+    - gender: str
+        - The gender of the influencer.
+    - links: list[str]
+        - A list of links to the influencer's website.
 
-    Table:
+Some of the fields above are optional.""".replace(
+    "{influences_table_name}", influences_table_name
+)
 
-    - {influences_table_name}:
 
-        - name: str
-            - The name of the influencer.
-        - rank: int
-            - The rank of the influencer in the database.
-        - bio: str
-            - A short bio of the influencer.
-        - twitter_username: str
-            - The twitter username of the influencer.
-        - nb_twitter_followers: str
-            - The number of twitter followers of the influencer.
-        - gender: str
-            - The gender of the influencer.
-        - links: list[str]
-            - A list of links to the influencer's website.
+def select_from_db(query: str) -> "pd.DataFrame":
+    """Queries the AI personalities database and returns the rows of the result.
 
-    Some of the fields above are optional.
+    Only single read-only SELECT queries are run, and queries without a LIMIT return a capped number of rows.
+
+    {database_description}
 
 
     Args:
         query (str): The raw SQL query to execute.
 
     Returns:
-        pd.DataFrame: The data as a pandas dataframe.
+        pd.DataFrame: The rows of the result.
 
     """
 
-    assert path_to_database.exists(), f"Database file not found at {path_to_database}"
+    key = normalize_sql(query)
+    if is_cacheable(key):
+        df = query_flight.do(key, lambda: _run_query(query))
+    else:
+        df = _run_query(query)
+    # Callers are free to mutate the dataframe, the shared one must not change.
+    return df.copy()
 
-    con = sqlite3.connect(path_to_database)
-    df = pd.read_sql_query(query, con)
-    return df
 
+async def aselect_from_db(query: str) -> "pd.DataFrame":
+    """Queries the AI personalities database and returns the rows of the result.
 
-select_from_db.__doc__ = select_from_db.__doc__.replace(
-    "{influences_table_name}", influences_table_name
-)
-print(select_from_db.__doc__)
+    Only single read-only SELECT queries are run, and queries without a LIMIT return a capped number of rows.
+
+    {database_description}
+
+
+    Args:
+        query (str): The raw SQL query to execute.
+
+    Returns:
+        pd.DataFrame: The rows of the result.
+
+    """
+    # The query and the dataframe construction block, so they run on the
+    # query executor rather than on the event loop.
+    loop = asyncio.get_running_loop()
 
+    def run_in_executor() -> "asyncio.Future[pd.DataFrame]":
+        return loop.run_in_executor(query_executor, _run_query, query)
 
-select_from_db_tool = tool(select_from_db)
+    key = normalize_sql(query)
+    if is_cacheable(key):
+        df = await query_flight.ado(key, run_in_executor)
+    else:
+        df = await run_in_executor()
+    return df.copy()
+
+
+def _run_query(query: str) -> "pd.DataFrame":
+    """Runs a query through the cache and the governor, on the calling thread."""
+    import pandas as pd
+
+    con = connection_manager.get_connection()
+    return query_cache.get_or_compute(
+        query,
+        version=connection_manager.data_version(),
+        compute=lambda: query_governor.execute(
+            con, query, lambda sql: pd.read_sql_query(sql, con)
+        ),
+    )
+
+
+def get_cursor_registry() -> CursorRegistry:
+    """Returns the registry holding the cursors of paged queries."""
+    global _cursor_registry
+
+    if _cursor_registry is None:
+        with _cursor_registry_lock:
+            if _cursor_registry is None:
+                _cursor_registry = CursorRegistry(
+                    connection_manager.open_connection(), governor=query_governor
+                )
+    return _cursor_registry
+
+
+def select_from_db_paged(
+    query: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """Queries the AI personalities database and returns the first page of the results as text.
+
+    Use it instead of `select_from_db` when the query may return many rows or long texts.
+    Long values are truncated so that the page fits in the token budget.
+    When more rows are available, the page ends with a continuation token to pass to `fetch_next_page`.
+
+    {database_description}
+
+    Args:
+        query (str): The raw SQL query to execute.
+        page_size (int): The maximum number of rows of the page.
+        token_budget (int): The approximate number of tokens the page may use.
+
+    Returns:
+        str: The first page of the results, as a text table.
+    """
+    registry = get_cursor_registry()
+    token = registry.open(query)
+    return render_page(registry.next_page(token, page_size, token_budget))
+
+
+def fetch_next_page(
+    continuation_token: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """Fetches the next page of results of a query run with `select_from_db_paged`.
+
+    Args:
+        continuation_token (str): The continuation token ending the previous page.
+        page_size (int): The maximum number of rows of the page.
+        token_budget (int): The approximate number of tokens the page may use.
+
+    Returns:
+        str: The next page of the results, as a text table.
+    """
+    registry = get_cursor_registry()
+    return render_page(registry.next_page(continuation_token, page_size, token_budget))
+
+
+for function in (select_from_db, aselect_from_db, select_from_db_paged):
+    function.__doc__ = function.__doc__.replace(
+        "{database_description}", database_description
+    )
+
+
+select_from_db_tool = StructuredTool.from_function(
+    func=compact_output(select_from_db),
+    coroutine=compact_output(aselect_from_db),
+)
+select_from_db_paged_tool = tool(select_from_db_paged)
+fetch_next_page_tool = tool(fetch_next_page)
@@ -0,0 +1,144 @@
+"""Collapses concurrent identical calls into one.
+
+When several sessions, or parallel tool calls of one step, ask for the same
+author or run the same query at the same moment, the first caller runs the
+call and the others wait for it and share its result, or its exception,
+instead of sending their own request. Calls are only collapsed while one is in
+flight: nothing is kept once it completes, which is the job of the caches.
+
+Threads and asyncio tasks share the in-flight calls: a task can wait for a
+call run by a thread, and the other way round. A caller must not wait from
+the thread of an event loop for a call run on that same loop.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class FlightStats:
+    """Counters of the calls of a single-flight group."""
+
+    calls: int = 0
+    executed: int = 0
+    collapsed: int = 0
+
+    @property
+    def collapse_rate(self) -> float:
+        return self.collapsed / self.calls if self.calls else 0.0
+
+
+class _Abandoned(Exception):
+    """The caller running the call was cancelled or interrupted."""
+
+
+class SingleFlight:
+    """A group of calls, identified by keys, run at most once at a time."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future] = {}
+        self._stats = FlightStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> FlightStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return FlightStats(**vars(self._stats))
+
+    @property
+    def in_flight(self) -> int:
+        """The number of calls running."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Runs `fn`, or waits for the running call with the same key.
+
+        Args:
+            key (Hashable): Identifies the call.
+            fn (Callable[[], T]): The call.
+
+        Returns:
+            T: The result of the call, shared by all its callers.
+        """
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return call.result()
+            except _Abandoned:
+                continue
+
+        try:
+            result = fn()
+        except BaseException as error:
+            self._finish(key, call, error=error)
+            raise
+        self._finish(key, call, result=result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Awaits `fn()`, or the running call with the same key.
+
+        Args:
+            key (Hashable): Identifies the call.
+            fn (Callable[[], Awaitable[T]]): Starts the call.
+
+        Returns:
+            T: The result of the call, shared by all its callers.
+        """
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                break
+            try:
+                # Cancelling a waiting caller must not cancel the call.
+                return await asyncio.shield(asyncio.wrap_future(call))
+            except _Abandoned:
+                continue
+
+        try:
+            result = await fn()
+        except BaseException as error:
+            self._finish(key, call, error=error)
+            raise
+        self._finish(key, call, result=result)
+        return result
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """Returns the call of a key, and whether the caller has to run it."""
+        with self._lock:
+            self._stats.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats.collapsed += 1
+                return call, False
+            call = self._calls[key] = Future()
+            self._stats.executed += 1
+            return call, True
+
+    def _finish(
+        self,
+        key: Hashable,
+        call: Future,
+        result: object = None,
+        error: BaseException | None = None,
+    ) -> None:
+        with self._lock:
+            del self._calls[key]
+        if error is None:
+            call.set_result(result)
+        elif isinstance(error, Exception):
+            call.set_exception(error)
+        else:
+            # The waiting callers run the call again rather than being
+            # cancelled or interrupted with the caller that ran it.
+            call.set_exception(_Abandoned())
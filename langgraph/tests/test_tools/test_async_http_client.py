@@ -0,0 +1,321 @@
+"""Tests for the async HTTP client and the paginated fetches of the papers."""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import httpx
+import pytest
+from technology_scout.tools import query_papers_with_code
+from technology_scout.tools.async_http_client import AsyncHttpClient
+from technology_scout.tools.query_papers_with_code import PaperAuthorPaper
+
+
+def make_paper(index: int) -> dict:
+    """Returns a paper of the fake author."""
+    return {
+        "id": f"paper-{index}",
+        "title": f"Paper {index}",
+        "abstract": "",
+        "authors": ["Yann LeCun"],
+        "published": (date(2020, 1, 1) + timedelta(days=index)).isoformat(),
+    }
+
+
+class PaginatedServer(ThreadingHTTPServer):
+    """Serves `n_papers` papers per author, after `errors` 503 responses."""
+
+    daemon_threads = True
+
+    def __init__(self, n_papers: int = 0, errors: int = 0, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), PaginatedHandler)
+        self.papers = [make_paper(index) for index in range(n_papers)]
+        self.errors = errors
+        self.delay = delay
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self) -> "PaginatedServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class PaginatedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: PaginatedServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(
+                self.server.max_in_flight, self.server.in_flight
+            )
+            failing = self.server.errors > 0
+            self.server.errors -= failing
+        time.sleep(self.server.delay)
+
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        page = int(params.get("page", 1))
+        items_per_page = int(params.get("items_per_page", 50))
+        start = (page - 1) * items_per_page
+        has_next = start + items_per_page < len(self.server.papers)
+        next_params = urlencode({**params, "page": page + 1})
+        body = {
+            "count": len(self.server.papers),
+            "next": (
+                f"http://{self.headers['Host']}{url.path}?{next_params}"
+                if has_next
+                else None
+            ),
+            "previous": None,
+            "results": self.server.papers[start : start + items_per_page],
+        }
+        payload = json.dumps({} if failing else body).encode()
+        self.send_response(503 if failing else 200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        with self.server.lock:
+            self.server.in_flight -= 1
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Records the backoff delays instead of waiting for them."""
+    delays = []
+    backoff = AsyncHttpClient._backoff
+
+    def record_backoff(self, attempt: int, retry_after: float | None) -> float:
+        delays.append(backoff(self, attempt, retry_after))
+        return 0.0
+
+    monkeypatch.setattr(AsyncHttpClient, "_backoff", record_backoff)
+    return delays
+
+
+class TestAsyncHttpClient:
+    def test_transient_errors_are_retried(self, sleeps: list[float]) -> None:
+        """Tests that 5xx responses are retried until one succeeds."""
+        with PaginatedServer(n_papers=3, errors=2) as server:
+            client = AsyncHttpClient(server.base_url)
+            response = asyncio.run(client.get_json("/authors/yann-lecun/papers"))
+
+        assert response["count"] == 3
+        assert client.stats.retries == 2
+        assert len(sleeps) == 2
+
+    def test_gives_up_after_max_retries(self, sleeps: list[float]) -> None:
+        """Tests that the last error is raised once the retries are spent."""
+        with PaginatedServer(errors=3) as server:
+            client = AsyncHttpClient(server.base_url, max_retries=2)
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(client.get_json("/authors/yann-lecun/papers"))
+
+        assert server.requests == 3
+        assert client.stats.failures == 1
+
+    def test_run_reuses_connections(self) -> None:
+        """Tests that the sync facade keeps its connections between calls."""
+        with PaginatedServer(n_papers=3) as server:
+            client = AsyncHttpClient(server.base_url)
+            for _ in range(3):
+                client.run(client.get_json("/authors/yann-lecun/papers"))
+
+        assert server.requests == 3
+        assert server.connections == 1
+
+
+class TestFetchAllPages:
+    def test_all_pages_are_fetched_in_order(self, monkeypatch) -> None:
+        """Tests that the results of every page are returned, in order."""
+        with PaginatedServer(n_papers=23) as server:
+            monkeypatch.setattr(
+                query_papers_with_code,
+                "async_client",
+                AsyncHttpClient(server.base_url),
+            )
+            papers = asyncio.run(
+                query_papers_with_code.fetch_all_pages(
+                    "/authors/yann-lecun/papers", PaperAuthorPaper, items_per_page=5
+                )
+            )
+
+        assert [paper.id for paper in papers] == [f"paper-{i}" for i in range(23)]
+        assert server.requests == 5
+
+    def test_concurrency_is_limited(self, monkeypatch) -> None:
+        """Tests that at most `max_concurrency` pages are fetched at once."""
+        with PaginatedServer(n_papers=40, delay=0.02) as server:
+            monkeypatch.setattr(
+                query_papers_with_code,
+                "async_client",
+                AsyncHttpClient(server.base_url),
+            )
+            asyncio.run(
+                query_papers_with_code.fetch_all_pages(
+                    "/authors/yann-lecun/papers",
+                    PaperAuthorPaper,
+                    items_per_page=2,
+                    max_concurrency=3,
+                )
+            )
+
+        assert server.requests == 20
+        assert 1 < server.max_in_flight <= 3
+
+    def test_sync_facade(self, monkeypatch) -> None:
+        """Tests that get_all_author_papers returns all the papers."""
+        monkeypatch.setattr(query_papers_with_code, "paper_store", None)
+        with PaginatedServer(n_papers=60) as server:
+            monkeypatch.setattr(
+                query_papers_with_code,
+                "async_client",
+                AsyncHttpClient(server.base_url),
+            )
+            papers = query_papers_with_code.get_all_author_papers("yann-lecun")
+
+        assert len(papers) == 60
+        assert server.requests == 2
+
+
+@pytest.fixture
+def serve_papers(monkeypatch):
+    """Returns a function serving `n_papers` papers to the tools."""
+    servers = []
+
+    def serve(n_papers: int) -> PaginatedServer:
+        server = PaginatedServer(n_papers=n_papers).__enter__()
+        servers.append(server)
+        monkeypatch.setattr(
+            query_papers_with_code, "async_client", AsyncHttpClient(server.base_url)
+        )
+        return server
+
+    yield serve
+    for server in servers:
+        server.__exit__()
+
+
+class TestStreaming:
+    def test_pages_follow_next(self, serve_papers) -> None:
+        """Tests that the pages are read in order by following their next links."""
+        server = serve_papers(23)
+
+        async def read_all() -> list[str]:
+            pages = query_papers_with_code.aiter_pages(
+                "/authors/yann-lecun/papers",
+                PaperAuthorPaper,
+                params={"items_per_page": 5},
+            )
+            return [paper.id async for page in pages for paper in page.results]
+
+        assert asyncio.run(read_all()) == [f"paper-{i}" for i in range(23)]
+        assert server.requests == 5
+
+    def test_next_page_is_prefetched(self, serve_papers) -> None:
+        """Tests that the next page is requested before it is asked for."""
+        server = serve_papers(30)
+
+        async def read_first_page() -> int:
+            pages = query_papers_with_code.aiter_pages(
+                "/authors/yann-lecun/papers",
+                PaperAuthorPaper,
+                params={"items_per_page": 10},
+            )
+            await anext(pages)
+            await asyncio.sleep(0.2)
+            requests = server.requests
+            await pages.aclose()
+            return requests
+
+        assert asyncio.run(read_first_page()) == 2
+
+    def test_sync_iterator(self, serve_papers) -> None:
+        """Tests that the sync iterator yields the papers across pages."""
+        server = serve_papers(45)
+        papers = query_papers_with_code.iter_author_papers(
+            "yann-lecun", items_per_page=10
+        )
+        first_papers = list(itertools.islice(papers, 15))
+        papers.close()
+
+        assert [paper.id for paper in first_papers] == [f"paper-{i}" for i in range(15)]
+        assert server.requests < 5
+
+
+class TestFindAuthorPaper:
+    def test_stops_at_first_match(self, serve_papers) -> None:
+        """Tests that the search stops at the page holding the paper."""
+        server = serve_papers(200)
+        paper = query_papers_with_code.find_author_paper(
+            "yann-lecun", paper_id="paper-3"
+        )
+
+        assert paper.id == "paper-3"
+        # The first page, and at most the prefetch of the second one.
+        assert server.requests <= 2
+
+    def test_title_and_dates(self, serve_papers) -> None:
+        """Tests the title and publication date criteria."""
+        serve_papers(200)
+        find = query_papers_with_code.find_author_paper
+
+        assert find("yann-lecun", title_contains="paper 12").id == "paper-12"
+        assert find("yann-lecun", published_after="2020-02-01").id == "paper-31"
+        assert (
+            find(
+                "yann-lecun",
+                title_contains="paper 1",
+                published_after="2020-04-01",
+                published_before="2020-12-31",
+            ).id
+            == "paper-100"
+        )
+        assert find("yann-lecun", published_before="2019-12-31") is None
+
+    def test_criteria_are_required(self) -> None:
+        """Tests that a search without criteria is refused."""
+        with pytest.raises(ValueError):
+            query_papers_with_code.find_author_paper("yann-lecun")
+        with pytest.raises(ValueError):
+            query_papers_with_code.find_author_paper(
+                "yann-lecun", published_after="last year"
+            )
+
+
+def main() -> None:
+    """Main function."""
+
+    test_async_http_client = TestAsyncHttpClient()
+    test_async_http_client.test_run_reuses_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Tests for the database connection manager."""
+
+import sqlite3
+import threading
+
+import pytest
+from technology_scout.tools.database import ConnectionManager
+from technology_scout.tools.select_from_db import (
+    influences_table_name,
+    path_to_database,
+)
+
+
+class TestConnectionManager:
+    def test_reuses_connection_within_thread(self) -> None:
+        """Tests that the same thread always gets the same connection."""
+        manager = ConnectionManager(path_to_database)
+        try:
+            assert manager.get_connection() is manager.get_connection()
+        finally:
+            manager.close()
+
+    def test_one_connection_per_thread(self) -> None:
+        """Tests that each thread gets its own connection."""
+        manager = ConnectionManager(path_to_database)
+        connections = []
+
+        def worker() -> None:
+            connections.append(manager.get_connection())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        try:
+            assert len({id(connection) for connection in connections}) == 4
+        finally:
+            manager.close()
+
+    def test_connection_is_read_only(self) -> None:
+        """Tests that connections reject writes."""
+        manager = ConnectionManager(path_to_database)
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                manager.get_connection().execute(f"DELETE FROM {influences_table_name}")
+        finally:
+            manager.close()
+
+    def test_in_memory_copy(self) -> None:
+        """Tests that the in-memory copy serves the same data as the file."""
+        manager = ConnectionManager(path_to_database, in_memory=True)
+        query = f"SELECT COUNT(*) FROM {influences_table_name}"
+        try:
+            (count,) = manager.get_connection().execute(query).fetchone()
+            with sqlite3.connect(path_to_database) as con:
+                (expected_count,) = con.execute(query).fetchone()
+            assert count == expected_count
+        finally:
+            manager.close()
+
+    def test_missing_database(self, tmp_path) -> None:
+        """Tests that a missing database file raises a clear error."""
+        manager = ConnectionManager(tmp_path / "missing.db")
+        with pytest.raises(FileNotFoundError):
+            manager.get_connection()
+
+
+def main() -> None:
+    """Main function."""
+
+    test_connection_manager = TestConnectionManager()
+    test_connection_manager.test_reuses_connection_within_thread()
+    test_connection_manager.test_one_connection_per_thread()
+    test_connection_manager.test_connection_is_read_only()
+    test_connection_manager.test_in_memory_copy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Tests for the governor of the queries run by select_from_db."""
+
+import sqlite3
+
+import pytest
+from technology_scout.tools.paging import CursorRegistry
+from technology_scout.tools.query_governor import QueryGovernor, QueryRejected
+from technology_scout.tools.select_from_db import select_from_db
+
+RECURSIVE_COUNT = """
+WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c)
+SELECT COUNT(*) FROM c
+"""
+
+
+def make_connection(n_rows: int = 100) -> sqlite3.Connection:
+    """Returns an in-memory database with a table `t` of `n_rows` rows."""
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.executemany(
+        "INSERT INTO t VALUES (?, ?)", [(i, f"name {i}") for i in range(n_rows)]
+    )
+    return connection
+
+
+def make_full_text_connection(tmp_path) -> sqlite3.Connection:
+    """Returns a new read-only connection to a file with a full-text table."""
+    path = tmp_path / "fts.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE VIRTUAL TABLE t_fts USING fts5 (name)")
+        connection.execute("INSERT INTO t_fts VALUES ('robot'), ('human')")
+    connection.close()
+    # It has not loaded the schema yet, as the pooled connections of the tool
+    return sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+
+
+def rejection_reason(governor: QueryGovernor, query: str) -> str:
+    """Returns the reason why the governor rejects a query."""
+    with pytest.raises(QueryRejected) as error:
+        governor.prepare(make_connection(), query)
+    return error.value.reason
+
+
+class TestClassification:
+    def test_writes_are_rejected(self) -> None:
+        """Tests that statements other than reads are rejected."""
+        governor = QueryGovernor()
+
+        assert rejection_reason(governor, "DELETE FROM t") == "not_read_only"
+        assert rejection_reason(governor, "PRAGMA query_only = OFF") == "not_read_only"
+        assert (
+            rejection_reason(governor, "WITH x AS (SELECT 1) DELETE FROM t")
+            == "not_read_only"
+        )
+
+    def test_multiple_statements_are_rejected(self) -> None:
+        """Tests that a read followed by another statement is rejected."""
+        reason = rejection_reason(QueryGovernor(), "SELECT 1; DROP TABLE t")
+        assert reason == "multiple_statements"
+
+    def test_invalid_queries_are_rejected(self) -> None:
+        """Tests that queries SQLite cannot compile are rejected."""
+        assert (
+            rejection_reason(QueryGovernor(), "SELECT * FROM nope") == "invalid_query"
+        )
+
+    def test_schema_pragmas_are_allowed(self) -> None:
+        """Tests that the pragmas describing the schema can be run."""
+        governor = QueryGovernor()
+        sql = governor.prepare(make_connection(), "PRAGMA table_info(t)")
+        assert sql == "pragma table_info(t)"
+
+
+class TestPlanInspection:
+    def test_cross_join_over_threshold_is_rejected(self) -> None:
+        """Tests that joining full scans over too many rows is rejected."""
+        governor = QueryGovernor(max_join_rows=1000)
+        reason = rejection_reason(governor, "SELECT * FROM t AS a, t AS b")
+        assert reason == "full_scan_join"
+
+    def test_indexed_join_is_accepted(self) -> None:
+        """Tests that a join on the primary key is not a full-scan join."""
+        governor = QueryGovernor(max_join_rows=1000)
+        governor.prepare(
+            make_connection(), "SELECT * FROM t AS a JOIN t AS b ON a.id = b.id"
+        )
+
+    def test_full_text_match_is_accepted(self, tmp_path) -> None:
+        """Tests that full-text queries, which load their index schema, are run."""
+        connection = make_full_text_connection(tmp_path)
+        governor = QueryGovernor()
+
+        rows = governor.execute(
+            connection,
+            "SELECT name FROM t_fts WHERE t_fts MATCH 'robot'",
+            lambda sql: connection.execute(sql).fetchall(),
+        )
+
+        assert rows == [("robot",)]
+        assert not governor.stats.rejected
+
+    def test_full_text_writes_are_rejected(self, tmp_path) -> None:
+        """Tests that writing the full-text index stays denied."""
+        with pytest.raises(QueryRejected) as error:
+            QueryGovernor().prepare(
+                make_full_text_connection(tmp_path),
+                "WITH x AS (SELECT 1) INSERT INTO t_fts VALUES ('x')",
+            )
+        assert error.value.reason == "not_read_only"
+
+
+class TestLimitInjection:
+    def test_limit_is_added(self) -> None:
+        """Tests that queries without a LIMIT are capped."""
+        connection = make_connection()
+        sql = QueryGovernor(max_rows=10).prepare(connection, "SELECT * FROM t")
+        assert len(connection.execute(sql).fetchall()) == 10
+
+    def test_existing_limit_is_kept(self) -> None:
+        """Tests that a top-level LIMIT is not overridden."""
+        governor = QueryGovernor(max_rows=10)
+        sql = governor.prepare(make_connection(), "SELECT * FROM t LIMIT 50")
+        assert sql == "select*from t limit 50"
+        assert governor.stats.limits_injected == 0
+
+    def test_order_is_kept(self) -> None:
+        """Tests that the rows keep the order of the query."""
+        connection = make_connection()
+        sql = QueryGovernor(max_rows=3).prepare(
+            connection, "SELECT id FROM t ORDER BY id DESC"
+        )
+        assert connection.execute(sql).fetchall() == [(99,), (98,), (97,)]
+
+
+class TestTimeLimit:
+    def test_runaway_query_is_aborted(self) -> None:
+        """Tests that a query running past the time budget is aborted."""
+        connection = make_connection()
+        governor = QueryGovernor(time_budget=0.1)
+
+        with pytest.raises(QueryRejected) as error:
+            governor.execute(
+                connection,
+                RECURSIVE_COUNT,
+                lambda sql: connection.execute(sql).fetchall(),
+            )
+
+        assert error.value.reason == "timeout"
+        assert governor.stats.aborted == 1
+        # The connection is usable again.
+        assert connection.execute("SELECT COUNT(*) FROM t").fetchone() == (100,)
+
+    def test_paged_query_is_aborted(self) -> None:
+        """Tests that reading a page past the time budget closes the cursor."""
+        registry = CursorRegistry(
+            make_connection(), governor=QueryGovernor(time_budget=0.1)
+        )
+        # The first row comes at once, the next ones never do.
+        token = registry.open(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+            "SELECT x FROM c WHERE x = 1 OR x < 0"
+        )
+
+        with pytest.raises(QueryRejected):
+            registry.next_page(token, page_size=10, token_budget=1000)
+        assert token not in registry._cursors
+
+
+class TestSelectFromDb:
+    def test_rejection_reaches_the_agent(self) -> None:
+        """Tests that select_from_db raises an error telling what to change."""
+        with pytest.raises(QueryRejected) as error:
+            select_from_db("DROP TABLE influencers")
+        assert "only SELECT queries" in str(error.value)
+
+
+def main() -> None:
+    """Main function."""
+
+    test_classification = TestClassification()
+    test_classification.test_writes_are_rejected()
+    test_classification.test_multiple_statements_are_rejected()
+
+    test_plan_inspection = TestPlanInspection()
+    test_plan_inspection.test_cross_join_over_threshold_is_rejected()
+
+    test_time_limit = TestTimeLimit()
+    test_time_limit.test_runaway_query_is_aborted()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 """Tests for the select_from_db tool."""
 
+import asyncio
+
 import pandas as pd
 from technology_scout.agent import create_agent
 from technology_scout.tools.select_from_db import (
+    aselect_from_db,
     select_from_db,
     select_from_db_tool,
     influences_table_name,
@@ -25,6 +28,20 @@ class TestSelectFromDb:
         assert result.shape == (10, 3), f"Result: {result}"
 
 
+class TestASelectFromDb:
+    query = f"SELECT name FROM {influences_table_name} ORDER BY rank LIMIT 5"
+
+    def test_matches_select_from_db(self) -> None:
+        """Tests that the async variant returns the same data as select_from_db."""
+        result = asyncio.run(aselect_from_db(self.query))
+        assert result.equals(select_from_db(self.query))
+
+    def test_async_tool(self) -> None:
+        """Tests that the tool can be awaited."""
+        result = asyncio.run(select_from_db_tool.ainvoke({"query": self.query}))
+        assert result.splitlines()[:2] == ["name", "Lex Fridman"]
+
+
 class TestSelectFromDbToolUsageByAgent:
     def test_on_simple_task(self) -> None:
         """Tests that the tool is used correctly by the agent."""
@@ -56,6 +73,9 @@ def main() -> None:
     test_select_from_db = TestSelectFromDb()
     test_select_from_db.test_on_simple_query()
 
+    test_aselect_from_db = TestASelectFromDb()
+    test_aselect_from_db.test_matches_select_from_db()
+
     test_select_from_db_tool_usage_by_agent = TestSelectFromDbToolUsageByAgent()
     test_select_from_db_tool_usage_by_agent.test_on_simple_task()
 
@@ -1,15 +1,21 @@
+from typing import TYPE_CHECKING
+
 from llama_index.core.agent.react import ReActAgent
 from llama_index.core.memory import Memory
-from llama_index.llms.openai import OpenAI
 
 from llama_index.core.tools import FunctionTool
 
+# The OpenAI client is only imported when the LLM is created.
+if TYPE_CHECKING:
+    from llama_index.llms.openai import OpenAI
+
 
 DEFAULT_MODEL_NAME = "gpt-4o"
 
 
-def get_llm(model_name: str = DEFAULT_MODEL_NAME) -> OpenAI:
+def get_llm(model_name: str = DEFAULT_MODEL_NAME) -> "OpenAI":
     """Returns an OpenAI LLM."""
+    from llama_index.llms.openai import OpenAI
 
     return OpenAI(model=model_name)
 
@@ -20,10 +26,13 @@ def get_memory() -> Memory:
 
 
 def create_agent(
-    llm: OpenAI = get_llm(), tools: list[FunctionTool] | None = None
+    llm: "OpenAI | None" = None, tools: list[FunctionTool] | None = None
 ) -> ReActAgent:
     """Creates a technology scout agent."""
 
+    if llm is None:
+        llm = get_llm()
+
     if tools is None:
         tools = []
 
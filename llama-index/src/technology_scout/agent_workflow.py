@@ -1,7 +1,13 @@
-from typing import Any, List
-
-from llama_index.core.llms import ChatMessage
-from llama_index.core.tools import ToolSelection, ToolOutput
+import asyncio
+import contextvars
+import functools
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, List
+
+from llama_index.core.llms import ChatMessage, ChatResponse, MessageRole
+from llama_index.core.tools import AsyncBaseTool, BaseTool, ToolSelection, ToolOutput
 from llama_index.core.workflow import (
     Event,
     Context,
@@ -11,23 +17,153 @@ from llama_index.core.workflow import (
     step,
 )
 from llama_index.core.agent.react import ReActChatFormatter, ReActOutputParser
+from llama_index.core.agent.react.output_parser import parse_action_reasoning_step
 from llama_index.core.agent.react.types import (
     ActionReasoningStep,
+    BaseReasoningStep,
     ObservationReasoningStep,
+    ResponseReasoningStep,
 )
 from llama_index.core.memory import ChatMemoryBuffer
 from llama_index.core.tools import FunctionTool
-from llama_index.llms.openai import OpenAI
+from llama_index.core.tools.function_tool import sync_to_async
+
+from technology_scout.checkpoint_store import CheckpointStore
+
+# The OpenAI client is only imported when the LLM is created.
+if TYPE_CHECKING:
+    from llama_index.llms.openai import OpenAI
 
 DEFAULT_MODEL_NAME = "gpt-4o"
 MAX_STEPS = 15  # Maximum number of reasoning steps to prevent infinite loops - increased for complex reasoning tasks
+TOOL_TIMEOUT = 60.0  # Seconds a tool call may take before its observation is a timeout
+MAX_TOOL_WORKERS = 8  # Threads running the sync tools of a step concurrently
+OBSERVATION_TOKEN_BUDGET = (
+    8000  # Tokens of observations in the prompt before the oldest ones are compacted
+)
+CHARS_PER_TOKEN = 4  # Rough characters per token of the observations
+COMPACTED_OBSERVATION_CHARS = 200  # Characters kept of a compacted observation
 
 
-def get_llm(model_name: str = DEFAULT_MODEL_NAME) -> OpenAI:
+def get_llm(model_name: str = DEFAULT_MODEL_NAME) -> "OpenAI":
     """Returns an OpenAI LLM."""
+    from llama_index.llms.openai import OpenAI
+
     return OpenAI(model=model_name)
 
 
+class MultiActionReasoningStep(BaseReasoningStep):
+    """A reasoning step taking several independent actions at once."""
+
+    thought: str
+    actions: List[ActionReasoningStep]
+
+    def get_content(self) -> str:
+        """Renders the step the way the LLM wrote it."""
+        return f"Thought: {self.thought}\n" + "\n".join(
+            f"Action: {action.action}\nAction Input: {action.action_input}"
+            for action in self.actions
+        )
+
+    @property
+    def is_done(self) -> bool:
+        return False
+
+
+class MultiActionOutputParser(ReActOutputParser):
+    """ReAct output parser accepting several actions after a single thought.
+
+    The outputs with a single action, or with none, are parsed as usual.
+    """
+
+    def parse(self, output: str, is_streaming: bool = False) -> BaseReasoningStep:
+        """Parses an output, into a `MultiActionReasoningStep` if it has several actions."""
+        starts = [match.start() for match in re.finditer(r"^Action:", output, re.M)]
+        if "Thought:" not in output or len(starts) < 2:
+            return super().parse(output, is_streaming=is_streaming)
+
+        thought = output[: starts[0]]
+        # Each action is parsed as a step of its own, with the shared thought.
+        actions = [
+            parse_action_reasoning_step(thought + output[start:end])
+            for start, end in zip(starts, [*starts[1:], len(output)])
+        ]
+        return MultiActionReasoningStep(thought=actions[0].thought, actions=actions)
+
+
+def compact_observation(content: str) -> str:
+    """Keeps the start of an observation, and says how much was left out."""
+    if len(content) <= COMPACTED_OBSERVATION_CHARS:
+        return content
+    left_out = len(content) - COMPACTED_OBSERVATION_CHARS
+    return (
+        f"{content[:COMPACTED_OBSERVATION_CHARS]}… [{left_out} more characters "
+        "left out, call the tool again to see them]"
+    )
+
+
+def is_async_tool(tool: BaseTool) -> bool:
+    """Whether a tool has a coroutine of its own.
+
+    `FunctionTool.acall` runs the tools without one in the default executor of
+    the loop, through a `sync_to_async` wrapper.
+    """
+    if isinstance(tool, FunctionTool):
+        return tool.async_fn.__qualname__ != sync_to_async(tool.fn).__qualname__
+    return isinstance(tool, AsyncBaseTool)
+
+
+REASONING_STEP_TYPES = {
+    step_type.__name__: step_type
+    for step_type in (
+        ActionReasoningStep,
+        MultiActionReasoningStep,
+        ObservationReasoningStep,
+        ResponseReasoningStep,
+    )
+}
+
+
+def dump_reasoning_step(reasoning_step: BaseReasoningStep) -> dict:
+    """Dumps a reasoning step to a JSON object tagged with its type."""
+    return {
+        "type": type(reasoning_step).__name__,
+        **reasoning_step.model_dump(mode="json"),
+    }
+
+
+def load_reasoning_step(data: dict) -> BaseReasoningStep:
+    """Loads a reasoning step dumped by `dump_reasoning_step`."""
+    data = dict(data)
+    return REASONING_STEP_TYPES[data.pop("type")].model_validate(data)
+
+
+def dump_tool_output(output: ToolOutput | str) -> dict:
+    """Dumps the output of a tool call, or the observation of its failure.
+
+    The raw output of the tool, which can be any object, is left out.
+    """
+    if isinstance(output, ToolOutput):
+        return {"tool_output": output.model_dump(mode="json", exclude={"raw_output"})}
+    return {"observation": output}
+
+
+def load_tool_output(data: dict) -> ToolOutput | str:
+    """Loads the output of a tool call dumped by `dump_tool_output`."""
+    if "tool_output" in data:
+        return ToolOutput(**data["tool_output"], raw_output=None)
+    return data["observation"]
+
+
+def call_key(tool_call: ToolSelection) -> str:
+    """Identifies a tool call of a run by its id, tool and arguments."""
+    return json.dumps(
+        [tool_call.tool_id, tool_call.tool_name, tool_call.tool_kwargs],
+        sort_keys=True,
+        default=str,
+    )
+
+
 # Event definitions for the workflow
 class PrepEvent(Event):
     """Event to prepare for the next reasoning step."""
@@ -54,6 +190,12 @@ class EvaluationEvent(Event):
     final_response: str = ""
 
 
+# The events a run continues with after a checkpoint
+CHECKPOINT_EVENT_TYPES = {
+    event_type.__name__: event_type for event_type in (PrepEvent, ToolCallEvent)
+}
+
+
 class ReasoningAgent(Workflow):
     """
     A ReAct-based reasoning agent that can loop through:
@@ -62,21 +204,56 @@ class ReasoningAgent(Workflow):
     3. Acting using tools
     4. Evaluating results
     5. Repeating until task is complete or max steps reached
+
+    With `function_calling`, the LLM picks the tools through its tool-calling
+    API instead of writing ReAct text, which cannot fail to parse. The agent
+    falls back to ReAct for the LLMs without tool calling.
+
+    The prompt is built incrementally: the system message, with the context
+    and the tools, is rendered once per agent, and each step only appends its
+    messages, so that the prompts of a run share a byte-stable prefix the
+    providers can cache. Once the observations in the prompt go over
+    `observation_token_budget`, the oldest ones are compacted.
+
+    With a `checkpoint_store`, the runs given a `run_id`, as in
+    `agent.run(input=task, run_id=run_id)`, save their state after each
+    step. Run again with the same id, e.g. after a timeout or a crash, a run
+    resumes from its last completed step, and does not call again the tools
+    whose outputs were saved.
     """
 
     def __init__(
         self,
         *args: Any,
-        llm: OpenAI | None = None,
+        llm: "OpenAI | None" = None,
         tools: List[FunctionTool] | None = None,
         max_steps: int = MAX_STEPS,
         extra_context: str | None = None,
+        tool_timeout: float | None = TOOL_TIMEOUT,
+        tool_timeouts: dict[str, float] | None = None,
+        max_tool_workers: int = MAX_TOOL_WORKERS,
+        function_calling: bool = False,
+        observation_token_budget: int | None = OBSERVATION_TOKEN_BUDGET,
+        checkpoint_store: CheckpointStore | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(*args, **kwargs)
         self.tools = tools or []
+        self.tools_by_name = {tool.metadata.get_name(): tool for tool in self.tools}
         self.llm = llm or get_llm()
         self.max_steps = max_steps
+        self.function_calling = (
+            function_calling and self.llm.metadata.is_function_calling_model
+        )
+        self.observation_token_budget = observation_token_budget
+        self.checkpoint_store = checkpoint_store
+        # Timeouts of the tool calls, by tool name, or else `tool_timeout`
+        self.tool_timeout = tool_timeout
+        self.tool_timeouts = tool_timeouts or {}
+        # The threads are only started when sync tools are called
+        self.tool_executor = ThreadPoolExecutor(
+            max_workers=max_tool_workers, thread_name_prefix="tool"
+        )
         # Enhanced context for better reasoning
         enhanced_context = (
             (extra_context or "")
@@ -100,18 +277,47 @@ Output formatting:
 - Do not add extra explanatory text unless specifically requested
 - Match the format requested in the task description
 
+When several tool calls do not depend on each other's results, e.g. looking up several authors, """
+            + (
+                "make them all at once. The tools then run at once."
+                if self.function_calling
+                else 'make them all in the same step, one "Action:" and "Action Input:" pair after the other, after a single "Thought:". The tools then run at once, and you receive one Observation per action, in the same order.'
+            )
+            + """
+
 Remember: Each step should build toward the final goal. If one approach doesn't work, explain why and try a different approach."""
         )
 
         self.formatter = ReActChatFormatter.from_defaults(context=enhanced_context)
-        self.output_parser = ReActOutputParser()
+        self.output_parser = MultiActionOutputParser()
+        # Rendered once, the tools being described by the API in function
+        # calling mode and in the ReAct instructions otherwise
+        if self.function_calling:
+            self.system_message = ChatMessage(
+                role=MessageRole.SYSTEM, content=enhanced_context
+            )
+        else:
+            self.system_message = self.formatter.format(self.tools, [])[0]
 
     @step
-    async def new_user_msg(self, ctx: Context, ev: StartEvent) -> PrepEvent:
-        """Initialize the reasoning process with a new user message."""
+    async def new_user_msg(
+        self, ctx: Context, ev: StartEvent
+    ) -> PrepEvent | ToolCallEvent:
+        """Initialize the reasoning process with a new user message.
+
+        A run with the id of a saved one resumes from its checkpoint instead.
+        """
+        run_id = ev.get("run_id")
+        await ctx.set("run_id", run_id)
+        if self.checkpoint_store is not None and run_id is not None:
+            state = await asyncio.to_thread(self.checkpoint_store.load, run_id)
+            if state is not None:
+                return await self.restore_checkpoint(ctx, state)
+
         # Clear previous reasoning state
         await ctx.set("sources", [])
         await ctx.set("step_count", 0)
+        await ctx.set("parse_failures", 0)
 
         # Initialize memory if needed
         memory = await ctx.get("memory", default=None)
@@ -125,28 +331,152 @@ Remember: Each step should build toward the final goal. If one approach doesn't
 
         # Clear current reasoning for new task
         await ctx.set("current_reasoning", [])
+        await ctx.set("reasoning_messages", [])
+        await ctx.set("compacted_messages", 0)
         await ctx.set("memory", memory)
 
         return PrepEvent()
 
+    async def save_checkpoint(
+        self, ctx: Context, ev: PrepEvent | ToolCallEvent
+    ) -> None:
+        """Saves the state of the run, and the event it continues with.
+
+        Only the runs with an id are saved, when the agent has a store.
+        """
+        run_id = await ctx.get("run_id", default=None)
+        if self.checkpoint_store is None or run_id is None:
+            return
+
+        memory = await ctx.get("memory")
+        step_count = await ctx.get("step_count", default=0)
+        state = {
+            "step_count": step_count,
+            "parse_failures": await ctx.get("parse_failures", default=0),
+            "compacted_messages": await ctx.get("compacted_messages", default=0),
+            "memory": [message.model_dump(mode="json") for message in memory.get_all()],
+            "current_reasoning": [
+                dump_reasoning_step(reasoning_step)
+                for reasoning_step in await ctx.get("current_reasoning", default=[])
+            ],
+            "reasoning_messages": [
+                message.model_dump(mode="json")
+                for message in await ctx.get("reasoning_messages", default=[])
+            ],
+            "sources": [
+                dump_tool_output(source)
+                for source in await ctx.get("sources", default=[])
+            ],
+            "event": {"type": type(ev).__name__, **ev.model_dump(mode="json")},
+        }
+        # The store commits to its file, which must not block the event loop.
+        await asyncio.to_thread(self.checkpoint_store.save, run_id, step_count, state)
+
+    async def restore_checkpoint(
+        self, ctx: Context, state: dict
+    ) -> PrepEvent | ToolCallEvent:
+        """Restores the state of a run, and returns the event it continues with.
+
+        The restored sources have no raw output.
+        """
+        memory = ChatMemoryBuffer.from_defaults(
+            llm=self.llm,
+            chat_history=[
+                ChatMessage.model_validate(message) for message in state["memory"]
+            ],
+        )
+        await ctx.set("memory", memory)
+        await ctx.set("step_count", state["step_count"])
+        await ctx.set("parse_failures", state["parse_failures"])
+        await ctx.set("compacted_messages", state["compacted_messages"])
+        await ctx.set(
+            "current_reasoning",
+            [load_reasoning_step(data) for data in state["current_reasoning"]],
+        )
+        await ctx.set(
+            "reasoning_messages",
+            [ChatMessage.model_validate(data) for data in state["reasoning_messages"]],
+        )
+        await ctx.set("sources", [load_tool_output(data) for data in state["sources"]])
+
+        event = dict(state["event"])
+        return CHECKPOINT_EVENT_TYPES[event.pop("type")].model_validate(event)
+
     @step
     async def prepare_chat_history(self, ctx: Context, ev: PrepEvent) -> InputEvent:
-        """Prepare the chat history with ReAct formatting."""
-        # Get chat history and current reasoning
+        """Prepare the chat history, from the messages rendered so far."""
+        # Get chat history and the messages of the reasoning steps
         memory = await ctx.get("memory")
         chat_history = memory.get()
-        current_reasoning = await ctx.get("current_reasoning", default=[])
+        reasoning_messages = await ctx.get("reasoning_messages", default=[])
 
-        # Format with ReAct instructions
-        llm_input = self.formatter.format(
-            self.tools, chat_history, current_reasoning=current_reasoning
-        )
+        llm_input = [self.system_message, *chat_history, *reasoning_messages]
         return InputEvent(input=llm_input)
 
+    async def add_messages(self, ctx: Context, messages: List[ChatMessage]) -> None:
+        """Appends the messages of a step to the prompt, compacting old observations."""
+        reasoning_messages = await ctx.get("reasoning_messages", default=[])
+        compacted = await ctx.get("compacted_messages", default=0)
+
+        last_step = len(reasoning_messages)
+        reasoning_messages.extend(messages)
+        if self.observation_token_budget is not None:
+            compacted = self.compact_observations(
+                reasoning_messages, compacted, last_step
+            )
+
+        await ctx.set("reasoning_messages", reasoning_messages)
+        await ctx.set("compacted_messages", compacted)
+
+    def compact_observations(
+        self, messages: List[ChatMessage], start: int, end: int
+    ) -> int:
+        """Compacts the oldest observations once they go over the budget.
+
+        They are compacted until they fit in half of it, so that the prompts
+        keep the same prefix for a few steps before the next compaction. The
+        messages before `start` are compacted already, and the ones from `end`
+        are those of the last step, which are kept whole.
+
+        Returns:
+            int: The index of the first message which is not compacted.
+        """
+        budget = self.observation_token_budget * CHARS_PER_TOKEN
+        # The user and tool messages of the steps are observations
+        observations = {
+            index
+            for index, message in enumerate(messages)
+            if message.role != MessageRole.ASSISTANT
+        }
+        used = sum(len(messages[index].content or "") for index in observations)
+        if used <= budget:
+            return start
+        index = start
+        while used > budget // 2 and index < end:
+            message = messages[index]
+            if index in observations:
+                content = compact_observation(message.content or "")
+                used -= len(message.content or "") - len(content)
+                messages[index] = ChatMessage(
+                    role=message.role,
+                    content=content,
+                    additional_kwargs=message.additional_kwargs,
+                )
+            index += 1
+        return index
+
+    def render_step(self, reasoning_step: BaseReasoningStep) -> ChatMessage:
+        """Renders a reasoning step as the ReAct formatter does."""
+        if isinstance(reasoning_step, ObservationReasoningStep):
+            role = self.formatter.observation_role
+        else:
+            role = MessageRole.ASSISTANT
+        return ChatMessage(role=role, content=reasoning_step.get_content())
+
     @step
     async def reason_and_act(
         self, ctx: Context, ev: InputEvent
-    ) -> ToolCallEvent | EvaluationEvent:
+    ) -> ToolCallEvent | EvaluationEvent | PrepEvent:
         """Core reasoning step - decide whether to use tools or provide final answer."""
         chat_history = ev.input
         current_reasoning = await ctx.get("current_reasoning", default=[])
@@ -164,10 +494,17 @@ Remember: Each step should build toward the final goal. If one approach doesn't
 
         try:
             # Get LLM response
-            response = await self.llm.achat(chat_history)
+            if self.function_calling:
+                response = await self.llm.achat_with_tools(
+                    self.tools,
+                    chat_history=chat_history,
+                    allow_parallel_tool_calls=True,
+                )
+            else:
+                response = await self.llm.achat(chat_history)
 
             # Parse the reasoning step
-            reasoning_step = self.output_parser.parse(response.message.content)
+            reasoning_step, tool_calls = self.parse_response(response, step_count)
             current_reasoning.append(reasoning_step)
             await ctx.set("current_reasoning", current_reasoning)
 
@@ -183,75 +520,198 @@ Remember: Each step should build toward the final goal. If one approach doesn't
                     reasoning_complete=True, final_response=reasoning_step.response
                 )
 
-            # If it's an action step, prepare tool calls
-            elif isinstance(reasoning_step, ActionReasoningStep):
-                tool_name = reasoning_step.action
-                tool_args = reasoning_step.action_input
-                return ToolCallEvent(
-                    tool_calls=[
-                        ToolSelection(
-                            tool_id=f"call_{step_count}",
-                            tool_name=tool_name,
-                            tool_kwargs=tool_args,
-                        )
-                    ]
+            # If it's an action step, prepare tool calls; the independent
+            # actions of a step are executed together
+            if tool_calls:
+                await self.add_messages(
+                    ctx,
+                    [
+                        response.message
+                        if self.function_calling
+                        else self.render_step(reasoning_step)
+                    ],
                 )
+                tool_call_event = ToolCallEvent(tool_calls=tool_calls)
+                await self.save_checkpoint(ctx, tool_call_event)
+                return tool_call_event
 
         except Exception as e:
             # Handle parsing errors by adding observation and continuing
-            current_reasoning.append(
-                ObservationReasoningStep(
-                    observation=f"There was an error in parsing my reasoning: {e}. Let me try a different approach."
-                )
+            parse_failures = await ctx.get("parse_failures", default=0)
+            await ctx.set("parse_failures", parse_failures + 1)
+            observation = ObservationReasoningStep(
+                observation=f"There was an error in parsing my reasoning: {e}. Let me try a different approach."
             )
+            current_reasoning.append(observation)
             await ctx.set("current_reasoning", current_reasoning)
+            await self.add_messages(ctx, [self.render_step(observation)])
 
         # If no tool calls or final response, continue reasoning
-        return PrepEvent()
+        prep_event = PrepEvent()
+        await self.save_checkpoint(ctx, prep_event)
+        return prep_event
+
+    def parse_response(
+        self, response: ChatResponse, step_count: int
+    ) -> tuple[BaseReasoningStep, List[ToolSelection]]:
+        """Parses an LLM response into a reasoning step and its tool calls.
+
+        Raises:
+            ValueError: If the response cannot be parsed.
+        """
+        if self.function_calling:
+            tool_calls = self.llm.get_tool_calls_from_response(
+                response, error_on_no_tool_call=False
+            )
+            content = response.message.content or ""
+            if not tool_calls:
+                return ResponseReasoningStep(thought="", response=content), []
+            actions = [
+                ActionReasoningStep(
+                    thought=content,
+                    action=tool_call.tool_name,
+                    action_input=tool_call.tool_kwargs,
+                )
+                for tool_call in tool_calls
+            ]
+            if len(actions) == 1:
+                return actions[0], tool_calls
+            return MultiActionReasoningStep(
+                thought=content, actions=actions
+            ), tool_calls
+
+        reasoning_step = self.output_parser.parse(response.message.content)
+        if isinstance(reasoning_step, ActionReasoningStep):
+            actions = {f"call_{step_count}": reasoning_step}
+        elif isinstance(reasoning_step, MultiActionReasoningStep):
+            actions = {
+                f"call_{step_count}_{index}": action
+                for index, action in enumerate(reasoning_step.actions)
+            }
+        else:
+            actions = {}
+        return reasoning_step, [
+            ToolSelection(
+                tool_id=tool_id,
+                tool_name=action.action,
+                tool_kwargs=action.action_input,
+            )
+            for tool_id, action in actions.items()
+        ]
 
     @step
     async def execute_tools(self, ctx: Context, ev: ToolCallEvent) -> PrepEvent:
-        """Execute tool calls and observe results."""
-        tool_calls = ev.tool_calls
-        tools_by_name = {tool.metadata.get_name(): tool for tool in self.tools}
+        """Execute tool calls concurrently and observe results in order."""
         current_reasoning = await ctx.get("current_reasoning", default=[])
         sources = await ctx.get("sources", default=[])
+        run_id = await ctx.get("run_id", default=None)
+        saved_outputs = {}
+        if self.checkpoint_store is not None and run_id is not None:
+            saved_outputs = await asyncio.to_thread(
+                self.checkpoint_store.get_tool_outputs, run_id
+            )
 
-        # Execute tools safely
-        for tool_call in tool_calls:
-            tool = tools_by_name.get(tool_call.tool_name)
-            if not tool:
-                current_reasoning.append(
-                    ObservationReasoningStep(
-                        observation=f"Tool {tool_call.tool_name} does not exist. Available tools: {list(tools_by_name.keys())}"
-                    )
-                )
-                continue
-
-            try:
-                # Execute the tool
-                tool_output = tool(**tool_call.tool_kwargs)
-                sources.append(tool_output)
-                current_reasoning.append(
-                    ObservationReasoningStep(observation=tool_output.content)
-                )
-            except Exception as e:
-                current_reasoning.append(
-                    ObservationReasoningStep(
-                        observation=f"Error calling tool {tool.metadata.get_name()}: {e}"
+        # The calls run at once, and their observations follow the order of
+        # the calls whatever the order they complete in.
+        outputs = await asyncio.gather(
+            *(
+                self.call_tool_once(run_id, saved_outputs, tool_call)
+                for tool_call in ev.tool_calls
+            )
+        )
+        messages = []
+        for tool_call, output in zip(ev.tool_calls, outputs):
+            if isinstance(output, ToolOutput):
+                sources.append(output)
+                output = output.content
+            observation = ObservationReasoningStep(observation=output)
+            current_reasoning.append(observation)
+            if self.function_calling:
+                messages.append(
+                    ChatMessage(
+                        role="tool",
+                        content=str(output),
+                        additional_kwargs={"tool_call_id": tool_call.tool_id},
                     )
                 )
+            else:
+                messages.append(self.render_step(observation))
 
         # Save updated state
         await ctx.set("sources", sources)
         await ctx.set("current_reasoning", current_reasoning)
+        await self.add_messages(ctx, messages)
 
         # Continue to next reasoning step
-        return PrepEvent()
+        prep_event = PrepEvent()
+        await self.save_checkpoint(ctx, prep_event)
+        return prep_event
+
+    async def call_tool_once(
+        self,
+        run_id: str | None,
+        saved_outputs: dict[str, dict],
+        tool_call: ToolSelection,
+    ) -> ToolOutput | str:
+        """Runs a tool call, unless its output was saved, and saves its output.
+
+        The output is saved as soon as the call completes, so that a run
+        resumed in the middle of a step only calls the tools which had not
+        completed.
+        """
+        key = call_key(tool_call)
+        if key in saved_outputs:
+            return load_tool_output(saved_outputs[key])
+
+        output = await self.call_tool(tool_call)
+        if self.checkpoint_store is not None and run_id is not None:
+            await asyncio.to_thread(
+                self.checkpoint_store.put_tool_output,
+                run_id,
+                key,
+                dump_tool_output(output),
+            )
+        return output
+
+    async def call_tool(self, tool_call: ToolSelection) -> ToolOutput | str:
+        """Runs a tool call, and returns its output or the observation of its failure."""
+        tool = self.tools_by_name.get(tool_call.tool_name)
+        if not tool:
+            return f"Tool {tool_call.tool_name} does not exist. Available tools: {list(self.tools_by_name)}"
+
+        name = tool.metadata.get_name()
+        timeout = self.tool_timeouts.get(name, self.tool_timeout)
+        try:
+            # Execute the tool without blocking the event loop: async tools
+            # are awaited, sync ones run in the bounded pool of threads, with
+            # the context variables of the step, e.g. the request priority.
+            if is_async_tool(tool):
+                call = tool.acall(**tool_call.tool_kwargs)
+            else:
+                call = asyncio.get_running_loop().run_in_executor(
+                    self.tool_executor,
+                    functools.partial(
+                        contextvars.copy_context().run,
+                        tool.call,
+                        **tool_call.tool_kwargs,
+                    ),
+                )
+            # A timed out async tool is cancelled; a sync one cannot be
+            # interrupted, its thread runs to the end and its result is dropped.
+            return await asyncio.wait_for(call, timeout)
+        except TimeoutError:
+            return f"Tool {name} timed out after {timeout:g}s"
+        except Exception as e:
+            return f"Error calling tool {name}: {e}"
 
     @step
     async def finalize_response(self, ctx: Context, ev: EvaluationEvent) -> StopEvent:
         """Finalize and return the response."""
+        # A run which ended cannot be resumed.
+        run_id = await ctx.get("run_id", default=None)
+        if self.checkpoint_store is not None and run_id is not None:
+            await asyncio.to_thread(self.checkpoint_store.delete, run_id)
+
         if ev.reasoning_complete:
             sources = await ctx.get("sources", default=[])
             current_reasoning = await ctx.get("current_reasoning", default=[])
@@ -261,6 +721,9 @@ Remember: Each step should build toward the final goal. If one approach doesn't
                     "response": ev.final_response,
                     "sources": sources,
                     "reasoning": current_reasoning,
+                    # LLM calls, and those whose output could not be parsed
+                    "steps": await ctx.get("step_count", default=0),
+                    "parse_failures": await ctx.get("parse_failures", default=0),
                 }
             )
 
@@ -271,23 +734,37 @@ Remember: Each step should build toward the final goal. If one approach doesn't
 
 
 def create_agent_workflow(
-    model: OpenAI = get_llm(),
+    model: "OpenAI | None" = None,
     tools: List[FunctionTool] | None = None,
     max_steps: int = MAX_STEPS,
+    function_calling: bool = False,
+    checkpoint_store: CheckpointStore | None = None,
 ) -> ReasoningAgent:
-    """Creates a reasoning agent workflow."""
+    """Creates a reasoning agent workflow.
+
+    With `function_calling`, the LLM calls the tools through its tool-calling
+    API if it has one, instead of the ReAct text format. With a
+    `checkpoint_store`, the runs given an id can be resumed after a timeout.
+    """
     return ReasoningAgent(
         llm=model,
         tools=tools or [],
         max_steps=max_steps,
+        function_calling=function_calling,
+        checkpoint_store=checkpoint_store,
         timeout=120,  # 2 minute timeout for safety
         verbose=True,
     )
 
 
-async def run_agent_workflow(agent: ReasoningAgent, task: str) -> str:
-    """Run the reasoning agent workflow."""
-    handler = agent.run(input=task)
+async def run_agent_workflow(
+    agent: ReasoningAgent, task: str, run_id: str | None = None
+) -> str:
+    """Run the reasoning agent workflow.
+
+    With the `run_id` of a run which did not end, the run is resumed.
+    """
+    handler = agent.run(input=task, run_id=run_id)
 
     # Stream events for debugging
     async for event in handler.stream_events():
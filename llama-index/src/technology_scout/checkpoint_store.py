@@ -0,0 +1,168 @@
+"""Local SQLite store of the checkpoints of the reasoning agent runs.
+
+After each step of a run, the agent saves its state, i.e. the JSON object of
+its memory, reasoning, prompt messages, sources and counters, and the event
+it was about to handle, under the id of the run. Only the last checkpoint of
+a run is kept. The outputs of the tool calls are saved as soon as each call
+completes, so that a run resumed in the middle of a step does not call its
+tools again. The checkpoints and outputs of a run are deleted once it ends.
+
+    python -m technology_scout.checkpoint_store list
+    python -m technology_scout.checkpoint_store delete <run_id>
+"""
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from technology_scout.tools.local_database import LocalDatabase
+
+DEFAULT_PATH = Path(__file__).parents[3] / "data" / "checkpoints.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id TEXT PRIMARY KEY,
+    step INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    saved_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tool_outputs (
+    run_id TEXT NOT NULL,
+    call_key TEXT NOT NULL,
+    output TEXT NOT NULL,
+    PRIMARY KEY (run_id, call_key)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class CheckpointStats:
+    """Counters of the writes and reads of a store."""
+
+    saved: int = 0
+    resumed: int = 0
+    tool_outputs: int = 0
+
+
+class CheckpointStore:
+    """Stores the checkpoints of runs, as JSON objects, in a SQLite file.
+
+    The file is opened on first use. The writes are durable once the call
+    returns, even if the process dies; with `synchronous = NORMAL`, the last
+    ones may only be lost on a crash of the machine. The calls block on the
+    file: the agent makes them in threads, off the event loop.
+
+    Args:
+        path (Path): The SQLite file of the store.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH) -> None:
+        self.path = Path(path)
+
+        # In WAL mode, a commit is not lost if the process dies without
+        # waiting for the disk at every commit.
+        self._database = LocalDatabase(
+            self.path, SCHEMA, pragmas={"synchronous": "NORMAL"}
+        )
+        self._stats = CheckpointStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CheckpointStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return CheckpointStats(**vars(self._stats))
+
+    def save(self, run_id: str, step: int, state: dict[str, Any]) -> None:
+        """Saves the state of a run after a step, replacing its last checkpoint."""
+        data = json.dumps(state)
+        with self._lock:
+            connection = self._database.connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                    (run_id, step, data, time.time()),
+                )
+            self._stats.saved += 1
+
+    def load(self, run_id: str) -> dict[str, Any] | None:
+        """Returns the last saved state of a run, if there is one."""
+        rows = self._query("SELECT state FROM checkpoints WHERE run_id = ?", (run_id,))
+        if not rows:
+            return None
+        with self._lock:
+            self._stats.resumed += 1
+        return json.loads(rows[0][0])
+
+    def put_tool_output(self, run_id: str, call_key: str, output: dict) -> None:
+        """Saves the output of a tool call of a run."""
+        data = json.dumps(output)
+        with self._lock:
+            connection = self._database.connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO tool_outputs VALUES (?, ?, ?)",
+                    (run_id, call_key, data),
+                )
+            self._stats.tool_outputs += 1
+
+    def get_tool_outputs(self, run_id: str) -> dict[str, dict]:
+        """Returns the saved outputs of the tool calls of a run, by call key."""
+        rows = self._query(
+            "SELECT call_key, output FROM tool_outputs WHERE run_id = ?", (run_id,)
+        )
+        return {call_key: json.loads(output) for call_key, output in rows}
+
+    def delete(self, run_id: str) -> None:
+        """Deletes the checkpoint and the tool outputs of a run."""
+        with self._lock:
+            connection = self._database.connect()
+            with connection:
+                connection.execute(
+                    "DELETE FROM checkpoints WHERE run_id = ?", (run_id,)
+                )
+                connection.execute(
+                    "DELETE FROM tool_outputs WHERE run_id = ?", (run_id,)
+                )
+
+    def runs(self) -> list[tuple[str, int, float]]:
+        """Returns the id, last step and save time of the runs with a checkpoint."""
+        return self._query(
+            "SELECT run_id, step, saved_at FROM checkpoints ORDER BY saved_at"
+        )
+
+    def close(self) -> None:
+        """Closes the connection to the file."""
+        with self._lock:
+            self._database.close()
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._database.connect().execute(sql, params).fetchall()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect the run checkpoints.")
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="The runs which can be resumed.")
+    delete_parser = commands.add_parser("delete", help="Delete a run.")
+    delete_parser.add_argument("run_id")
+    args = parser.parse_args()
+
+    store = CheckpointStore(args.path)
+    if args.command == "list":
+        for run_id, step, saved_at in store.runs():
+            saved = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(saved_at))
+            print(f"{run_id}: step {step}, saved at {saved}")
+    else:
+        store.delete(args.run_id)
+
+
+if __name__ == "__main__":
+    main()
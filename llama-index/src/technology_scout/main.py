@@ -1,26 +1,58 @@
 """Main module."""
 
-from llama_index.packs.gradio_agent_chat import GradioAgentChatPack
+from typing import TYPE_CHECKING
 
-from technology_scout.agent import create_agent
-from technology_scout.tools.query_papers_with_code import (
-    search_author_tool,
-    get_author_papers_tool,
-)
-from technology_scout.tools.select_from_db import select_from_db_tool
+if TYPE_CHECKING:
+    from llama_index.core.agent.react import ReActAgent
 
 
-def main() -> None:
-    """Main function."""
+def build_agent() -> "ReActAgent":
+    """Imports the tools and creates the agent."""
+    from technology_scout.agent import create_agent
+    from technology_scout.tools.query_papers_with_code import (
+        search_author_tool,
+        get_author_papers_tool,
+        get_all_author_papers_tool,
+        find_author_paper_tool,
+        get_paper_tool,
+        search_papers_tool,
+        papers_by_author_tool,
+        search_authors_tool,
+        get_papers_for_authors_tool,
+    )
+    from technology_scout.tools.search_influencers import search_influencers_tool
+    from technology_scout.tools.select_from_db import (
+        fetch_next_page_tool,
+        select_from_db_paged_tool,
+        select_from_db_tool,
+    )
 
-    agent = create_agent(
+    return create_agent(
         tools=[
             search_author_tool,
             get_author_papers_tool,
+            get_all_author_papers_tool,
+            find_author_paper_tool,
+            get_paper_tool,
+            search_papers_tool,
+            papers_by_author_tool,
+            search_authors_tool,
+            get_papers_for_authors_tool,
             select_from_db_tool,
+            select_from_db_paged_tool,
+            fetch_next_page_tool,
+            search_influencers_tool,
         ],
     )
 
+
+def main() -> None:
+    """Main function."""
+    # Gradio is only needed once the agent runs.
+    from llama_index.packs.gradio_agent_chat import GradioAgentChatPack
+
+    agent = build_agent()
+
     # For this to work, I had to comment a line in the llama-index codebase.
     # Also as of now, when the LLM decide that it should use a tool, it does not really get executed and we don't get an answer.
     # Maybe it's because we need to do the wiring ourselves.
@@ -0,0 +1,297 @@
+"""Pooled HTTP client for the JSON APIs queried by the tools.
+
+Every request goes through one `requests.Session`, so the TCP and TLS
+connections to the API are kept alive and reused across tool calls instead of
+being opened for each call. Requests have connect and read timeouts, and
+transient failures (connection errors, timeouts, 429 and 5xx responses) are
+retried with exponential backoff and full jitter, waiting for the delay of the
+`Retry-After` header when the server sends one. Responses can be kept in an
+`HttpCache`, and requests can wait for their turn in a `RateLimiter`.
+"""
+
+import email.utils
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from technology_scout.tools.http_cache import CachedResponse, HttpCache, make_key
+from technology_scout.tools.rate_limiter import RateLimiter
+from technology_scout.tools.single_flight import SingleFlight
+
+# Seconds to establish the connection, and to wait for the server between two
+# bytes of the response.
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+# One pool per host, with enough connections for the agents' tool threads.
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClientStats:
+    """Counters of the requests sent by a client."""
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Returns the delay in seconds of a `Retry-After` header, if it has one.
+
+    The header holds either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def resolve_url(base_url: str, path: str) -> str:
+    """Returns the URL of an endpoint path, or `path` if it is a full URL.
+
+    Full URLs are e.g. the `next` links of the paginated responses.
+    """
+    if "://" in path:
+        return path
+    return f"{base_url}/{path.lstrip('/')}"
+
+
+class HttpClient:
+    """Sends GET requests to a JSON API over a pooled session.
+
+    Args:
+        base_url (str): The URL the request paths are appended to.
+        connect_timeout (float): Seconds to wait for a connection.
+        read_timeout (float): Seconds to wait for the server to send data.
+        max_retries (int): Retries of a request after a transient failure.
+        backoff_factor (float): Upper bound, in seconds, of the first backoff;
+            it doubles at each retry.
+        max_backoff (float): Longest wait between two attempts, including the
+            delays asked by `Retry-After`.
+        pool_connections (int): Number of hosts whose connections are pooled.
+        pool_maxsize (int): Connections kept alive per host.
+        cache (HttpCache | None): The cache of the responses, if any.
+        single_flight (SingleFlight | None): Collapses the concurrent identical
+            requests into one, if given. Clients of the same API can share it.
+        rate_limiter (RateLimiter | None): Keeps the requests within the
+            budget of their host, if given. Shared by all the clients.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        cache: HttpCache | None = None,
+        single_flight: SingleFlight | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.single_flight = single_flight
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        # Retries are done by the client, which also retries on 429.
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept"] = "application/json"
+
+        self._stats = ClientStats()
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._refresh_executor: ThreadPoolExecutor | None = None
+
+    @property
+    def stats(self) -> ClientStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return ClientStats(
+                requests=self._stats.requests,
+                retries=self._stats.retries,
+                failures=self._stats.failures,
+            )
+
+    def get_json(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        """Sends a GET request and returns the decoded JSON body.
+
+        See `get_content`.
+        """
+        return json.loads(self.get_content(path, params))
+
+    def get_content(self, path: str, params: dict[str, Any] | None = None) -> bytes:
+        """Sends a GET request and returns the raw body.
+
+        The body can be validated straight from its bytes, without decoding it
+        into Python objects first. Concurrent identical requests share one
+        response with a single-flight group. With a cache, fresh responses are
+        returned without any request, and stale ones are revalidated, or
+        refreshed in the background in stale-while-revalidate mode.
+
+        Args:
+            path (str): The path of the endpoint, e.g. `/authors`, or a full
+                URL.
+            params (dict[str, Any] | None): The query string parameters.
+
+        Returns:
+            bytes: The body of the response.
+
+        Raises:
+            requests.exceptions.RequestException: If the request still fails
+                after the retries, or fails with a status that is not retried.
+        """
+        url = resolve_url(self.base_url, path)
+        if self.single_flight is None:
+            return self._get_content(url, params)
+        # The base URL tells apart the APIs sharing the single-flight group.
+        key = (self.base_url, make_key(url, params))
+        return self.single_flight.do(key, lambda: self._get_content(url, params))
+
+    def _get_content(self, url: str, params: dict[str, Any] | None) -> bytes:
+        """Returns the body of a response, from the cache or the API."""
+        if self.cache is None:
+            return self._send(url, params).content
+
+        key = make_key(url, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            if cached.is_fresh():
+                return cached.body
+            if self.cache.can_serve_stale(cached):
+                self._refresh_in_background(url, params, cached)
+                return cached.body
+        return self._fetch(url, params, key, cached)
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def _fetch(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        key: str,
+        cached: CachedResponse | None,
+    ) -> bytes:
+        """Requests a response, revalidating the cached one, and caches it."""
+        headers = cached.conditional_headers() if cached is not None else None
+        response = self._send(url, params, headers)
+        if response.status_code == 304 and cached is not None:
+            self.cache.mark_revalidated(key)
+            return cached.body
+
+        self.cache.put(
+            key,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return response.content
+
+    def _refresh_in_background(
+        self, url: str, params: dict[str, Any] | None, cached: CachedResponse
+    ) -> None:
+        """Refreshes a stale cached response, once at a time per key."""
+        with self._lock:
+            if cached.key in self._refreshing:
+                return
+            self._refreshing.add(cached.key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="http_cache_refresh"
+                )
+
+        def refresh() -> None:
+            try:
+                self._fetch(url, params, cached.key, cached)
+            except requests.exceptions.RequestException as error:
+                logger.info("Could not refresh %s: %s", url, error)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cached.key)
+
+        self._refresh_executor.submit(refresh)
+
+    def _send(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """Sends a GET request, retrying it after transient failures."""
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            with self._lock:
+                self._stats.requests += 1
+            retry_after = None
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=self.timeout
+                )
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                response.raise_for_status()
+                return response
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.HTTPError,
+            ) as error:
+                status = getattr(error.response, "status_code", None)
+                retryable = status is None or status in RETRY_STATUSES
+                if not retryable or attempt == self.max_retries:
+                    with self._lock:
+                        self._stats.failures += 1
+                    raise
+
+                if retry_after is not None and self.rate_limiter is not None:
+                    # The other requests to the host wait too.
+                    self.rate_limiter.pause(url, retry_after)
+                delay = self._backoff(attempt, retry_after)
+                logger.info("GET %s failed (%s), retrying in %.2fs", url, error, delay)
+                with self._lock:
+                    self._stats.retries += 1
+                time.sleep(delay)
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        """Returns the seconds to wait before the next attempt."""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        # Full jitter: concurrent clients failing together do not retry together.
+        ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, ceiling)
@@ -0,0 +1,59 @@
+"""Connection of a store to the local SQLite file it keeps its state in.
+
+The stores of the tools, e.g. the HTTP cache, each keep one connection to
+their file, shared by the threads of the process. The file is opened in WAL
+mode, so that the processes sharing it read while one of them writes.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+
+class LocalDatabase:
+    """Opens the SQLite file of a store on first use, and creates its schema.
+
+    The store calls it with its own lock held, which serializes the use of
+    the connection across threads.
+
+    Args:
+        path (Path): The SQLite file, created with its directory if needed.
+        schema (str): The script creating the tables, run when the file is
+            opened.
+        pragmas (dict[str, str] | None): Pragmas set after the journal mode.
+        **options (Any): Other arguments of `sqlite3.connect`, e.g. `timeout`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        schema: str,
+        pragmas: dict[str, str] | None = None,
+        **options: Any,
+    ) -> None:
+        self.path = Path(path)
+        self.schema = schema
+        self.pragmas = dict(pragmas or {})
+        self.options = options
+
+        self._connection: sqlite3.Connection | None = None
+
+    def connect(self) -> sqlite3.Connection:
+        """Returns the connection to the file, opening it if needed."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, check_same_thread=False, **self.options
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            for name, value in self.pragmas.items():
+                connection.execute(f"PRAGMA {name} = {value}")
+            connection.executescript(self.schema)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        """Closes the connection; the next `connect` opens the file again."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,131 @@
+"""Schema migrations of the AI personalities database.
+
+Migrations are applied in order and tracked through `PRAGMA user_version`, so
+running them again is a no-op. They are applied from the command line, after
+creating or ingesting into the database:
+
+    python -m technology_scout.tools.migrations [path/to/ai_watch.db]
+
+The tools open the database read-only and never migrate it: they only check
+that its schema is up to date.
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+MIGRATIONS = [
+    # 1: secondary indexes, and a full-text index over name/bio/links kept in
+    # sync with the influencers table through triggers.
+    """
+    CREATE INDEX IF NOT EXISTS idx_influencers_nb_twitter_followers
+        ON influencers (nb_twitter_followers);
+    CREATE INDEX IF NOT EXISTS idx_influencers_type ON influencers (type);
+    CREATE INDEX IF NOT EXISTS idx_influencers_gender ON influencers (gender);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS influencers_fts USING fts5 (
+        name, bio, links,
+        content='influencers',
+        content_rowid='rank',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+    INSERT INTO influencers_fts (influencers_fts) VALUES ('rebuild');
+
+    CREATE TRIGGER IF NOT EXISTS influencers_fts_after_insert
+    AFTER INSERT ON influencers BEGIN
+        INSERT INTO influencers_fts (rowid, name, bio, links)
+        VALUES (new.rank, new.name, new.bio, new.links);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS influencers_fts_after_delete
+    AFTER DELETE ON influencers BEGIN
+        INSERT INTO influencers_fts (influencers_fts, rowid, name, bio, links)
+        VALUES ('delete', old.rank, old.name, old.bio, old.links);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS influencers_fts_after_update
+    AFTER UPDATE ON influencers BEGIN
+        INSERT INTO influencers_fts (influencers_fts, rowid, name, bio, links)
+        VALUES ('delete', old.rank, old.name, old.bio, old.links);
+        INSERT INTO influencers_fts (rowid, name, bio, links)
+        VALUES (new.rank, new.name, new.bio, new.links);
+    END;
+    """,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+_checked: set[Path] = set()
+_lock = threading.Lock()
+
+
+class SchemaOutdated(Exception):
+    """Raised when a database misses migrations the tools rely on."""
+
+
+def migrate(path_to_database: Path) -> int:
+    """Applies the pending migrations to a database.
+
+    Each migration runs in its own transaction, together with the update of
+    the schema version.
+
+    Args:
+        path_to_database (Path): The SQLite file to migrate.
+
+    Returns:
+        int: The number of migrations applied.
+    """
+    con = sqlite3.connect(path_to_database)
+    try:
+        (version,) = con.execute("PRAGMA user_version").fetchone()
+        for index in range(version, SCHEMA_VERSION):
+            con.executescript(
+                f"BEGIN;\n{MIGRATIONS[index]}\nPRAGMA user_version = {index + 1};\nCOMMIT;"
+            )
+        return max(0, SCHEMA_VERSION - version)
+    finally:
+        con.close()
+
+
+def schema_version(path_to_database: Path) -> int:
+    """Returns the schema version of a database, opened read-only."""
+    uri = f"{Path(path_to_database).resolve().as_uri()}?mode=ro"
+    con = sqlite3.connect(uri, uri=True)
+    try:
+        (version,) = con.execute("PRAGMA user_version").fetchone()
+        return version
+    finally:
+        con.close()
+
+
+def check_migrated(path_to_database: Path) -> None:
+    """Checks once per process that a database has all the migrations.
+
+    Raises:
+        SchemaOutdated: If migrations are pending.
+    """
+    path_to_database = Path(path_to_database).resolve()
+    if path_to_database in _checked:
+        return
+
+    with _lock:
+        if path_to_database not in _checked:
+            version = schema_version(path_to_database)
+            if version < SCHEMA_VERSION:
+                raise SchemaOutdated(
+                    f"The database {path_to_database} is at schema version "
+                    f"{version}, the tools need version {SCHEMA_VERSION}. Apply "
+                    "the migrations with `python -m technology_scout.tools.migrations "
+                    f"{path_to_database}`."
+                )
+            _checked.add(path_to_database)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        path = Path(sys.argv[1])
+    else:
+        from technology_scout.tools.select_from_db import path_to_database as path
+
+    print(f"Applied {migrate(path)} migration(s) to {path}")
@@ -0,0 +1,73 @@
+"""Tool to search the AI personalities by topic."""
+
+import re
+from typing import TYPE_CHECKING
+
+from llama_index.core.tools import FunctionTool
+
+from technology_scout.tools.migrations import check_migrated
+from technology_scout.tools.select_from_db import (
+    connection_manager,
+    influences_table_name,
+    path_to_database,
+)
+from technology_scout.tools.serialization import compact_output
+
+# pandas takes most of the import time of the tools, so it is only imported
+# when a query runs.
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_TOP_K = 10
+
+# Matches in the name weigh more than in the bio, which weigh more than links.
+_BM25_WEIGHTS = (10.0, 1.0, 0.5)
+
+
+def to_fts_query(text: str) -> str:
+    """Turns free text into an FTS5 query matching any of its words.
+
+    Every word is quoted, so that FTS5 operators in the text are searched for
+    literally, and used as a prefix, so that "robot" also matches "robotics".
+    """
+    words = re.findall(r"\w+", text)
+    return " OR ".join(f'"{word}"*' for word in words)
+
+
+def search_influencers(text: str, top_k: int = DEFAULT_TOP_K) -> "pd.DataFrame":
+    """Searches the AI personalities whose name, bio or links match a text, best matches first.
+
+    Use it to find people by topic (e.g. "robotics", "computer vision", "podcast") rather than writing `LIKE` queries with `select_from_db`.
+
+    Args:
+        text (str): The words to search for.
+        top_k (int): The maximum number of personalities to return.
+
+    Returns:
+        pd.DataFrame: The matching personalities, best matches first.
+    """
+    import pandas as pd
+
+    fts_query = to_fts_query(text)
+    if not fts_query:
+        return pd.DataFrame()
+
+    check_migrated(path_to_database)
+    con = connection_manager.get_connection()
+    fts_table_name = f"{influences_table_name}_fts"
+    weights = ", ".join(map(str, _BM25_WEIGHTS))
+    return pd.read_sql_query(
+        f"""
+        SELECT i.rank, i.name, i.bio, i.twitter_username, i.nb_twitter_followers
+        FROM {fts_table_name}
+        JOIN {influences_table_name} AS i ON i.rank = {fts_table_name}.rowid
+        WHERE {fts_table_name} MATCH ?
+        ORDER BY bm25({fts_table_name}, {weights})
+        LIMIT ?
+        """,
+        con,
+        params=(fts_query, top_k),
+    )
+
+
+search_influencers_tool = FunctionTool.from_defaults(compact_output(search_influencers))
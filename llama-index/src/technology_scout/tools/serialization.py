@@ -0,0 +1,193 @@
+"""Compact, token-efficient text serialization of tool results.
+
+Tool results end up in the prompt of the LLM. Instead of the default `repr` or
+JSON of dataframes, pydantic models and dataclasses, which repeat every key on
+every row and spell out every null field, results are rendered as a
+tab-separated table with a single header line, columns that are null on every
+row dropped, and long values truncated.
+"""
+
+import dataclasses
+import functools
+import inspect
+import math
+import re
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+
+DEFAULT_MAX_FIELD_CHARS = 300
+DEFAULT_MAX_ROWS = 50
+EMPTY_RESULT = "No results."
+
+# The first line of the "Returns:" section of a Google style docstring
+_RETURNS = re.compile(r"(\n\nReturns:\n[ \t]+)[^\n:]+: ([^\n]*?)\.?(?=\n|$)")
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def format_value(value: Any, max_chars: int | None = DEFAULT_MAX_FIELD_CHARS) -> str:
+    """Renders a single cell, on one line and truncated to `max_chars`."""
+    if _is_null(value):
+        return ""
+    if isinstance(value, (list, tuple)):
+        text = "; ".join(format_value(item, None) for item in value)
+    elif isinstance(value, float) and value.is_integer():
+        text = str(int(value))
+    else:
+        text = str(value)
+
+    text = " ".join(text.split())
+    if max_chars is not None and len(text) > max_chars:
+        return text[: max_chars - 1] + "…"
+    return text
+
+
+def to_compact_table(
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    max_field_chars: int | None = DEFAULT_MAX_FIELD_CHARS,
+    max_rows: int | None = DEFAULT_MAX_ROWS,
+    drop_null_columns: bool = True,
+) -> str:
+    """Renders rows as a tab-separated table with a single header line.
+
+    Args:
+        columns (Sequence[str]): The column names.
+        rows (Iterable[Sequence[Any]]): The rows, in the order of `columns`.
+        max_field_chars (int | None): Values longer than this are truncated.
+        max_rows (int | None): Rows beyond this number are summarized.
+        drop_null_columns (bool): Whether to drop columns null on every row.
+
+    Returns:
+        str: The table.
+    """
+    rows = [list(row) for row in rows]
+    if not rows:
+        return EMPTY_RESULT
+
+    kept = [
+        i
+        for i in range(len(columns))
+        if not drop_null_columns or any(not _is_null(row[i]) for row in rows)
+    ]
+
+    lines = ["\t".join(columns[i] for i in kept)]
+    for row in rows[:max_rows]:
+        lines.append("\t".join(format_value(row[i], max_field_chars) for i in kept))
+
+    if max_rows is not None and len(rows) > max_rows:
+        lines.append(f"[... {len(rows) - max_rows} more rows]")
+
+    return "\n".join(lines)
+
+
+def _models_to_table(models: Sequence[BaseModel], **options: Any) -> str:
+    dumps = [model.model_dump() for model in models]
+    columns = list(dict.fromkeys(key for dump in dumps for key in dump))
+    return to_compact_table(
+        columns, ([dump.get(column) for column in columns] for dump in dumps), **options
+    )
+
+
+def _dataclasses_to_table(items: Sequence[Any], **options: Any) -> str:
+    columns = list(
+        dict.fromkeys(
+            field.name for item in items for field in dataclasses.fields(item)
+        )
+    )
+    return to_compact_table(
+        columns,
+        ([getattr(item, column, None) for column in columns] for item in items),
+        **options,
+    )
+
+
+def _is_dataclass_instance(value: Any) -> bool:
+    return dataclasses.is_dataclass(value) and not isinstance(value, type)
+
+
+def serialize(result: Any, **options: Any) -> str:
+    """Serializes a tool result into compact text.
+
+    Dataframes, pydantic models, dataclasses, e.g. the projections of the
+    models, and dicts (or lists of them) are rendered with `to_compact_table`.
+    Strings are returned unchanged, and anything else is rendered with `str`.
+
+    Args:
+        result (Any): The tool result.
+        **options: Options forwarded to `to_compact_table`.
+
+    Returns:
+        str: The serialized result.
+    """
+    if isinstance(result, str):
+        return result
+    if result is None:
+        return EMPTY_RESULT
+    if isinstance(result, (BaseModel, dict)) or _is_dataclass_instance(result):
+        result = [result]
+
+    # Checked by module name so that pandas does not need to be imported here.
+    if type(result).__module__.startswith("pandas") and hasattr(result, "columns"):
+        return to_compact_table(
+            [str(column) for column in result.columns],
+            result.itertuples(index=False, name=None),
+            **options,
+        )
+
+    if isinstance(result, (list, tuple)):
+        if not result:
+            return EMPTY_RESULT
+        if all(isinstance(item, BaseModel) for item in result):
+            return _models_to_table(result, **options)
+        if all(_is_dataclass_instance(item) for item in result):
+            return _dataclasses_to_table(result, **options)
+        if all(isinstance(item, dict) for item in result):
+            columns = list(dict.fromkeys(key for item in result for key in item))
+            return to_compact_table(
+                columns,
+                ([item.get(column) for column in columns] for item in result),
+                **options,
+            )
+
+    return str(result)
+
+
+def compact_output(fn: Callable[..., Any], **options: Any) -> Callable[..., str]:
+    """Wraps a tool function so that it returns its result serialized.
+
+    The wrapper keeps the name, signature and docstring of `fn`, so the
+    frameworks build the same tool schema as for `fn` itself, except for the
+    return value, which is documented as text. Coroutine functions are
+    wrapped into coroutine functions.
+
+    Args:
+        fn (Callable[..., Any]): The tool function.
+        **options: Options forwarded to `to_compact_table`.
+
+    Returns:
+        Callable[..., str]: The wrapped function.
+    """
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> str:
+            return serialize(await fn(*args, **kwargs), **options)
+
+    else:
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> str:
+            return serialize(fn(*args, **kwargs), **options)
+
+    wrapper.__annotations__ = {**fn.__annotations__, "return": str}
+    if fn.__doc__:
+        wrapper.__doc__ = _RETURNS.sub(
+            r"\1str: \2, as a compact text table.", inspect.cleandoc(fn.__doc__), 1
+        )
+    return wrapper
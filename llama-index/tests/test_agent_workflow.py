@@ -1,10 +1,38 @@
 import asyncio
 import json
+import threading
+import time
+from typing import Any
+from llama_index.core.agent.react.types import (
+    ActionReasoningStep,
+    ObservationReasoningStep,
+)
+from llama_index.core.llms import (
+    ChatMessage,
+    ChatResponse,
+    CompletionResponse,
+    CustomLLM,
+    LLMMetadata,
+    MockLLM,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.llms.function_calling import FunctionCallingLLM
+from llama_index.core.agent.react import ReActChatFormatter
+from llama_index.core.tools import FunctionTool, ToolSelection
+from llama_index.core.utils import get_tokenizer
+from llama_index.core.workflow import Context
+from llama_index.core.workflow.errors import WorkflowTimeoutError
 from technology_scout.agent_workflow import (
     create_agent_workflow,
     run_agent_workflow,
+    MultiActionOutputParser,
+    MultiActionReasoningStep,
     ReasoningAgent,
+    ToolCallEvent,
+    compact_observation,
+    is_async_tool,
 )
+from technology_scout.checkpoint_store import CheckpointStore
 import pytest
 import nest_asyncio
 
@@ -20,6 +48,477 @@ class TestCreateAgent:
         assert isinstance(agent, ReasoningAgent)
 
 
+def make_tools(cancelled: list[str]) -> list[FunctionTool]:
+    """Returns slow sync and async stub tools, and a failing one."""
+
+    def slow_sync(seconds: float) -> str:
+        """Sleeps in a thread."""
+        time.sleep(seconds)
+        return f"sync {seconds}"
+
+    async def slow_async(seconds: float) -> str:
+        """Sleeps on the event loop."""
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            cancelled.append("slow_async")
+            raise
+        return f"async {seconds}"
+
+    def failing() -> str:
+        """Fails."""
+        raise RuntimeError("boom")
+
+    return [
+        FunctionTool.from_defaults(slow_sync),
+        FunctionTool.from_defaults(async_fn=slow_async),
+        FunctionTool.from_defaults(failing),
+    ]
+
+
+def call(tool_name: str, **tool_kwargs) -> ToolSelection:
+    """Returns a tool call."""
+    return ToolSelection(
+        tool_id=tool_name, tool_name=tool_name, tool_kwargs=tool_kwargs
+    )
+
+
+async def execute(agent: ReasoningAgent, tool_calls: list[ToolSelection]) -> list[str]:
+    """Runs the tool calls of a step, and returns the observations."""
+    ctx = Context(agent)
+    await agent.execute_tools(ctx, ToolCallEvent(tool_calls=tool_calls))
+    return [step.observation for step in await ctx.get("current_reasoning")]
+
+
+class TestExecuteTools:
+    def test_is_async_tool(self) -> None:
+        """Tests that the tools with a coroutine are told apart from the sync ones."""
+        sync_tool, async_tool, _ = make_tools([])
+        assert not is_async_tool(sync_tool)
+        assert is_async_tool(async_tool)
+
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently(self) -> None:
+        """Tests that a step takes as long as its slowest tool, observed in order."""
+        agent = ReasoningAgent(llm=MockLLM(), tools=make_tools([]))
+        tool_calls = [
+            call("slow_sync", seconds=0.3),
+            call("slow_async", seconds=0.3),
+            call("slow_sync", seconds=0.1),
+            call("slow_async", seconds=0.1),
+        ]
+
+        start = time.perf_counter()
+        observations = await execute(agent, tool_calls)
+        duration = time.perf_counter() - start
+
+        assert observations == ["sync 0.3", "async 0.3", "sync 0.1", "async 0.1"]
+        assert duration < 0.5
+
+    @pytest.mark.asyncio
+    async def test_sync_tools_share_a_bounded_pool(self) -> None:
+        """Tests that no more sync tools run at once than the pool has threads."""
+        agent = ReasoningAgent(llm=MockLLM(), tools=make_tools([]), max_tool_workers=2)
+
+        start = time.perf_counter()
+        await execute(agent, [call("slow_sync", seconds=0.2)] * 4)
+        duration = time.perf_counter() - start
+
+        assert 0.4 <= duration < 0.6
+
+    @pytest.mark.asyncio
+    async def test_timeouts(self) -> None:
+        """Tests that the calls running over their timeout are observed as such."""
+        cancelled = []
+        agent = ReasoningAgent(
+            llm=MockLLM(),
+            tools=make_tools(cancelled),
+            tool_timeout=1.0,
+            tool_timeouts={"slow_async": 0.1},
+        )
+
+        observations = await execute(
+            agent, [call("slow_async", seconds=5), call("slow_sync", seconds=0.2)]
+        )
+
+        assert observations == ["Tool slow_async timed out after 0.1s", "sync 0.2"]
+        assert cancelled == ["slow_async"]
+
+    @pytest.mark.asyncio
+    async def test_failures(self) -> None:
+        """Tests that unknown and failing tools are observed, and the others not affected."""
+        agent = ReasoningAgent(llm=MockLLM(), tools=make_tools([]))
+
+        observations = await execute(
+            agent, [call("missing"), call("failing"), call("slow_async", seconds=0)]
+        )
+
+        assert observations[0].startswith("Tool missing does not exist.")
+        assert observations[1] == "Error calling tool failing: boom"
+        assert observations[2] == "async 0"
+
+
+class ScriptedLLM(CustomLLM):
+    """Answers the prompts with the given outputs, in order."""
+
+    outputs: list[str]
+    calls: int = 0
+    prompts: list[list[ChatMessage]] = []
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata()
+
+    def chat(self, messages: list[ChatMessage], **kwargs: Any) -> ChatResponse:
+        self.prompts.append(list(messages))
+        return super().chat(messages, **kwargs)
+
+    @llm_completion_callback()
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        self.calls += 1
+        return CompletionResponse(text=self.outputs[self.calls - 1])
+
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        raise NotImplementedError
+
+
+MULTI_ACTION_OUTPUT = """Thought: I need the results of both calls.
+Action: slow_async
+Action Input: {"seconds": 0.5}
+Action: slow_sync
+Action Input: {"seconds": 0.5}"""
+
+
+class TestMultiActionSteps:
+    def test_parse_several_actions(self) -> None:
+        """Tests that the actions after a single thought are all parsed."""
+        step = MultiActionOutputParser().parse(MULTI_ACTION_OUTPUT)
+
+        assert isinstance(step, MultiActionReasoningStep)
+        assert step.thought == "I need the results of both calls."
+        assert [(action.action, action.action_input) for action in step.actions] == [
+            ("slow_async", {"seconds": 0.5}),
+            ("slow_sync", {"seconds": 0.5}),
+        ]
+        assert not step.is_done
+
+    def test_parse_single_action(self) -> None:
+        """Tests that the outputs with a single action are parsed as usual."""
+        output = MULTI_ACTION_OUTPUT.rsplit("\nAction: slow_sync", 1)[0]
+
+        step = MultiActionOutputParser().parse(output)
+
+        assert isinstance(step, ActionReasoningStep)
+        assert step.action_input == {"seconds": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_actions_are_executed_together(self) -> None:
+        """Tests that the actions of a step cost one LLM call and run at once."""
+        llm = ScriptedLLM(outputs=[MULTI_ACTION_OUTPUT, "Thought: Done.\nAnswer: 42"])
+        agent = ReasoningAgent(llm=llm, tools=make_tools([]), timeout=10)
+        # Loads the tokenizer of the memory before timing.
+        get_tokenizer()
+
+        start = time.perf_counter()
+        result = await agent.run(input="Call both tools.")
+        duration = time.perf_counter() - start
+
+        assert result["response"] == "42"
+        assert llm.calls == 2
+        # The two calls take 1s one after the other.
+        assert duration < 0.9
+        steps = result["reasoning"]
+        assert isinstance(steps[0], MultiActionReasoningStep)
+        assert [step.observation for step in steps[1:3]] == ["async 0.5", "sync 0.5"]
+        assert all(isinstance(step, ObservationReasoningStep) for step in steps[1:3])
+
+
+class ScriptedToolCallingLLM(FunctionCallingLLM, CustomLLM):
+    """Answers with the given tool calls, or else the given text, in order."""
+
+    outputs: list[list[ToolSelection] | str]
+    prompts: list[list[ChatMessage]] = []
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(is_function_calling_model=True)
+
+    def _prepare_chat_with_tools(self, tools, chat_history=None, **kwargs) -> dict:
+        return {"messages": chat_history}
+
+    async def achat(self, messages: list[ChatMessage], **kwargs: Any) -> ChatResponse:
+        self.prompts.append(list(messages))
+        output = self.outputs[len(self.prompts) - 1]
+        if isinstance(output, str):
+            return ChatResponse(message=ChatMessage(role="assistant", content=output))
+        return ChatResponse(
+            message=ChatMessage(
+                role="assistant", content="", additional_kwargs={"tool_calls": output}
+            )
+        )
+
+    def get_tool_calls_from_response(
+        self, response: ChatResponse, error_on_no_tool_call: bool = True, **kwargs
+    ) -> list[ToolSelection]:
+        return response.message.additional_kwargs.get("tool_calls", [])
+
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        raise NotImplementedError
+
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        raise NotImplementedError
+
+
+class TestFunctionCallingMode:
+    def test_falls_back_to_react(self) -> None:
+        """Tests that the LLMs without tool calling use the ReAct format."""
+        agent = ReasoningAgent(llm=MockLLM(), function_calling=True)
+        assert not agent.function_calling
+
+    @pytest.mark.asyncio
+    async def test_tool_calls(self) -> None:
+        """Tests that the tool calls of the LLM are run and their results sent back."""
+        llm = ScriptedToolCallingLLM(
+            outputs=[
+                [
+                    call("slow_async", seconds=0.1),
+                    call("slow_sync", seconds=0.1),
+                ],
+                "42",
+            ]
+        )
+        agent = ReasoningAgent(
+            llm=llm, tools=make_tools([]), function_calling=True, timeout=10
+        )
+
+        result = await agent.run(input="Call both tools.")
+
+        assert result["response"] == "42"
+        assert (result["steps"], result["parse_failures"]) == (2, 0)
+        assert isinstance(result["reasoning"][0], MultiActionReasoningStep)
+        system, user, assistant, *tool_results = llm.prompts[1]
+        assert system.role == "system" and user.content == "Call both tools."
+        assert len(assistant.additional_kwargs["tool_calls"]) == 2
+        assert [
+            (message.role, message.additional_kwargs["tool_call_id"], message.content)
+            for message in tool_results
+        ] == [("tool", "slow_async", "async 0.1"), ("tool", "slow_sync", "sync 0.1")]
+
+    @pytest.mark.asyncio
+    async def test_react_parse_failures_are_counted(self) -> None:
+        """Tests that the ReAct outputs which cannot be parsed are counted."""
+        llm = ScriptedLLM(
+            outputs=["Thought: I need a tool.\nAction: slow_sync", "Answer: 42"]
+        )
+        agent = ReasoningAgent(llm=llm, tools=make_tools([]), timeout=10)
+
+        result = await agent.run(input="Call a tool.")
+
+        assert result["response"] == "Answer: 42"
+        assert (result["steps"], result["parse_failures"]) == (2, 1)
+
+
+def echo(text: str) -> str:
+    """Returns the text."""
+    return text
+
+
+ECHO_STEP = """Thought: I need the text.
+Action: echo
+Action Input: {{"text": "{text}"}}"""
+
+
+class TestPromptAssembly:
+    @pytest.mark.asyncio
+    async def test_prompts_are_append_only(self) -> None:
+        """Tests that each prompt extends the previous one, as the formatter renders it."""
+        llm = ScriptedLLM(
+            outputs=[
+                ECHO_STEP.format(text="first"),
+                ECHO_STEP.format(text="second"),
+                "Thought: Done.\nAnswer: 42",
+            ]
+        )
+        tools = [FunctionTool.from_defaults(echo)]
+        agent = ReasoningAgent(llm=llm, tools=tools, timeout=10)
+
+        result = await agent.run(input="Echo twice.")
+
+        first, second, last = llm.prompts
+        assert second[: len(first)] == first
+        assert last[: len(second)] == second
+        formatter = ReActChatFormatter.from_defaults(context=agent.formatter.context)
+        assert last == formatter.format(
+            tools, last[1:2], current_reasoning=result["reasoning"][:-1]
+        )
+
+    @pytest.mark.asyncio
+    async def test_old_observations_are_compacted(self) -> None:
+        """Tests that the oldest observations over the budget are compacted."""
+        texts = [letter * 1000 for letter in "abc"]
+        llm = ScriptedLLM(
+            outputs=[ECHO_STEP.format(text=text) for text in texts]
+            + ["Thought: Done.\nAnswer: 42"]
+        )
+        agent = ReasoningAgent(
+            llm=llm,
+            tools=[FunctionTool.from_defaults(echo)],
+            observation_token_budget=400,
+            timeout=10,
+        )
+
+        result = await agent.run(input="Echo three times.")
+
+        observations = [
+            message.content for message in llm.prompts[-1] if message.role == "user"
+        ][1:]
+        assert observations == [
+            compact_observation(f"Observation: {texts[0]}"),
+            compact_observation(f"Observation: {texts[1]}"),
+            f"Observation: {texts[2]}",
+        ]
+        # The observations of the previous prompt were compacted in order.
+        assert llm.prompts[-2][3].content == observations[0]
+        assert [step.observation for step in result["reasoning"][1::2]] == texts
+
+
+def make_fetch_tool(calls: list[str], blocked: set[str]) -> FunctionTool:
+    """A tool recording its calls, and never returning for the blocked texts."""
+
+    async def fetch(text: str) -> str:
+        """Fetches a text."""
+        calls.append(text)
+        if text in blocked:
+            await asyncio.sleep(60)
+        return f"fetched {text}"
+
+    return FunctionTool.from_defaults(async_fn=fetch)
+
+
+FETCH_STEP = """Thought: I need both texts.
+Action: fetch
+Action Input: {"text": "a"}
+Action: fetch
+Action Input: {"text": "b"}"""
+
+
+class TestCheckpoints:
+    def test_store(self, tmp_path) -> None:
+        """Tests that a run keeps its last checkpoint and its tool outputs."""
+        store = CheckpointStore(tmp_path / "checkpoints.db")
+
+        store.save("run", 1, {"step_count": 1})
+        store.save("run", 2, {"step_count": 2})
+        store.put_tool_output("run", "call", {"observation": "done"})
+
+        assert store.load("run") == {"step_count": 2}
+        assert store.load("other") is None
+        assert store.get_tool_outputs("run") == {"call": {"observation": "done"}}
+        assert [run[:2] for run in store.runs()] == [("run", 2)]
+        store.delete("run")
+        assert store.load("run") is None and store.get_tool_outputs("run") == {}
+
+    @pytest.mark.asyncio
+    async def test_resume_after_timeout(self, tmp_path) -> None:
+        """Tests that a run resumes from its last step without calling its tools again."""
+        store = CheckpointStore(tmp_path / "checkpoints.db")
+        calls = []
+        llm = ScriptedLLM(outputs=[FETCH_STEP])
+        agent = ReasoningAgent(
+            llm=llm,
+            tools=[make_fetch_tool(calls, blocked={"b"})],
+            checkpoint_store=store,
+            tool_timeout=None,
+            timeout=1,
+        )
+
+        with pytest.raises(WorkflowTimeoutError):
+            await agent.run(input="Fetch both texts.", run_id="run")
+
+        assert store.load("run")["event"]["type"] == "ToolCallEvent"
+        llm = ScriptedLLM(outputs=["Thought: Done.\nAnswer: 42"])
+        agent = ReasoningAgent(
+            llm=llm,
+            tools=[make_fetch_tool(calls, blocked=set())],
+            checkpoint_store=store,
+            timeout=10,
+        )
+
+        result = await agent.run(input="Fetch both texts.", run_id="run")
+
+        assert result["response"] == "42"
+        # The LLM is only called for the step after the checkpoint, and only
+        # the call which did not complete is made again.
+        assert llm.calls == 1
+        assert calls == ["a", "b", "b"]
+        assert result["steps"] == 2
+        assert isinstance(result["reasoning"][0], MultiActionReasoningStep)
+        assert [step.observation for step in result["reasoning"][1:3]] == [
+            "fetched a",
+            "fetched b",
+        ]
+        assert [source.content for source in result["sources"]] == [
+            "fetched a",
+            "fetched b",
+        ]
+        # The prompt is the one the interrupted run would have sent.
+        user, assistant, *observations = llm.prompts[0][1:]
+        assert user.content == "Fetch both texts."
+        assert assistant.content == result["reasoning"][0].get_content()
+        assert [message.content for message in observations] == [
+            "Observation: fetched a",
+            "Observation: fetched b",
+        ]
+        # A run which ended cannot be resumed.
+        assert store.load("run") is None
+        assert store.get_tool_outputs("run") == {}
+
+    @pytest.mark.asyncio
+    async def test_runs_without_id_are_not_saved(self, tmp_path) -> None:
+        """Tests that only the runs given an id are saved."""
+        store = CheckpointStore(tmp_path / "checkpoints.db")
+        llm = ScriptedLLM(outputs=[FETCH_STEP, "Thought: Done.\nAnswer: 42"])
+        agent = ReasoningAgent(
+            llm=llm,
+            tools=[make_fetch_tool([], blocked=set())],
+            checkpoint_store=store,
+            timeout=10,
+        )
+
+        result = await agent.run(input="Fetch both texts.")
+
+        assert result["response"] == "42"
+        assert store.stats.saved == store.stats.tool_outputs == 0
+
+    @pytest.mark.asyncio
+    async def test_store_does_not_block_event_loop(self, tmp_path, monkeypatch) -> None:
+        """Tests that the store is only written and read outside of the event loop."""
+        threads = []
+        store = CheckpointStore(tmp_path / "checkpoints.db")
+        connect = store._database.connect
+
+        def record_thread():
+            threads.append(threading.current_thread())
+            return connect()
+
+        monkeypatch.setattr(store._database, "connect", record_thread)
+        llm = ScriptedLLM(outputs=[FETCH_STEP, "Thought: Done.\nAnswer: 42"])
+        agent = ReasoningAgent(
+            llm=llm,
+            tools=[make_fetch_tool([], blocked=set())],
+            checkpoint_store=store,
+            timeout=10,
+        )
+
+        result = await agent.run(input="Fetch both texts.", run_id="run")
+
+        assert result["response"] == "42"
+        assert store.stats.saved and store.stats.tool_outputs == 2
+        assert threads and threading.current_thread() not in threads
+
+
 class TestAgent:
     @pytest.mark.asyncio
     async def test_on_simple_task(self) -> None:
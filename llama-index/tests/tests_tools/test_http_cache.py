@@ -0,0 +1,298 @@
+"""Tests for the SQLite cache of the Papers with Code responses."""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from technology_scout.tools import http_cache
+from technology_scout.tools.async_http_client import AsyncHttpClient
+from technology_scout.tools.http_cache import HttpCache, make_key
+from technology_scout.tools.http_client import HttpClient
+
+ETAG = '"v1"'
+
+
+class EtagServer(ThreadingHTTPServer):
+    """Answers with a JSON body tagged `ETAG`, or a 304 when it is matched."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), EtagHandler)
+        self.requests = 0
+        self.not_modified = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self) -> "EtagServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: EtagServer
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        if self.headers.get("If-None-Match") == ETAG:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def wait_for(condition, timeout: float = 2.0) -> None:
+    """Waits until `condition()` is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+class TestMakeKey:
+    def test_params_are_normalized(self) -> None:
+        """Tests that the order and the place of the parameters do not matter."""
+        assert make_key(
+            "https://paperswithcode.com/api/v1/authors/yann-lecun/papers/",
+            {"page": 2, "items_per_page": 50},
+        ) == make_key(
+            "https://PapersWithCode.com/api/v1/authors/yann-lecun/papers"
+            "?items_per_page=50&page=2"
+        )
+
+    def test_hosts_are_told_apart(self, tmp_path: Path) -> None:
+        """Tests that the same path on two hosts gives two cache entries."""
+        cache = HttpCache(tmp_path / "cache.db")
+        # Nothing listens on these ports: the bodies must come from the cache.
+        hosts = ["http://127.0.0.1:9", "http://127.0.0.1:10"]
+        for host in hosts:
+            cache.put(make_key(f"{host}/api/v1/authors", {"q": "LeCun"}), host.encode())
+
+        assert len(cache.entries()) == 2
+        for host in hosts:
+            client = HttpClient(f"{host}/api/v1", cache=cache)
+            assert client.get_content("/authors", {"q": "LeCun"}) == host.encode()
+
+    def test_endpoint_ttls(self, tmp_path: Path) -> None:
+        """Tests that the first matching expression gives the TTL."""
+        cache = HttpCache(
+            tmp_path / "cache.db",
+            ttls={r"/papers(\?|$)": 10, r"/authors": 20},
+            default_ttl=30,
+        )
+        assert cache.ttl_for(make_key("/api/v1/authors/x/papers", {"page": 1})) == 10
+        assert cache.ttl_for(make_key("/api/v1/authors", {"q": "x"})) == 20
+        assert cache.ttl_for(make_key("/api/v1/papers/x/repositories")) == 30
+
+
+class TestHttpCache:
+    def test_expiry(self, tmp_path: Path) -> None:
+        """Tests that responses are fresh until their TTL."""
+        cache = HttpCache(tmp_path / "cache.db", ttls={"fresh": 60}, default_ttl=0)
+        cache.put("/fresh", b"[1]")
+        cache.put("/stale", b"[2]")
+
+        assert cache.get("/fresh").is_fresh()
+        assert cache.get("/fresh").json() == [1]
+        assert not cache.get("/stale").is_fresh()
+        assert cache.get("/missing") is None
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 1
+
+    def test_least_recently_used_are_evicted(self, tmp_path: Path) -> None:
+        """Tests that the cache evicts the least recently used responses."""
+        cache = HttpCache(tmp_path / "cache.db", max_bytes=250, access_resolution=0)
+        for key in ["/a", "/b"]:
+            cache.put(key, b"x" * 100)
+            time.sleep(0.01)
+        cache.get("/a")
+        time.sleep(0.01)
+        cache.put("/c", b"x" * 100)
+
+        assert [entry["key"] for entry in cache.entries()] == ["/c", "/a"]
+        assert cache.stats.evicted == 1
+
+    def test_hits_update_the_access_time_once(self, tmp_path: Path) -> None:
+        """Tests that the hits within the access resolution write nothing."""
+        cache = HttpCache(tmp_path / "cache.db", access_resolution=60)
+        cache.put("/a", b"[]")
+        connection = cache._database.connect()
+        changes = connection.total_changes
+
+        for _ in range(3):
+            cache.get("/a")
+
+        assert connection.total_changes == changes
+        cache.access_resolution = 0
+        cache.get("/a")
+        assert connection.total_changes == changes + 1
+
+    def test_prune(self, tmp_path: Path) -> None:
+        """Tests pruning the expired responses, then those of an endpoint."""
+        cache = HttpCache(tmp_path / "cache.db", ttls={"papers": 60}, default_ttl=0)
+        cache.put("/authors?q=a", b"{}")
+        cache.put("/authors/a/papers", b"{}")
+        cache.put("/authors/b/papers", b"{}")
+
+        assert cache.prune(expired=True) == 1
+        assert cache.prune(pattern="/a/") == 1
+        assert [entry["key"] for entry in cache.entries()] == ["/authors/b/papers"]
+
+    def test_persistence(self, tmp_path: Path) -> None:
+        """Tests that the responses outlive the cache object."""
+        HttpCache(tmp_path / "cache.db").put("/authors", b"[]")
+        assert HttpCache(tmp_path / "cache.db").get("/authors").json() == []
+
+
+class TestCachedClient:
+    def test_fresh_responses_are_not_requested(self, tmp_path: Path) -> None:
+        """Tests that a fresh cached response is returned without a request."""
+        with EtagServer() as server:
+            client = HttpClient(server.base_url, cache=HttpCache(tmp_path / "c.db"))
+            first = client.get_json("/authors", params={"q": "LeCun"})
+            second = client.get_json("/authors", params={"q": "LeCun"})
+
+        assert first == second
+        assert server.requests == 1
+
+    def test_stale_responses_are_revalidated(self, tmp_path: Path) -> None:
+        """Tests that a stale response is revalidated with its ETag."""
+        cache = HttpCache(tmp_path / "c.db", default_ttl=0)
+        with EtagServer() as server:
+            client = HttpClient(server.base_url, cache=cache)
+            first = client.get_json("/authors")
+            second = client.get_json("/authors")
+
+        assert first == second
+        assert server.requests == 2
+        assert server.not_modified == 1
+        assert cache.stats.revalidated == 1
+
+    def test_stale_while_revalidate(self, tmp_path: Path) -> None:
+        """Tests that a stale response is returned while refreshed in background."""
+        cache = HttpCache(tmp_path / "c.db", default_ttl=0, stale_while_revalidate=60)
+        with EtagServer() as server:
+            client = HttpClient(server.base_url, cache=cache)
+            client.get_json("/authors")
+            assert client.get_json("/authors") == {"path": "/api/v1/authors"}
+            wait_for(lambda: cache.stats.revalidated == 1)
+
+        assert cache.stats.stale_hits == 1
+        assert server.not_modified == 1
+
+    def test_async_client(self, tmp_path: Path) -> None:
+        """Tests that the async client shares the cache."""
+        cache = HttpCache(tmp_path / "c.db")
+        with EtagServer() as server:
+            HttpClient(server.base_url, cache=cache).get_json("/authors")
+            client = AsyncHttpClient(server.base_url, cache=cache)
+            response = asyncio.run(client.get_json("/authors"))
+
+        assert response == {"path": "/api/v1/authors"}
+        assert server.requests == 1
+
+    def test_async_stale_responses_are_revalidated(self, tmp_path: Path) -> None:
+        """Tests that the async client revalidates a stale response with its ETag."""
+        cache = HttpCache(tmp_path / "c.db", default_ttl=0)
+
+        async def get_twice(client: AsyncHttpClient) -> list:
+            return [await client.get_json("/authors") for _ in range(2)]
+
+        with EtagServer() as server:
+            first, second = asyncio.run(
+                get_twice(AsyncHttpClient(server.base_url, cache=cache))
+            )
+
+        assert first == second
+        assert server.not_modified == 1
+        assert cache.stats.revalidated == 1
+
+    def test_async_stale_while_revalidate(self, tmp_path: Path) -> None:
+        """Tests the background refresh of the async client."""
+        cache = HttpCache(tmp_path / "c.db", default_ttl=0, stale_while_revalidate=60)
+
+        async def get_twice(client: AsyncHttpClient) -> None:
+            await client.get_json("/authors")
+            await client.get_json("/authors")
+            await asyncio.gather(*client._refresh_tasks)
+
+        with EtagServer() as server:
+            asyncio.run(get_twice(AsyncHttpClient(server.base_url, cache=cache)))
+
+        assert cache.stats.stale_hits == 1
+        assert server.not_modified == 1
+
+    def test_async_client_does_not_block_event_loop(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Tests that the async client reads and writes the cache in threads."""
+        threads = []
+        cache = HttpCache(tmp_path / "c.db", default_ttl=0)
+        connect = cache._database.connect
+
+        def record_thread():
+            threads.append(threading.current_thread())
+            return connect()
+
+        monkeypatch.setattr(cache._database, "connect", record_thread)
+
+        async def get_twice(client: AsyncHttpClient) -> None:
+            await client.get_json("/authors")
+            await client.get_json("/authors")
+
+        with EtagServer() as server:
+            asyncio.run(get_twice(AsyncHttpClient(server.base_url, cache=cache)))
+
+        assert server.not_modified == 1
+        assert threads and threading.current_thread() not in threads
+
+
+class TestCommandLine:
+    def test_stats_and_prune(self, tmp_path: Path, monkeypatch, capsys) -> None:
+        """Tests the stats and prune commands."""
+        path = tmp_path / "cache.db"
+        HttpCache(path, default_ttl=0).put("/authors", b"[]")
+
+        monkeypatch.setattr(sys, "argv", ["http_cache", "--path", str(path), "stats"])
+        http_cache.main()
+        assert "1 responses" in capsys.readouterr().out
+
+        monkeypatch.setattr(
+            sys, "argv", ["http_cache", "--path", str(path), "prune", "--expired"]
+        )
+        http_cache.main()
+        assert "Deleted 1 responses" in capsys.readouterr().out
+
+
+def main() -> None:
+    """Main function."""
+
+    test_make_key = TestMakeKey()
+    test_make_key.test_params_are_normalized()
+
+
+if __name__ == "__main__":
+    main()
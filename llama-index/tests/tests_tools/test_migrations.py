@@ -0,0 +1,129 @@
+"""Tests for the database schema migrations."""
+
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from technology_scout.tools.migrations import (
+    SCHEMA_VERSION,
+    SchemaOutdated,
+    check_migrated,
+    migrate,
+)
+from technology_scout.tools.select_from_db import (
+    influences_table_name,
+    path_to_database,
+)
+
+
+def copy_database(tmp_path):
+    """Copies the shipped database, at schema version 0."""
+    path = tmp_path / "ai_watch.db"
+    shutil.copy(path_to_database, path)
+    return path
+
+
+def fts_match(path, text: str) -> list[int]:
+    """Returns the ranks matching a full-text query."""
+    with sqlite3.connect(path) as con:
+        rows = con.execute(
+            f"SELECT rowid FROM {influences_table_name}_fts "
+            f"WHERE {influences_table_name}_fts MATCH ? ORDER BY rowid",
+            (text,),
+        ).fetchall()
+    return [row[0] for row in rows]
+
+
+class TestMigrate:
+    def test_is_idempotent(self, tmp_path) -> None:
+        """Tests that migrations are only applied once."""
+        path = copy_database(tmp_path)
+
+        assert migrate(path) == SCHEMA_VERSION
+        assert migrate(path) == 0
+        with sqlite3.connect(path) as con:
+            (version,) = con.execute("PRAGMA user_version").fetchone()
+        assert version == SCHEMA_VERSION
+
+    def test_builds_indexes(self, tmp_path) -> None:
+        """Tests that the secondary indexes exist after migrating."""
+        path = copy_database(tmp_path)
+        migrate(path)
+
+        with sqlite3.connect(path) as con:
+            indexes = {
+                row[0]
+                for row in con.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        assert {
+            "idx_influencers_nb_twitter_followers",
+            "idx_influencers_type",
+            "idx_influencers_gender",
+        } <= indexes
+
+    def test_indexes_existing_rows(self, tmp_path) -> None:
+        """Tests that rows present before the migration are searchable."""
+        path = copy_database(tmp_path)
+        migrate(path)
+
+        assert 1 in fts_match(path, "fridman")
+
+    def test_triggers_keep_index_in_sync(self, tmp_path) -> None:
+        """Tests that inserts, updates and deletes are reflected in the index."""
+        path = copy_database(tmp_path)
+        migrate(path)
+
+        with sqlite3.connect(path) as con:
+            con.execute(
+                f"INSERT INTO {influences_table_name} (rank, name, bio) "
+                "VALUES (1000, 'Ada Lovelace', 'Analytical engines')"
+            )
+        assert fts_match(path, "lovelace") == [1000]
+
+        with sqlite3.connect(path) as con:
+            con.execute(
+                f"UPDATE {influences_table_name} SET bio = 'Poetical science' "
+                "WHERE rank = 1000"
+            )
+        assert fts_match(path, "analytical") == []
+        assert fts_match(path, "poetical") == [1000]
+
+        with sqlite3.connect(path) as con:
+            con.execute(f"DELETE FROM {influences_table_name} WHERE rank = 1000")
+        assert fts_match(path, "lovelace") == []
+
+
+class TestCheckMigrated:
+    def test_outdated_schema(self, tmp_path) -> None:
+        """Tests that the shipped database is reported, and left unchanged."""
+        path = copy_database(tmp_path)
+
+        with pytest.raises(SchemaOutdated, match="technology_scout.tools.migrations"):
+            check_migrated(path)
+        with sqlite3.connect(path) as con:
+            (version,) = con.execute("PRAGMA user_version").fetchone()
+        assert version == 0
+
+    def test_migrated_schema(self, tmp_path) -> None:
+        """Tests that a migrated database passes the check."""
+        path = copy_database(tmp_path)
+        migrate(path)
+
+        check_migrated(path)
+
+
+def main() -> None:
+    """Main function."""
+
+    test_migrate = TestMigrate()
+    test_migrate.test_is_idempotent(Path(tempfile.mkdtemp()))
+    test_migrate.test_triggers_keep_index_in_sync(Path(tempfile.mkdtemp()))
+
+
+if __name__ == "__main__":
+    main()
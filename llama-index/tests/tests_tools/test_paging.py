@@ -0,0 +1,150 @@
+"""Tests for the paged output mode of select_from_db."""
+
+import re
+import sqlite3
+
+import pytest
+from technology_scout.tools.paging import CursorRegistry, render_page
+from technology_scout.tools.select_from_db import (
+    fetch_next_page,
+    influences_table_name,
+    select_from_db_paged,
+)
+
+
+def make_registry(n_rows: int, text: str = "x") -> CursorRegistry:
+    """Returns a registry over an in-memory table of `n_rows` rows."""
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.execute("CREATE TABLE t (id INTEGER, text TEXT)")
+    connection.executemany(
+        "INSERT INTO t VALUES (?, ?)", [(i, text) for i in range(n_rows)]
+    )
+    return CursorRegistry(connection)
+
+
+class TestCursorRegistry:
+    def test_pages_until_exhausted(self) -> None:
+        """Tests that pages cover every row exactly once."""
+        registry = make_registry(25)
+        token = registry.open("SELECT id FROM t ORDER BY id")
+
+        seen = []
+        while token is not None:
+            page = registry.next_page(token, page_size=10, token_budget=1000)
+            seen.extend(row[0] for row in page.rows)
+            token = page.continuation_token
+
+        assert seen == list(range(25))
+
+    def test_last_full_page_has_no_token(self) -> None:
+        """Tests that a page ending exactly on the last row closes the cursor."""
+        registry = make_registry(10)
+        token = registry.open("SELECT id FROM t")
+
+        page = registry.next_page(token, page_size=10, token_budget=1000)
+        assert len(page.rows) == 10
+        assert page.continuation_token is None
+
+    def test_token_budget_limits_rows(self) -> None:
+        """Tests that rows beyond the token budget are kept for the next page."""
+        registry = make_registry(10, text="a" * 500)
+        token = registry.open("SELECT text FROM t")
+
+        page = registry.next_page(token, page_size=10, token_budget=20)
+        assert 0 < len(page.rows) < 10
+        assert page.max_chars_per_column < 500
+        assert page.continuation_token == token
+
+    def test_rows_are_fetched_lazily(self) -> None:
+        """Tests that only the rows of the page (plus one) are read."""
+        registry = make_registry(100)
+        token = registry.open("SELECT id FROM t")
+
+        registry.next_page(token, page_size=5, token_budget=1000)
+        assert len(registry._cursors[token].pending) == 1
+
+    def test_writers_are_not_blocked_between_pages(self, tmp_path) -> None:
+        """Tests that a cursor holds no lock on the database between two pages."""
+        path = tmp_path / "paging.db"
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE t (id INTEGER)")
+            connection.executemany(
+                "INSERT INTO t VALUES (?)", [(i,) for i in range(20)]
+            )
+        connection.close()
+        registry = CursorRegistry(sqlite3.connect(path, check_same_thread=False))
+        token = registry.open("SELECT id FROM t ORDER BY id")
+        page = registry.next_page(token, page_size=5, token_budget=1000)
+
+        # Fails at once if a reader holds its lock
+        with sqlite3.connect(path, timeout=0) as writer:
+            writer.execute("DELETE FROM t WHERE id < 5")
+        writer.close()
+
+        assert page.rows == [(i,) for i in range(5)]
+        page = registry.next_page(token, page_size=5, token_budget=1000)
+        assert page.first_row == 5
+        assert page.continuation_token == token
+
+    def test_pragmas_are_paged(self) -> None:
+        """Tests that the pragmas, which cannot be run as a subquery, are paged."""
+        registry = make_registry(1)
+        token = registry.open("PRAGMA table_info(t)")
+
+        page = registry.next_page(token, page_size=1, token_budget=1000)
+        assert page.rows[0][1] == "id"
+        page = registry.next_page(
+            page.continuation_token, page_size=1, token_budget=1000
+        )
+        assert page.rows[0][1] == "text"
+        assert page.continuation_token is None
+
+    def test_unknown_token(self) -> None:
+        """Tests that an unknown token raises an error."""
+        registry = make_registry(1)
+        with pytest.raises(KeyError):
+            registry.next_page("unknown", page_size=10, token_budget=1000)
+
+
+class TestRenderPage:
+    def test_long_values_are_truncated(self) -> None:
+        """Tests that values longer than the column budget are truncated."""
+        registry = make_registry(1, text="a" * 100)
+        token = registry.open("SELECT text FROM t")
+        page = registry.next_page(token, page_size=1, token_budget=4)
+
+        rendered = render_page(page)
+        assert "a" * 100 not in rendered
+        assert "…" in rendered
+        assert "end of results" in rendered
+
+
+class TestSelectFromDbPaged:
+    def test_fetches_all_pages(self) -> None:
+        """Tests that the tools page through the whole table."""
+        result = select_from_db_paged(
+            f"SELECT name FROM {influences_table_name}", page_size=50
+        )
+        names = result.splitlines()[1:-1]
+
+        token = re.search(r'continuation_token="([^"]+)"', result).group(1)
+        result = fetch_next_page(token, page_size=50)
+        names += result.splitlines()[1:-1]
+
+        assert "end of results" in result
+        assert len(names) == len(set(names)) > 50
+
+
+def main() -> None:
+    """Main function."""
+
+    test_cursor_registry = TestCursorRegistry()
+    test_cursor_registry.test_pages_until_exhausted()
+    test_cursor_registry.test_token_budget_limits_rows()
+
+    test_select_from_db_paged = TestSelectFromDbPaged()
+    test_select_from_db_paged.test_fetches_all_pages()
+
+
+if __name__ == "__main__":
+    main()
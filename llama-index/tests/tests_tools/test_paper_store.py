@@ -0,0 +1,254 @@
+"""Tests for the local store of the papers and the tools reading it."""
+
+import json
+import re
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from technology_scout.tools import query_papers_with_code
+from technology_scout.tools.async_http_client import AsyncHttpClient
+from technology_scout.tools.http_client import HttpClient
+from technology_scout.tools.paper_store import PaperStore
+
+
+def make_paper(index: int, title: str | None = None, abstract: str = "") -> dict:
+    """Returns a paper of the fake author."""
+    return {
+        "id": f"paper-{index}",
+        "title": title or f"Paper {index}",
+        "abstract": abstract,
+        "authors": ["Yann LeCun"],
+        "published": (date(2020, 1, 1) + timedelta(days=index)).isoformat(),
+    }
+
+
+class PapersServer(ThreadingHTTPServer):
+    """Serves the papers of one author, by id and by search."""
+
+    daemon_threads = True
+
+    def __init__(self, papers: list[dict]) -> None:
+        super().__init__(("127.0.0.1", 0), PapersHandler)
+        self.papers = papers
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self) -> "PapersServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class PapersHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: PapersServer
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        papers = self.server.papers
+
+        if match := re.fullmatch(r"/api/v1/papers/([^/]+)", url.path):
+            found = [paper for paper in papers if paper["id"] == match.group(1)]
+            self._send(200 if found else 404, found[0] if found else {})
+            return
+
+        if url.path == "/api/v1/papers":
+            query = params["q"].lower()
+            papers = [paper for paper in papers if query in paper["title"].lower()]
+        page = int(params.get("page", 1))
+        items_per_page = int(params.get("items_per_page", 50))
+        start = (page - 1) * items_per_page
+        self._send(
+            200,
+            {
+                "count": len(papers),
+                "next": None,
+                "previous": None,
+                "results": papers[start : start + items_per_page],
+            },
+        )
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> PaperStore:
+    """An empty store."""
+    return PaperStore(tmp_path / "papers.db")
+
+
+@pytest.fixture
+def serve_papers(monkeypatch, store: PaperStore):
+    """Returns a function serving papers to the tools, which use `store`."""
+    servers = []
+
+    def serve(papers: list[dict]) -> PapersServer:
+        server = PapersServer(papers).__enter__()
+        servers.append(server)
+        monkeypatch.setattr(query_papers_with_code, "paper_store", store)
+        monkeypatch.setattr(
+            query_papers_with_code, "client", HttpClient(server.base_url)
+        )
+        monkeypatch.setattr(
+            query_papers_with_code, "async_client", AsyncHttpClient(server.base_url)
+        )
+        return server
+
+    yield serve
+    for server in servers:
+        server.__exit__()
+
+
+class TestPaperStore:
+    def test_get_paper(self, store: PaperStore) -> None:
+        """Tests that a stored paper is found by id."""
+        store.put_papers([make_paper(1), make_paper(2)])
+
+        assert store.get_paper("paper-2") == make_paper(2)
+        assert store.get_paper("paper-3") is None
+        assert store.stats.hits == 1
+        assert store.stats.misses == 1
+
+    def test_search(self, store: PaperStore) -> None:
+        """Tests that matches in the title rank before matches in the abstract."""
+        store.put_papers(
+            [
+                make_paper(1, "Learning to plan", abstract="With world models"),
+                make_paper(2, "World models", abstract="Learning to plan"),
+                make_paper(3, "Video prediction"),
+            ]
+        )
+
+        assert [paper["id"] for paper in store.search("world models")] == [
+            "paper-2",
+            "paper-1",
+        ]
+        assert [paper["id"] for paper in store.search("pla")] == [
+            "paper-1",
+            "paper-2",
+        ]
+        assert store.search("robotics") == []
+
+    def test_updates_are_indexed(self, store: PaperStore) -> None:
+        """Tests that the full-text index follows the updated titles."""
+        store.put_papers([make_paper(1, "Old title")])
+        store.put_papers([make_paper(1, "New title")])
+
+        assert store.search("old") == []
+        assert store.search("new")[0]["title"] == "New title"
+        assert store.size() == (1, 0)
+
+    def test_papers_by_author(self, store: PaperStore) -> None:
+        """Tests that the papers of an author are answered once all are stored."""
+        store.put_papers([make_paper(1)], author_id="yann-lecun")
+        assert store.papers_by_author("yann-lecun") is None
+
+        store.put_papers(
+            [make_paper(index) for index in range(5)],
+            author_id="yann-lecun",
+            complete=True,
+        )
+        papers = store.papers_by_author("yann-lecun", since="2020-01-03")
+        assert [paper["id"] for paper in papers] == ["paper-4", "paper-3", "paper-2"]
+
+    def test_author_ttl(self, tmp_path: Path) -> None:
+        """Tests that the papers of an author expire."""
+        store = PaperStore(tmp_path / "papers.db", author_ttl=0)
+        store.put_papers([make_paper(1)], author_id="yann-lecun", complete=True)
+        assert store.papers_by_author("yann-lecun") is None
+
+    def test_import_file(self, store: PaperStore, tmp_path: Path) -> None:
+        """Tests importing pages of the API and papers per line."""
+        page = tmp_path / "page.json"
+        page.write_text(json.dumps({"count": 2, "results": [make_paper(1)]}))
+        lines = tmp_path / "papers.jsonl"
+        lines.write_text("\n".join(json.dumps(make_paper(i)) for i in range(2, 5)))
+
+        assert store.import_file(page, author_id="yann-lecun") == 1
+        assert store.import_file(lines) == 3
+        assert store.size() == (4, 1)
+        assert len(store.papers_by_author("yann-lecun")) == 1
+
+
+class TestTools:
+    def test_get_paper_from_the_store(self, serve_papers, store) -> None:
+        """Tests that a stored paper is returned without a request."""
+        server = serve_papers([])
+        store.put_papers([make_paper(1)])
+
+        assert query_papers_with_code.get_paper("paper-1").title == "Paper 1"
+        assert server.requests == 0
+
+    def test_get_paper_falls_back_to_the_api(self, serve_papers, store) -> None:
+        """Tests that a missing paper is fetched once, then stored."""
+        server = serve_papers([make_paper(1)])
+
+        assert query_papers_with_code.get_paper("paper-1").title == "Paper 1"
+        assert query_papers_with_code.get_paper("paper-1").title == "Paper 1"
+        assert query_papers_with_code.get_paper("paper-2") is None
+        assert server.requests == 2
+
+    def test_search_papers(self, serve_papers, store) -> None:
+        """Tests that the API is searched when no stored paper matches."""
+        server = serve_papers([make_paper(1, "World models"), make_paper(2)])
+        store.put_papers([make_paper(3, "Video prediction")])
+
+        assert query_papers_with_code.search_papers("video")[0].id == "paper-3"
+        assert server.requests == 0
+        assert query_papers_with_code.search_papers("world")[0].id == "paper-1"
+        assert server.requests == 1
+        assert store.get_paper("paper-1") is not None
+
+    def test_author_papers_are_written_through(self, serve_papers, store) -> None:
+        """Tests that get_author_papers stores the papers it returns."""
+        serve_papers([make_paper(index) for index in range(10)])
+        query_papers_with_code.get_author_papers("yann-lecun")
+
+        assert store.size() == (5, 0)
+
+    def test_papers_by_author(self, serve_papers, store) -> None:
+        """Tests that the papers of an author are fetched once, then stored."""
+        server = serve_papers([make_paper(index) for index in range(60)])
+
+        papers = query_papers_with_code.papers_by_author("yann-lecun")
+        requests = server.requests
+        recent = query_papers_with_code.papers_by_author(
+            "yann-lecun", since="2020-02-27"
+        )
+
+        assert len(papers) == 60
+        assert requests == 2
+        assert server.requests == requests
+        assert [paper.id for paper in recent] == ["paper-59", "paper-58", "paper-57"]
+
+
+def main() -> None:
+    """Main function."""
+
+    test_paper_store = TestPaperStore()
+    test_paper_store.test_search(PaperStore(":memory:"))
+
+
+if __name__ == "__main__":
+    main()
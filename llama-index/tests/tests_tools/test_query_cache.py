@@ -0,0 +1,161 @@
+"""Tests for the query result cache."""
+
+import sqlite3
+
+import pytest
+
+from technology_scout.tools.database import ConnectionManager
+from technology_scout.tools.query_cache import (
+    QueryResultCache,
+    is_cacheable,
+    normalize_sql,
+)
+from technology_scout.tools.select_from_db import (
+    influences_table_name,
+    query_cache,
+    select_from_db,
+)
+
+
+class TestNormalizeSql:
+    def test_whitespace_and_case(self) -> None:
+        """Tests that whitespace and keyword case do not change the key."""
+        assert normalize_sql(
+            "SELECT name,  rank\nFROM influencers\n LIMIT 10;"
+        ) == normalize_sql("select name, rank from INFLUENCERS limit 10")
+
+    def test_comments_are_dropped(self) -> None:
+        """Tests that comments do not change the key."""
+        assert normalize_sql(
+            "SELECT name -- the name\nFROM influencers /* all */"
+        ) == normalize_sql("SELECT name FROM influencers")
+
+    def test_literals_are_kept_verbatim(self) -> None:
+        """Tests that string literals keep their case and whitespace."""
+        assert normalize_sql(
+            "SELECT * FROM influencers WHERE name = 'Lex  Fridman'"
+        ) != normalize_sql("SELECT * FROM influencers WHERE name = 'lex fridman'")
+        assert "'Lex  Fridman'" in normalize_sql(
+            "SELECT * FROM influencers WHERE name='Lex  Fridman'"
+        )
+
+
+class TestQueryResultCache:
+    def test_hits_and_misses(self) -> None:
+        """Tests that equivalent queries are served from the cache."""
+        cache = QueryResultCache()
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            return 42
+
+        assert cache.get_or_compute("SELECT 1", 0, compute) == 42
+        assert cache.get_or_compute("select   1;", 0, compute) == 42
+        assert len(calls) == 1
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_lru_eviction(self) -> None:
+        """Tests that the least recently used entry is evicted first."""
+        cache = QueryResultCache(maxsize=2)
+        cache.get_or_compute("SELECT 1", 0, lambda: 1)
+        cache.get_or_compute("SELECT 2", 0, lambda: 2)
+        cache.get_or_compute("SELECT 1", 0, lambda: 1)
+        cache.get_or_compute("SELECT 3", 0, lambda: 3)
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert cache.get_or_compute("SELECT 1", 0, lambda: -1) == 1
+        assert cache.get_or_compute("SELECT 2", 0, lambda: -2) == -2
+
+    def test_version_change_invalidates(self) -> None:
+        """Tests that a new database version drops the cached results."""
+        cache = QueryResultCache()
+        cache.get_or_compute("SELECT 1", 0, lambda: 1)
+
+        assert cache.get_or_compute("SELECT 1", 1, lambda: 2) == 2
+        assert cache.stats.invalidations == 1
+
+    def test_non_deterministic_queries_are_not_cached(self) -> None:
+        """Tests that queries using random() are always executed."""
+        cache = QueryResultCache()
+        cache.get_or_compute("SELECT random()", 0, lambda: 1)
+
+        assert cache.get_or_compute("SELECT random()", 0, lambda: 2) == 2
+        assert len(cache) == 0
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "SELECT CURRENT_TIMESTAMP",
+            "SELECT current_date",
+            "SELECT * FROM t WHERE created < CURRENT_TIME",
+            "SELECT date('now')",
+            "SELECT datetime()",
+        ],
+    )
+    def test_clock_queries_are_not_cached(self, query: str) -> None:
+        """Tests that queries reading the clock are always executed."""
+        assert not is_cacheable(normalize_sql(query))
+
+    def test_clock_lookalikes_are_cached(self) -> None:
+        """Tests that columns and dates named like the clock keywords are cached."""
+        assert is_cacheable(normalize_sql("SELECT current_rank, date('2024-01-01')"))
+
+
+class TestDataVersion:
+    def test_changes_on_write(self, tmp_path) -> None:
+        """Tests that a commit from another connection changes the version."""
+        path = tmp_path / "test.db"
+        with sqlite3.connect(path) as con:
+            con.execute("CREATE TABLE t (x INTEGER)")
+
+        manager = ConnectionManager(path)
+        try:
+            version = manager.data_version()
+            assert manager.data_version() == version
+
+            with sqlite3.connect(path) as con:
+                con.execute("INSERT INTO t VALUES (1)")
+
+            assert manager.data_version() != version
+        finally:
+            manager.close()
+
+
+class TestSelectFromDbCache:
+    def test_equivalent_queries_hit_the_cache(self) -> None:
+        """Tests that select_from_db reuses results of equivalent queries."""
+        query_cache.clear()
+        hits = query_cache.stats.hits
+
+        first = select_from_db(f"SELECT name FROM {influences_table_name} LIMIT 3")
+        second = select_from_db(f"select name\nfrom {influences_table_name} limit 3;")
+
+        assert query_cache.stats.hits == hits + 1
+        assert first.equals(second)
+
+    def test_result_is_not_shared(self) -> None:
+        """Tests that mutating a result does not alter the cached one."""
+        query = f"SELECT name FROM {influences_table_name} LIMIT 3"
+        first = select_from_db(query)
+        first["name"] = None
+
+        assert select_from_db(query)["name"].notna().all()
+
+
+def main() -> None:
+    """Main function."""
+
+    test_normalize_sql = TestNormalizeSql()
+    test_normalize_sql.test_whitespace_and_case()
+    test_normalize_sql.test_comments_are_dropped()
+    test_normalize_sql.test_literals_are_kept_verbatim()
+
+    test_select_from_db_cache = TestSelectFromDbCache()
+    test_select_from_db_cache.test_equivalent_queries_hit_the_cache()
+    test_select_from_db_cache.test_result_is_not_shared()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Tests for the rate limiting of the requests sent to the APIs."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from technology_scout.tools.async_http_client import AsyncHttpClient
+from technology_scout.tools.http_client import HttpClient
+from technology_scout.tools.rate_limiter import (
+    Priority,
+    RateLimit,
+    RateLimiter,
+    batch,
+    parse_limits,
+    request_priority,
+)
+
+URL = "http://127.0.0.1/api/v1/authors"
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+    """Answers its first request with a 429 and `Retry-After: 1`."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), ThrottlingHandler)
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self) -> "ThrottlingServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: ThrottlingServer
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        throttled = self.server.requests == 1
+        payload = json.dumps({"results": []}).encode()
+        self.send_response(429 if throttled else 200)
+        if throttled:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def acquire_in_order(limiter: RateLimiter, priorities: list[Priority]) -> list[int]:
+    """Queues one request per priority, in order, and returns the served order."""
+    served, threads = [], []
+
+    def acquire(index: int, priority: Priority) -> None:
+        request_priority.set(priority)
+        limiter.acquire(URL)
+        served.append(index)
+
+    for index, priority in enumerate(priorities):
+        thread = threading.Thread(target=acquire, args=(index, priority))
+        thread.start()
+        threads.append(thread)
+        # Each request is queued before the next one.
+        while limiter.queue_depth < index + 1:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+    return served
+
+
+class TestParseLimits:
+    def test_parse_limits(self) -> None:
+        """Tests parsing the budgets of the hosts."""
+        assert parse_limits("paperswithcode.com=5/10, *=20") == {
+            "paperswithcode.com": RateLimit(5.0, 10),
+            "*": RateLimit(20.0, 1),
+        }
+        assert parse_limits("") == {}
+        with pytest.raises(ValueError):
+            parse_limits("paperswithcode.com")
+
+
+class TestRateLimiter:
+    def test_burst_then_rate(self) -> None:
+        """Tests that the burst is sent at once, then the requests are spaced."""
+        limiter = RateLimiter({"127.0.0.1": RateLimit(rate=20, burst=5)})
+
+        start = time.monotonic()
+        waits = [limiter.acquire(URL) for _ in range(15)]
+        duration = time.monotonic() - start
+
+        assert max(waits[:5]) < 0.01
+        assert 0.45 <= duration < 0.7
+        stats = limiter.stats[Priority.INTERACTIVE]
+        assert stats.acquired == 15
+        assert stats.waited == 10
+
+    def test_hosts_without_budget(self) -> None:
+        """Tests that only the hosts with a budget, or `*`, are limited."""
+        limiter = RateLimiter({"paperswithcode.com": RateLimit(rate=1)})
+        assert [limiter.acquire(URL) for _ in range(5)] == [0.0] * 5
+
+        limiter = RateLimiter({"*": RateLimit(rate=1)})
+        assert limiter.limit("127.0.0.1") == RateLimit(rate=1)
+
+    def test_interactive_requests_go_first(self) -> None:
+        """Tests that a waiting interactive request is served before the batch ones."""
+        limiter = RateLimiter({"127.0.0.1": RateLimit(rate=20, burst=1)})
+        limiter.acquire(URL)
+
+        served = acquire_in_order(
+            limiter, [Priority.BATCH] * 4 + [Priority.INTERACTIVE]
+        )
+
+        # The first batch request may have taken the next token already.
+        assert served.index(4) <= 1
+        assert limiter.stats[Priority.BATCH].max_queue_depth == 4
+
+    def test_tasks_follow_their_priority(self) -> None:
+        """Tests that the priority of a batch block follows its tasks."""
+        limiter = RateLimiter({"127.0.0.1": RateLimit(rate=20, burst=1)})
+        served = []
+
+        async def acquire(name: str) -> None:
+            await limiter.aacquire(URL)
+            served.append(name)
+
+        async def crawl() -> None:
+            with batch():
+                await asyncio.gather(*(acquire(f"batch {i}") for i in range(3)))
+
+        async def run_all() -> None:
+            await limiter.aacquire(URL)
+            crawling = asyncio.create_task(crawl())
+            await asyncio.sleep(0.01)
+            await asyncio.gather(crawling, acquire("interactive"))
+
+        asyncio.run(run_all())
+        assert served[0] == "interactive"
+
+    def test_cancelled_requests_leave_the_queue(self) -> None:
+        """Tests that a cancelled request neither stays queued nor is counted."""
+        limiter = RateLimiter({"127.0.0.1": RateLimit(rate=1, burst=1)})
+
+        async def run() -> None:
+            await limiter.aacquire(URL)
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(limiter.aacquire(URL), 0.05)
+
+        asyncio.run(run())
+        assert limiter.queue_depth == 0
+        assert limiter.stats[Priority.INTERACTIVE].acquired == 1
+
+    def test_pause(self) -> None:
+        """Tests that no request is sent to a paused host."""
+        limiter = RateLimiter({"127.0.0.1": RateLimit(rate=100, burst=10)})
+        limiter.pause(URL, 0.2)
+
+        assert limiter.acquire(URL) >= 0.19
+
+    def test_shared_file(self, tmp_path: Path) -> None:
+        """Tests that the limiters using the same file share the budget."""
+        limits = {"127.0.0.1": RateLimit(rate=10, burst=3)}
+        first = RateLimiter(limits, path=tmp_path / "rate_limits.db")
+        second = RateLimiter(limits, path=tmp_path / "rate_limits.db")
+
+        for _ in range(3):
+            first.acquire(URL)
+
+        assert second.acquire(URL) >= 0.05
+        first.close()
+        second.close()
+
+    def test_shared_file_does_not_block_event_loop(self, tmp_path: Path) -> None:
+        """Tests that the tasks keep running while another process locks the file."""
+        path = tmp_path / "rate_limits.db"
+        limiter = RateLimiter({"127.0.0.1": RateLimit(rate=10, burst=3)}, path=path)
+        limiter.acquire(URL)
+        other_process = sqlite3.connect(path, isolation_level=None)
+        other_process.execute("BEGIN IMMEDIATE")
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def run() -> None:
+            ticker = asyncio.create_task(tick())
+            asyncio.get_running_loop().call_later(0.2, other_process.rollback)
+            await limiter.aacquire(URL)
+            await limiter.apause(URL, 0.2)
+            ticker.cancel()
+
+        asyncio.run(run())
+        assert ticks >= 10
+        assert limiter.acquire(URL) >= 0.15
+        other_process.close()
+        limiter.close()
+
+
+class TestClients:
+    def test_retry_after_pauses_the_host(self) -> None:
+        """Tests that a 429 `Retry-After` delays the other requests to the host."""
+        limiter = RateLimiter({"127.0.0.1": RateLimit(rate=100, burst=10)})
+        with ThrottlingServer() as server:
+            client = HttpClient(server.base_url, rate_limiter=limiter)
+            thread = threading.Thread(target=client.get_json, args=("/authors",))
+            thread.start()
+            while server.requests == 0:
+                time.sleep(0.001)
+            time.sleep(0.05)
+
+            assert limiter.acquire(server.base_url) >= 0.8
+            thread.join()
+        assert server.requests == 2
+
+    def test_async_client_waits_in_the_callers_lane(self) -> None:
+        """Tests that the coroutines run from sync code keep the caller's priority."""
+        with ThrottlingServer() as server:
+            client = AsyncHttpClient(server.base_url)
+
+            async def priority() -> Priority:
+                return request_priority.get()
+
+            with batch():
+                assert client.run(priority()) == Priority.BATCH
+            assert client.run(priority()) == Priority.INTERACTIVE
+
+
+def main() -> None:
+    """Main function."""
+
+    test_rate_limiter = TestRateLimiter()
+    test_rate_limiter.test_burst_then_rate()
+
+
+if __name__ == "__main__":
+    main()
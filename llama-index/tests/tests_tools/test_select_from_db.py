@@ -2,6 +2,7 @@ import asyncio
 import pytest
 from technology_scout.agent import create_agent
 from technology_scout.tools.select_from_db import (
+    aselect_from_db,
     select_from_db,
     select_from_db_tool,
     influences_table_name,
@@ -25,6 +26,22 @@ class TestSelectFromDb:
         assert result.shape == (10, 3), f"Result: {result}"
 
 
+class TestASelectFromDb:
+    query = f"SELECT name FROM {influences_table_name} ORDER BY rank LIMIT 5"
+
+    @pytest.mark.asyncio
+    async def test_matches_select_from_db(self) -> None:
+        """Tests that the async variant returns the same data as select_from_db."""
+        result = await aselect_from_db(self.query)
+        assert result.equals(select_from_db(self.query))
+
+    @pytest.mark.asyncio
+    async def test_async_tool(self) -> None:
+        """Tests that the tool can be awaited."""
+        result = await select_from_db_tool.acall(query=self.query)
+        assert result.content.splitlines()[:2] == ["name", "Lex Fridman"]
+
+
 class TestSelectFromDbToolUsageByAgent:
     @pytest.mark.asyncio
     async def test_on_simple_task(self) -> None:
@@ -44,6 +61,9 @@ async def main() -> None:
     test_select_from_db = TestSelectFromDb()
     test_select_from_db.test_on_simple_query()
 
+    test_aselect_from_db = TestASelectFromDb()
+    await test_aselect_from_db.test_matches_select_from_db()
+
     test_select_from_db_tool_usage_by_agent = TestSelectFromDbToolUsageByAgent()
     await test_select_from_db_tool_usage_by_agent.test_on_simple_task()
 
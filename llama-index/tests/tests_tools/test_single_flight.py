@@ -0,0 +1,281 @@
+"""Tests for the single-flight collapsing of concurrent identical calls."""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from technology_scout.tools import select_from_db as select_from_db_module
+from technology_scout.tools.async_http_client import AsyncHttpClient
+from technology_scout.tools.http_client import HttpClient
+from technology_scout.tools.single_flight import SingleFlight
+
+
+class SlowServer(ThreadingHTTPServer):
+    """Answers every request with its path, after `delay` seconds."""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.1) -> None:
+        super().__init__(("127.0.0.1", 0), SlowHandler)
+        self.delay = delay
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self) -> "SlowServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: SlowServer
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        payload = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def slow_call(calls: list[int], result: object = "result", delay: float = 0.1):
+    """Returns a call that records itself, then sleeps and returns `result`."""
+
+    def call() -> object:
+        calls.append(1)
+        time.sleep(delay)
+        return result
+
+    return call
+
+
+class TestThreads:
+    def test_concurrent_calls_are_collapsed(self) -> None:
+        """Tests that concurrent calls with the same key run once."""
+        flight, calls = SingleFlight(), []
+        with ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(
+                    lambda _: flight.do("key", slow_call(calls)),
+                    range(8),
+                )
+            )
+
+        assert results == ["result"] * 8
+        assert len(calls) == 1
+        assert flight.stats.executed == 1
+        assert flight.stats.collapsed == 7
+        assert flight.in_flight == 0
+
+    def test_keys_are_not_mixed(self) -> None:
+        """Tests that calls with different keys all run."""
+        flight, calls = SingleFlight(), []
+        with ThreadPoolExecutor(4) as executor:
+            results = list(
+                executor.map(
+                    lambda key: flight.do(key, slow_call(calls, key)), range(4)
+                )
+            )
+
+        assert results == [0, 1, 2, 3]
+        assert flight.stats.collapsed == 0
+
+    def test_errors_are_shared_not_kept(self) -> None:
+        """Tests that the waiting callers get the error, and the next call runs."""
+        flight = SingleFlight()
+
+        def fail() -> None:
+            time.sleep(0.1)
+            raise ValueError("no such author")
+
+        with ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(flight.do, "key", fail) for _ in range(4)]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+        assert flight.do("key", lambda: "retried") == "retried"
+        assert flight.stats.executed == 2
+
+
+class TestAsyncio:
+    def test_concurrent_tasks_are_collapsed(self) -> None:
+        """Tests that concurrent tasks with the same key run the call once."""
+        flight, calls = SingleFlight(), []
+
+        async def call() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def run_all() -> list[str]:
+            return await asyncio.gather(*(flight.ado("key", call) for _ in range(10)))
+
+        assert asyncio.run(run_all()) == ["result"] * 10
+        assert len(calls) == 1
+        assert flight.stats.collapsed == 9
+
+    def test_tasks_wait_for_threads(self) -> None:
+        """Tests that a task shares the call run by a thread."""
+        flight, calls = SingleFlight(), []
+        thread = threading.Thread(target=flight.do, args=("key", slow_call(calls)))
+        thread.start()
+        time.sleep(0.02)
+
+        async def call() -> str:
+            calls.append(1)
+            return "task result"
+
+        assert asyncio.run(flight.ado("key", call)) == "result"
+        thread.join()
+        assert len(calls) == 1
+
+    def test_cancelled_caller_is_replaced(self) -> None:
+        """Tests that the waiting tasks run the call again if its caller is cancelled."""
+        flight, calls = SingleFlight(), []
+
+        async def call() -> int:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def run_all() -> int:
+            first = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0.01)
+            second = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run_all()) == 2
+
+    def test_cancelled_waiter_does_not_cancel_the_call(self) -> None:
+        """Tests that cancelling a waiting task leaves the call running."""
+        flight = SingleFlight()
+
+        async def call() -> str:
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def run_all() -> str:
+            first = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0.01)
+            second = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0.01)
+            second.cancel()
+            return await first
+
+        assert asyncio.run(run_all()) == "result"
+
+
+class TestHttpClients:
+    def test_sync_and_async_requests_are_collapsed(self) -> None:
+        """Tests that concurrent identical requests are sent once."""
+        flight = SingleFlight()
+        with SlowServer() as server:
+            client = HttpClient(server.base_url, single_flight=flight)
+            async_client = AsyncHttpClient(server.base_url, single_flight=flight)
+
+            with ThreadPoolExecutor(5) as executor:
+                futures = [
+                    executor.submit(client.get_json, "/authors", {"q": "LeCun"})
+                    for _ in range(4)
+                ]
+                futures.append(
+                    executor.submit(
+                        async_client.run,
+                        async_client.get_json("/authors", {"q": "LeCun"}),
+                    )
+                )
+                results = [future.result() for future in futures]
+
+        assert results == [{"path": "/api/v1/authors?q=LeCun"}] * 5
+        assert server.requests == 1
+        assert flight.stats.collapsed == 4
+
+
+class TestSelectFromDb:
+    @pytest.fixture
+    def executions(self, monkeypatch) -> list[str]:
+        """Records the queries run, slowed down so that they overlap."""
+        executions = []
+        run_query = select_from_db_module._run_query
+
+        def slow_run_query(query: str):
+            executions.append(query)
+            time.sleep(0.1)
+            return run_query(query)
+
+        monkeypatch.setattr(select_from_db_module, "_run_query", slow_run_query)
+        monkeypatch.setattr(select_from_db_module, "query_flight", SingleFlight())
+        return executions
+
+    def test_identical_queries_are_collapsed(self, executions: list[str]) -> None:
+        """Tests that equivalent concurrent queries run once."""
+        queries = [
+            "SELECT name FROM influencers LIMIT 3",
+            "select name from influencers limit 3;",
+        ] * 3
+        with ThreadPoolExecutor(6) as executor:
+            dfs = list(executor.map(select_from_db_module.select_from_db, queries))
+
+        assert len(executions) == 1
+        assert all(len(df) == 3 for df in dfs)
+        # Every caller gets its own copy.
+        assert len({id(df) for df in dfs}) == 6
+
+    def test_async_queries_are_collapsed(self, executions: list[str]) -> None:
+        """Tests that the async tool collapses the queries too."""
+
+        async def run_all() -> list:
+            return await asyncio.gather(
+                *(
+                    select_from_db_module.aselect_from_db(
+                        "SELECT name FROM influencers LIMIT 3"
+                    )
+                    for _ in range(5)
+                )
+            )
+
+        assert all(len(df) == 3 for df in asyncio.run(run_all()))
+        assert len(executions) == 1
+
+    def test_non_deterministic_queries_all_run(self, executions: list[str]) -> None:
+        """Tests that queries whose result changes at each run are not shared."""
+        with ThreadPoolExecutor(3) as executor:
+            list(
+                executor.map(
+                    select_from_db_module.select_from_db,
+                    ["SELECT random() AS r"] * 3,
+                )
+            )
+
+        assert len(executions) == 3
+
+
+def main() -> None:
+    """Main function."""
+
+    test_threads = TestThreads()
+    test_threads.test_concurrent_calls_are_collapsed()
+
+
+if __name__ == "__main__":
+    main()
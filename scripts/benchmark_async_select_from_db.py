@@ -0,0 +1,117 @@
+"""Load test of `select_from_db` called from concurrent async agent sessions.
+
+Runs `--sessions` sessions on one event loop, each alternating a simulated LLM
+call with a `select_from_db` tool call, while a heartbeat task measures how
+late the loop wakes it up. Calling the sync tool from the async code, as the
+llama-index workflow did, blocks the loop for the whole query; awaiting the
+async tool keeps it responsive.
+
+Usage:
+    python scripts/benchmark_async_select_from_db.py --framework llama-index --sessions 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmark_utils import percentiles, use_framework
+
+# Uncached (each session and call filters on a different threshold) and a
+# few milliseconds long.
+QUERY = """
+SELECT a.name, COUNT(*) AS nb_similar_bios
+FROM influencers AS a JOIN influencers AS b ON b.bio LIKE '%' || substr(a.bio, 1, 3) || '%'
+WHERE a.nb_twitter_followers >= {threshold}
+GROUP BY a.name
+"""
+HEARTBEAT_INTERVAL = 0.005
+LLM_LATENCY = 0.01
+
+
+def get_tool_callers(framework: str):
+    """Returns the blocking and the async ways of calling the tool."""
+    from technology_scout.tools.select_from_db import select_from_db_tool
+
+    if framework == "langgraph":
+
+        async def blocking(query: str) -> None:
+            select_from_db_tool.invoke({"query": query})
+
+        async def non_blocking(query: str) -> None:
+            await select_from_db_tool.ainvoke({"query": query})
+
+    else:
+
+        async def blocking(query: str) -> None:
+            select_from_db_tool(query=query)
+
+        async def non_blocking(query: str) -> None:
+            await select_from_db_tool.acall(query=query)
+
+    return {"sync tool (before)": blocking, "async tool (after)": non_blocking}
+
+
+async def run_load(call_tool, sessions: int, calls: int, offset: int) -> dict:
+    """Runs the sessions and returns the loop lag and the throughput."""
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            lags.append(time.perf_counter() - start - HEARTBEAT_INTERVAL)
+
+    async def session(index: int) -> None:
+        for call in range(calls):
+            await asyncio.sleep(LLM_LATENCY)
+            threshold = offset + index * calls + call
+            await call_tool(QUERY.format(threshold=threshold))
+
+    monitor = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(session(index) for index in range(sessions)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await monitor
+
+    return {
+        "lags": lags,
+        "elapsed": elapsed,
+        "calls_per_second": sessions * calls / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--framework", choices=["langgraph", "llama-index"], default="llama-index"
+    )
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+
+    print(f"{args.sessions} sessions x {args.calls} tool calls")
+    print(f"{'':<20} {'lag p50':>9} {'lag p99':>9} {'lag max':>9} {'calls/s':>9}")
+    for offset, (name, call_tool) in enumerate(
+        get_tool_callers(args.framework).items()
+    ):
+        result = asyncio.run(
+            run_load(
+                call_tool,
+                args.sessions,
+                args.calls,
+                offset * args.sessions * args.calls,
+            )
+        )
+        lag = percentiles(result["lags"])
+        print(
+            f"{name:<20} {lag['p50'] * 1000:>7.1f}ms {lag['p99'] * 1000:>7.1f}ms "
+            f"{max(result['lags']) * 1000:>7.1f}ms {result['calls_per_second']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmarks fetching all the papers of an author from the local stand-in server.
+
+Fetches the 164 papers of Yann LeCun, `--items-per-page` at a time, page after
+page with the sync `HttpClient`, as an agent calling `get_author_papers` in a
+loop would, then with the concurrent fan-out of `get_all_author_papers` under
+several concurrency limits, and reports the median wall-clock time. It also
+times streaming the papers with `iter_author_papers` until the first, and
+until the last paper, as `find_author_paper` does.
+
+Usage:
+    python scripts/benchmark_author_papers.py --framework langgraph --latency 0.05
+"""
+
+import argparse
+import math
+import statistics
+import time
+
+from benchmark_utils import FRAMEWORKS, use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+PATH = "/authors/yann-lecun/papers"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--items-per-page", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools import query_papers_with_code
+    from technology_scout.tools.async_http_client import AsyncHttpClient
+    from technology_scout.tools.http_client import HttpClient
+    from technology_scout.tools.query_papers_with_code import (
+        ApiResponse,
+        PaperAuthorPaper,
+    )
+
+    with MockPapersWithCode(latency=args.latency) as server:
+        client = HttpClient(server.base_url)
+        query_papers_with_code.async_client = AsyncHttpClient(server.base_url)
+
+        def fetch_sequentially() -> list[PaperAuthorPaper]:
+            papers, page, n_pages = [], 1, 1
+            while page <= n_pages:
+                response = ApiResponse[list[PaperAuthorPaper]].model_validate(
+                    client.get_json(
+                        PATH,
+                        params={"page": page, "items_per_page": args.items_per_page},
+                    )
+                )
+                papers.extend(response.results)
+                n_pages = math.ceil(response.count / args.items_per_page)
+                page += 1
+            return papers
+
+        def fetch_concurrently(max_concurrency: int) -> list[PaperAuthorPaper]:
+            return query_papers_with_code.async_client.run(
+                query_papers_with_code.fetch_all_pages(
+                    PATH,
+                    PaperAuthorPaper,
+                    items_per_page=args.items_per_page,
+                    max_concurrency=max_concurrency,
+                )
+            )
+
+        def stream_until(paper_id: str) -> list[PaperAuthorPaper]:
+            papers = query_papers_with_code.iter_author_papers(
+                "yann-lecun", items_per_page=args.items_per_page
+            )
+            try:
+                return [next(paper for paper in papers if paper.id == paper_id)]
+            finally:
+                papers.close()
+
+        all_papers = fetch_sequentially()
+        n_papers = len(all_papers)
+
+        fetchers = {"sequential pages (before)": (fetch_sequentially, n_papers)}
+        for max_concurrency in args.concurrency:
+            fetchers[f"fan-out, {max_concurrency} at a time"] = (
+                lambda max_concurrency=max_concurrency: fetch_concurrently(
+                    max_concurrency
+                ),
+                n_papers,
+            )
+        for position in ["first", "last"]:
+            paper = all_papers[0 if position == "first" else -1]
+            fetchers[f"stream to the {position} paper"] = (
+                lambda paper=paper: stream_until(paper.id),
+                1,
+            )
+
+        print(
+            f"{n_papers} papers, {math.ceil(n_papers / args.items_per_page)} pages, "
+            f"{args.latency * 1000:.0f}ms server latency"
+        )
+        print(f"{'':<28} {'median':>9} {'speedup':>8}")
+        baseline = None
+        for name, (fetch, expected) in fetchers.items():
+            durations = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                papers = fetch()
+                durations.append(time.perf_counter() - start)
+                assert len(papers) == expected
+            median = statistics.median(durations)
+            baseline = baseline or median
+            print(f"{name:<28} {median * 1000:>7.0f}ms {baseline / median:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmarks the batched author tools on a multi-author question.
+
+Answers "compare the latest papers of N authors" the way the agent has to
+with the single-author tools, a `search_author` then a `get_author_papers`
+call per author, each in its own LLM turn, and with one `search_authors` and
+one `get_papers_for_authors` call. The tools run against the local stand-in
+server, without the HTTP cache and the paper store, and each turn adds the
+`--llm-latency` of a model call. Reports the turns, the tool time, the
+estimated wall-clock time and the tokens of the tool outputs.
+
+Usage:
+    python scripts/benchmark_batched_tools.py --framework langgraph --authors 5
+"""
+
+import argparse
+import time
+
+from benchmark_utils import FRAMEWORKS, get_token_counter, use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--authors", type=int, default=5)
+    parser.add_argument("--latency", default="0.1")
+    parser.add_argument("--llm-latency", type=float, default=1.5)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools.async_http_client import AsyncHttpClient
+    from technology_scout.tools.http_client import HttpClient
+    from technology_scout.tools.serialization import serialize
+
+    count_tokens = get_token_counter()
+    with MockPapersWithCode(latency=args.latency, n_authors=args.authors) as server:
+        papers_module.client = HttpClient(server.base_url)
+        papers_module.async_client = AsyncHttpClient(server.base_url)
+        papers_module.paper_store = None
+        names = [author["full_name"] for author in server.authors.values()]
+        names = names[: args.authors]
+
+        # Starts the background event loop of the async client.
+        papers_module.search_authors(["warm up"])
+
+        def single_author_tools() -> list[str]:
+            outputs = []
+            for name in names:
+                authors = papers_module.search_author(name)
+                papers = papers_module.get_author_papers(authors[0].id)
+                outputs += [serialize(authors), serialize(papers)]
+            return outputs
+
+        def batched_tools() -> list[str]:
+            matches = papers_module.search_authors(names)
+            papers = papers_module.get_papers_for_authors(
+                [match.id for match in matches]
+            )
+            return [serialize(matches), serialize(papers)]
+
+        print(
+            f"Latest papers of {len(names)} authors, {args.latency}s server "
+            f"latency, {args.llm_latency}s per LLM turn"
+        )
+        print(f"{'':<22} {'turns':>5} {'tools':>9} {'wall':>9} {'tokens':>7}")
+        for name, run in [
+            ("single-author tools", single_author_tools),
+            ("batched tools", batched_tools),
+        ]:
+            start = time.perf_counter()
+            outputs = run()
+            tool_time = time.perf_counter() - start
+            # One turn per tool call, and the one writing the answer.
+            turns = len(outputs) + 1
+            wall = tool_time + turns * args.llm_latency
+            tokens = sum(map(count_tokens, outputs))
+            print(
+                f"{name:<22} {turns:>5} {tool_time * 1000:>7.0f}ms "
+                f"{wall:>8.1f}s {tokens:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
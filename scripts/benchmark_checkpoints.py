@@ -0,0 +1,135 @@
+"""Benchmarks the checkpoints of the runs of the llama-index workflow.
+
+Replays a run of `--steps` reasoning steps, each calling a tool whose
+observation is `--observation-chars` long, through a reasoning agent saving
+its checkpoints in a temporary SQLite file, and times after each step:
+
+- saving the checkpoint of the run, i.e. dumping its state and writing it;
+- saving the output of the tool call of the step;
+- resuming the run, i.e. loading its checkpoint and restoring its state.
+
+Reports the p50/p95/p99 of each, over the steps of `--runs` runs, and the
+size of the last checkpoint.
+
+Usage:
+    python scripts/benchmark_checkpoints.py --steps 15 --observation-chars 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_utils import percentiles, use_framework
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--steps", type=int, default=15)
+    parser.add_argument("--observation-chars", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    # The agent is never run against the model.
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+    use_framework("llama-index")
+    from llama_index.core.agent.react.types import (
+        ActionReasoningStep,
+        ObservationReasoningStep,
+    )
+    from llama_index.core.tools import ToolOutput, ToolSelection
+    from llama_index.core.workflow import Context, StartEvent
+    from technology_scout.agent_workflow import (
+        PrepEvent,
+        ReasoningAgent,
+        ToolCallEvent,
+        call_key,
+        dump_tool_output,
+    )
+    from technology_scout.checkpoint_store import CheckpointStore
+
+    async def replay(
+        agent: ReasoningAgent, run_id: str, timings: dict[str, list[float]]
+    ) -> None:
+        ctx = Context(agent)
+        await agent.new_user_msg(
+            ctx, StartEvent(input="Compare the authors.", run_id=run_id)
+        )
+        for index in range(args.steps):
+            action = ActionReasoningStep(
+                thought=f"I need the papers of the author {index}.",
+                action="get_author_papers",
+                action_input={"author_id": f"author-{index}"},
+            )
+            tool_call = ToolSelection(
+                tool_id=f"call_{index}",
+                tool_name=action.action,
+                tool_kwargs=action.action_input,
+            )
+            content = f"{index} " * (args.observation_chars // 2)
+            output = ToolOutput(
+                content=content,
+                tool_name=action.action,
+                raw_input={"kwargs": action.action_input},
+                raw_output=content,
+            )
+            observation = ObservationReasoningStep(observation=content)
+
+            # The state of the run after the step, as the steps leave it
+            await ctx.set("step_count", index + 1)
+            current_reasoning = await ctx.get("current_reasoning")
+            current_reasoning.extend([action, observation])
+            (await ctx.get("sources")).append(output)
+            await agent.add_messages(
+                ctx, [agent.render_step(action), agent.render_step(observation)]
+            )
+
+            start = time.perf_counter()
+            await asyncio.to_thread(
+                agent.checkpoint_store.put_tool_output,
+                run_id,
+                call_key(tool_call),
+                dump_tool_output(output),
+            )
+            timings["tool output"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await agent.save_checkpoint(
+                ctx, ToolCallEvent(tool_calls=[tool_call]) if index % 2 else PrepEvent()
+            )
+            timings["checkpoint"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            state = await asyncio.to_thread(agent.checkpoint_store.load, run_id)
+            await agent.restore_checkpoint(Context(agent), state)
+            timings["resume"].append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckpointStore(Path(directory) / "checkpoints.db")
+        agent = ReasoningAgent(checkpoint_store=store)
+        timings = {"checkpoint": [], "tool output": [], "resume": []}
+        for run in range(args.runs):
+            asyncio.run(replay(agent, f"run-{run}", timings))
+        size = len(json.dumps(store.load(f"run-{args.runs - 1}")))
+        store.close()
+
+    print(
+        f"{args.runs} runs of {args.steps} steps, observations of "
+        f"{args.observation_chars} characters, last checkpoint of {size / 1024:.0f}KB"
+    )
+    print(f"{'operation':<12} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, samples in timings.items():
+        latency = percentiles(samples)
+        print(
+            f"{name:<12} "
+            + " ".join(f"{latency[q] * 1000:>6.2f}ms" for q in ("p50", "p95", "p99"))
+        )
+
+
+if __name__ == "__main__":
+    main()
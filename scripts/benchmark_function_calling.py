@@ -0,0 +1,89 @@
+"""Benchmarks the ReAct and the function-calling modes of the llama-index workflow.
+
+Runs a set of tasks `--runs` times through the reasoning agent, with the
+ReAct text format and with the tool-calling API of the model, and reports
+per mode and task the outputs that could not be parsed, the LLM calls taken
+to answer (turns) and the wall-clock time. The paper tools run against the
+local stand-in server; the model is the OpenAI one (needs OPENAI_API_KEY).
+
+Usage:
+    python scripts/benchmark_function_calling.py --runs 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmark_serialization import PAPERS_TASK, SELECT_TASK
+from benchmark_utils import use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+AUTHORS_TASK = (
+    "What are the titles of the latest papers of Yann LeCun and of {other}? "
+    "Answer with one title per author."
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", default="0.05")
+    args = parser.parse_args()
+
+    use_framework("llama-index")
+    from technology_scout.agent_workflow import ReasoningAgent
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools.async_http_client import AsyncHttpClient
+    from technology_scout.tools.http_client import HttpClient
+    from technology_scout.tools.select_from_db import select_from_db_tool
+
+    tools = [
+        papers_module.search_author_tool,
+        papers_module.get_author_papers_tool,
+        papers_module.get_paper_tool,
+        papers_module.search_authors_tool,
+        papers_module.get_papers_for_authors_tool,
+        select_from_db_tool,
+    ]
+
+    async def run(function_calling: bool, task: str) -> dict:
+        agent = ReasoningAgent(
+            tools=tools, function_calling=function_calling, timeout=300
+        )
+        return await agent.run(input=task)
+
+    with MockPapersWithCode(latency=args.latency, n_authors=1) as server:
+        papers_module.client = HttpClient(server.base_url)
+        papers_module.async_client = AsyncHttpClient(server.base_url)
+        papers_module.paper_store = None
+        other = list(server.authors.values())[1]["full_name"]
+        tasks = {
+            "select": SELECT_TASK,
+            "paper title": PAPERS_TASK,
+            "two authors": AUTHORS_TASK.format(other=other),
+        }
+
+        print(f"{args.runs} runs per task")
+        print(
+            f"{'mode':<18} {'task':<12} {'parse failures':>14} {'turns':>6} "
+            f"{'max':>4} {'wall':>7}"
+        )
+        for mode, function_calling in [("ReAct", False), ("function calling", True)]:
+            for name, task in tasks.items():
+                failures, turns, walls = 0, [], []
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    result = asyncio.run(run(function_calling, task))
+                    walls.append(time.perf_counter() - start)
+                    failures += result["parse_failures"]
+                    turns.append(result["steps"])
+                print(
+                    f"{mode:<18} {name:<12} {failures:>14} "
+                    f"{statistics.mean(turns):>6.1f} {max(turns):>4} "
+                    f"{statistics.median(walls):>6.1f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
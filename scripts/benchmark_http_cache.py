@@ -0,0 +1,89 @@
+"""Benchmarks the HTTP response cache against the local stand-in server.
+
+Fetches every page of the papers of Yann LeCun, as an agent session repeating
+`get_author_papers` calls would, with no cache, with a cold cache, with a warm
+cache of fresh responses, and with a cache of expired responses revalidated
+by `ETag`, and reports the median time per session, the requests sent and how
+many of them were answered with a `304`.
+
+Usage:
+    python scripts/benchmark_http_cache.py --framework langgraph --latency 0.05
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_utils import FRAMEWORKS, use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+PATH = "/authors/yann-lecun/papers"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--items-per-page", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools.http_cache import HttpCache
+    from technology_scout.tools.http_client import HttpClient
+
+    with (
+        MockPapersWithCode(latency=args.latency) as server,
+        tempfile.TemporaryDirectory() as directory,
+    ):
+        probe = HttpClient(server.base_url).get_json(
+            PATH, params={"items_per_page": args.items_per_page}
+        )
+        n_pages = -(-probe["count"] // args.items_per_page)
+
+        def session(client: HttpClient) -> None:
+            for page in range(1, n_pages + 1):
+                client.get_json(
+                    PATH, params={"page": page, "items_per_page": args.items_per_page}
+                )
+
+        def make_cache(name: str, **kwargs) -> HttpCache:
+            return HttpCache(Path(directory) / f"{name}.db", **kwargs)
+
+        warm = make_cache("warm")
+        expired = make_cache("expired", default_ttl=0)
+        session(HttpClient(server.base_url, cache=warm))
+        session(HttpClient(server.base_url, cache=expired))
+        cold_caches = iter(make_cache(f"cold-{run}") for run in range(args.runs))
+
+        scenarios = {
+            "no cache (before)": lambda: HttpClient(server.base_url),
+            "cold cache": lambda: HttpClient(server.base_url, cache=next(cold_caches)),
+            "warm cache": lambda: HttpClient(server.base_url, cache=warm),
+            "revalidated (304)": lambda: HttpClient(server.base_url, cache=expired),
+        }
+
+        print(
+            f"{n_pages} pages of {args.items_per_page} papers, "
+            f"{args.latency * 1000:.0f}ms server latency"
+        )
+        print(f"{'':<20} {'median':>9} {'requests':>9} {'304s':>6}")
+        for name, make_client in scenarios.items():
+            durations = []
+            requests, not_modified = server.requests, server.not_modified
+            for _ in range(args.runs):
+                client = make_client()
+                start = time.perf_counter()
+                session(client)
+                durations.append(time.perf_counter() - start)
+            print(
+                f"{name:<20} {statistics.median(durations) * 1000:>7.1f}ms "
+                f"{(server.requests - requests) / args.runs:>9.0f} "
+                f"{(server.not_modified - not_modified) / args.runs:>6.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
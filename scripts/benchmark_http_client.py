@@ -0,0 +1,102 @@
+"""Benchmarks the Papers with Code client against the local stand-in server.
+
+Sends `--calls` paper list requests from `--threads` threads, first with a bare
+`requests.get` per call, as the tools did, then with the pooled `HttpClient`,
+and reports the latency percentiles, the number of TCP connections the server
+accepted and the calls that failed. With `--error-rate`, a share of the
+responses are 503s: the bare calls fail, the client retries them.
+
+Usage:
+    python scripts/benchmark_http_client.py --framework langgraph --error-rate 0.05
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from benchmark_utils import percentiles, use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+PATH = "/authors/yann-lecun/papers"
+PARAMS = {"page": 1, "items_per_page": 5}
+
+
+def run_load(get, calls: int, threads: int) -> tuple[list[float], int]:
+    """Calls `get` concurrently and returns the latencies and the failures."""
+
+    def timed_call(_) -> float | None:
+        start = time.perf_counter()
+        try:
+            get()
+        except requests.exceptions.RequestException:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(timed_call, range(calls)))
+    latencies = [latency for latency in results if latency is not None]
+    return latencies, len(results) - len(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--framework",
+        choices=["langgraph", "llama-index", "smolagents"],
+        default="langgraph",
+    )
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools.http_client import HttpClient
+
+    print(
+        f"{args.calls} calls from {args.threads} threads, "
+        f"{args.latency * 1000:.0f}ms server latency, "
+        f"{args.error_rate:.0%} of 503s"
+    )
+    print(
+        f"{'':<26} {'p50':>8} {'p95':>8} {'p99':>8} "
+        f"{'connections':>12} {'failed':>7} {'retries':>8}"
+    )
+
+    for name in ["requests.get (before)", "HttpClient (after)"]:
+        with MockPapersWithCode(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            retry_after=args.retry_after,
+        ) as server:
+            if name == "HttpClient (after)":
+                client = HttpClient(server.base_url, backoff_factor=0.05, max_retries=5)
+
+                def get() -> None:
+                    client.get_json(PATH, params=PARAMS)
+
+            else:
+                client = None
+
+                def get() -> None:
+                    response = requests.get(server.base_url + PATH, params=PARAMS)
+                    response.raise_for_status()
+                    response.json()
+
+            latencies, failures = run_load(get, args.calls, args.threads)
+            connections = server.connections
+            retries = client.stats.retries if client else 0
+
+        latency = percentiles(latencies)
+        print(
+            f"{name:<26} {latency['p50'] * 1000:>6.1f}ms {latency['p95'] * 1000:>6.1f}ms "
+            f"{latency['p99'] * 1000:>6.1f}ms {connections:>12} {failures:>7} "
+            f"{retries:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
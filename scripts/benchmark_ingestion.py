@@ -0,0 +1,101 @@
+"""Benchmark of the incremental ingestion of scraped influencers.
+
+Generates a synthetic scrape of `--n-influencers` influencers, then times, on
+a copy of `ai_watch.db`:
+
+- the first ingestion, inserting every influencer;
+- a re-run over the same file, which writes nothing;
+- a re-run where a fraction of the influencers changed and swapped ranks.
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from benchmark_utils import ROOT_DIR
+from ingest_tech_influencers import ingest
+
+SOURCE = ROOT_DIR / "data" / "tech_influencers.json"
+DATABASE = ROOT_DIR / "data" / "ai_watch.db"
+
+
+def make_scrape(n_influencers: int) -> list[dict]:
+    """Returns `n_influencers` influencers derived from the scraped ones."""
+    seeds = json.loads(SOURCE.read_text())
+    scrape = []
+    for rank in range(1, n_influencers + 1):
+        seed = seeds[(rank - 1) % len(seeds)]
+        handle = f"{seed['twitter_username']}_{rank}"
+        scrape.append(
+            {
+                **seed,
+                "name": f"{seed['name']} {rank}",
+                "twitter_username": handle,
+                "links": [f"https://example.com/{handle[1:]}", *seed["links"]],
+                "rank": rank,
+            }
+        )
+    return scrape
+
+
+def mutate(scrape: list[dict], fraction: float, seed: int = 0) -> list[dict]:
+    """Changes the followers of a fraction of the influencers and swaps ranks."""
+    rng = random.Random(seed)
+    scrape = [dict(item) for item in scrape]
+    changed = rng.sample(range(len(scrape)), int(len(scrape) * fraction))
+    for index in changed:
+        scrape[index]["nb_twitter_followers"] += rng.randint(1, 1000)
+    for first, second in zip(changed[::2], changed[1::2]):
+        scrape[first]["rank"], scrape[second]["rank"] = (
+            scrape[second]["rank"],
+            scrape[first]["rank"],
+        )
+    return scrape
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-influencers", type=int, default=10_000)
+    parser.add_argument("--changed-fraction", type=float, default=0.01)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        database = directory / "ai_watch.db"
+        shutil.copy(DATABASE, database)
+
+        scrape = make_scrape(args.n_influencers)
+        runs = [
+            ("first ingestion", scrape),
+            ("re-run, unchanged", scrape),
+            (
+                f"re-run, {args.changed_fraction:.0%} changed",
+                mutate(scrape, args.changed_fraction),
+            ),
+        ]
+
+        print(f"{args.n_influencers} influencers")
+        for label, items in runs:
+            source = directory / "tech_influencers.json"
+            source.write_text(json.dumps({"tech_influencers": items}, indent=4))
+            stats = ingest(source, database)
+            print(
+                f"{label:<22} {stats.seconds:6.2f}s  inserted={stats.inserted} "
+                f"updated={stats.updated} unchanged={stats.unchanged}"
+            )
+
+        con = sqlite3.connect(database)
+        con.execute(
+            "INSERT INTO influencers_fts (influencers_fts) VALUES ('integrity-check')"
+        )
+        con.close()
+        print("full-text index consistent with the influencers table")
+
+
+if __name__ == "__main__":
+    main()
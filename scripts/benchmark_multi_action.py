@@ -0,0 +1,156 @@
+"""Benchmarks the multi-action reasoning steps of the llama-index workflow.
+
+Answers "compare the latest papers of N authors" with the reasoning agent and
+the `search_author` and `get_author_papers` tools, against the local stand-in
+server, with a scripted LLM taking `--llm-latency` per call:
+
+- taking one action per step, as the workflow did: a `search_author` step
+  and a `get_author_papers` step per author, then the answer;
+- taking the independent actions of a step at once: a step searching all the
+  authors, a step getting all their papers, then the answer.
+
+Reports the LLM calls, the tool calls and the wall-clock time of the task.
+With `--agent`, the task is also run with the OpenAI model (needs
+OPENAI_API_KEY), reporting the LLM calls and actions it took.
+
+Usage:
+    python scripts/benchmark_multi_action.py --authors 5 --llm-latency 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+from benchmark_utils import use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+TASK = "Compare the latest papers of {names}."
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--authors", type=int, default=5)
+    parser.add_argument("--latency", default="0.1")
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--agent", action="store_true")
+    args = parser.parse_args()
+
+    use_framework("llama-index")
+    from llama_index.core.agent.react.types import ObservationReasoningStep
+    from llama_index.core.llms import CompletionResponse, CustomLLM, LLMMetadata
+    from llama_index.core.llms.callbacks import llm_completion_callback
+    from technology_scout.agent_workflow import (
+        MultiActionReasoningStep,
+        ReasoningAgent,
+    )
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools.http_client import HttpClient
+
+    class ScriptedLLM(CustomLLM):
+        """Answers with the given outputs, in order, after a delay."""
+
+        outputs: list[str]
+        latency: float
+        calls: int = 0
+
+        @property
+        def metadata(self) -> LLMMetadata:
+            return LLMMetadata()
+
+        @llm_completion_callback()
+        def complete(
+            self, prompt: str, formatted: bool = False, **kwargs: Any
+        ) -> CompletionResponse:
+            time.sleep(self.latency)
+            self.calls += 1
+            return CompletionResponse(text=self.outputs[self.calls - 1])
+
+        def stream_complete(self, prompt: str, formatted: bool = False, **kwargs):
+            raise NotImplementedError
+
+    async def run(agent: ReasoningAgent) -> dict:
+        return await agent.run(input=task)
+
+    def actions(tool: str, key: str, values: list[str]) -> str:
+        return "".join(
+            f"\nAction: {tool}\nAction Input: {json.dumps({key: value})}"
+            for value in values
+        )
+
+    with MockPapersWithCode(latency=args.latency, n_authors=args.authors) as server:
+        papers_module.client = HttpClient(server.base_url)
+        papers_module.paper_store = None
+        authors = list(server.authors.values())[: args.authors]
+        names = [author["full_name"] for author in authors]
+        ids = [author["id"] for author in authors]
+        task = TASK.format(names=", ".join(names))
+        tools = [papers_module.search_author_tool, papers_module.get_author_papers_tool]
+        answer = "Thought: I can answer without using any more tools.\nAnswer: Done."
+
+        single_action = [
+            output
+            for name, author_id in zip(names, ids)
+            for output in (
+                "Thought: I need the id of the author."
+                + actions("search_author", "name", [name]),
+                "Thought: I need the papers of the author."
+                + actions("get_author_papers", "author_id", [author_id]),
+            )
+        ] + [answer]
+        multi_action = [
+            "Thought: I need the ids of the authors."
+            + actions("search_author", "name", names),
+            "Thought: I need the papers of the authors."
+            + actions("get_author_papers", "author_id", ids),
+            answer,
+        ]
+
+        print(
+            f"Latest papers of {len(names)} authors, {args.latency}s server "
+            f"latency, {args.llm_latency}s per LLM call"
+        )
+        print(f"{'steps':<16} {'LLM calls':>9} {'tool calls':>10} {'wall':>8}")
+        for name, outputs in [
+            ("single action", single_action),
+            ("multi action", multi_action),
+        ]:
+            llm = ScriptedLLM(outputs=outputs, latency=args.llm_latency)
+            agent = ReasoningAgent(llm=llm, tools=tools, timeout=600)
+            requests = server.requests
+            start = time.perf_counter()
+            asyncio.run(run(agent))
+            wall = time.perf_counter() - start
+            print(
+                f"{name:<16} {llm.calls:>9} {server.requests - requests:>10} "
+                f"{wall:>7.1f}s"
+            )
+
+        if not args.agent:
+            return
+
+        agent = ReasoningAgent(tools=tools, timeout=600)
+        requests = server.requests
+        start = time.perf_counter()
+        result = asyncio.run(run(agent))
+        wall = time.perf_counter() - start
+        steps = [
+            step
+            for step in result["reasoning"]
+            if not isinstance(step, ObservationReasoningStep)
+        ]
+        per_step = [
+            len(step.actions) if isinstance(step, MultiActionReasoningStep) else 1
+            for step in steps[:-1]
+        ]
+        print(
+            f"{'OpenAI model':<16} {len(steps):>9} {server.requests - requests:>10} "
+            f"{wall:>7.1f}s  actions per step: {per_step}"
+        )
+
+
+if __name__ == "__main__":
+    main()
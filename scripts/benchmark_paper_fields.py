@@ -0,0 +1,111 @@
+"""Benchmarks the tokens of the paper tool results, full vs. projected papers.
+
+Renders the papers of the fixture the way the paper tools return them: with
+all their fields, on the default fields (id, title, published, authors), and
+on the default fields plus the abstracts cut to `--max-abstract-chars`.
+Reports the tokens of each result and the time to project and serialize it.
+
+With `--agent`, the paper task of the tests is also run end-to-end through the
+agent of the framework, with the full and the projected tools, reporting the
+tokens of the tool results in the prompt and the latency of the task (needs
+OPENAI_API_KEY and network access to the Papers with Code API).
+
+Usage:
+    python scripts/benchmark_paper_fields.py --framework langgraph [--agent]
+"""
+
+import argparse
+import functools
+import json
+import time
+
+from benchmark_serialization import PAPERS_TASK, make_tool, run_task
+from benchmark_utils import FRAMEWORKS, ROOT_DIR, get_token_counter, use_framework
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--max-abstract-chars", type=int, default=200)
+    parser.add_argument("--agent", action="store_true")
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools.serialization import compact_output, serialize
+
+    count_tokens = get_token_counter()
+    fixture = json.loads(
+        (ROOT_DIR / "data" / "yann_lecuns_paper_response.json").read_text()
+    )
+    papers = [
+        papers_module.PaperAuthorPaper.model_validate(paper)
+        for paper in fixture["results"]
+    ]
+    defaults = list(papers_module.DEFAULT_PAPER_FIELDS)
+    renderings = {
+        "full": lambda result: result,
+        "default fields": lambda result: papers_module.project_papers(result),
+        "with abstracts cut": lambda result: papers_module.project_papers(
+            result, [*defaults, "abstract"], args.max_abstract_chars
+        ),
+    }
+
+    print(f"{'result':<32} {'rendering':<20} {'tokens':>7} {'saved':>6} {'time':>10}")
+    for name, result in {
+        "get_author_papers (5 papers)": papers[:5],
+        "author papers page (50 papers)": papers,
+    }.items():
+        full_tokens = count_tokens(serialize(result))
+        for rendering, project in renderings.items():
+            tokens = count_tokens(serialize(project(result)))
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                serialize(project(result))
+            elapsed = (time.perf_counter() - start) / args.repeat
+
+            print(
+                f"{name:<32} {rendering:<20} {tokens:>7} "
+                f"{1 - tokens / full_tokens:>6.0%} {elapsed * 1e3:>8.2f}ms"
+            )
+
+    if not args.agent:
+        return
+
+    def counted(fn, tokens: list[int]):
+        """Counts the tokens of the results of a compact tool."""
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            tokens.append(count_tokens(result))
+            return result
+
+        return wrapper
+
+    print(f"\n{'tools':<10} {'calls':>5} {'tokens':>7} {'latency':>8}")
+    for name, wrap in [
+        ("full", lambda fn: fn),
+        ("projected", papers_module.with_fields),
+    ]:
+        tokens = []
+        tools = [
+            make_tool(
+                args.framework,
+                counted(compact_output(papers_module.search_author), tokens),
+            ),
+            make_tool(
+                args.framework,
+                counted(compact_output(wrap(papers_module.get_author_papers)), tokens),
+            ),
+        ]
+        start = time.perf_counter()
+        run_task(args.framework, tools, PAPERS_TASK)
+        latency = time.perf_counter() - start
+        print(f"{name:<10} {len(tokens):>5} {sum(tokens):>7} {latency:>7.1f}s")
+
+
+if __name__ == "__main__":
+    main()
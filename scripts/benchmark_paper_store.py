@@ -0,0 +1,106 @@
+"""Benchmarks the local paper store against the local stand-in server.
+
+Imports a crawl of the papers of `--authors` synthetic authors in bulk, then
+answers "what is the title of paper X of author Y" the way the agent had to,
+searching the author then paging through their papers with `find_author_paper`,
+and with `get_paper` from the store. It also times `search_papers` and
+`papers_by_author` answered from the store, and reports the median latencies.
+
+Usage:
+    python scripts/benchmark_paper_store.py --framework langgraph --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_utils import FRAMEWORKS, use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+
+def median_time(call, runs: int) -> float:
+    """Returns the median duration of a call, in seconds."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--authors", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools.async_http_client import AsyncHttpClient
+    from technology_scout.tools.http_client import HttpClient
+    from technology_scout.tools.paper_store import PaperStore
+
+    with (
+        MockPapersWithCode(latency=args.latency, n_authors=args.authors) as server,
+        tempfile.TemporaryDirectory() as directory,
+    ):
+        papers_module.client = HttpClient(server.base_url)
+        papers_module.async_client = AsyncHttpClient(server.base_url)
+        papers_module.paper_store = store = PaperStore(Path(directory) / "papers.db")
+
+        # The crawl, one paper per line, of all the synthetic authors.
+        crawl = Path(directory) / "crawl.jsonl"
+        with open(crawl, "w") as file:
+            for author_id in server.authors:
+                for paper in server.papers(author_id):
+                    file.write(json.dumps(paper) + "\n")
+        start = time.perf_counter()
+        n_papers = store.import_file(crawl)
+        import_duration = time.perf_counter() - start
+        papers_module.get_all_author_papers("yann-lecun")
+
+        rng = random.Random(0)
+        lecun_papers = server.papers("yann-lecun")
+        targets = [rng.choice(lecun_papers) for _ in range(args.runs)]
+
+        def find_through_the_api() -> None:
+            paper = targets[rng.randrange(len(targets))]
+            author = papers_module.search_author("Yann LeCun")[0]
+            assert papers_module.find_author_paper(author.id, paper_id=paper["id"])
+
+        def get_from_the_store() -> None:
+            paper = targets[rng.randrange(len(targets))]
+            assert papers_module.get_paper(paper["id"])
+
+        timings = {
+            "search + page through (before)": median_time(
+                find_through_the_api, args.runs
+            ),
+            "get_paper": median_time(get_from_the_store, args.runs * 50),
+            "search_papers": median_time(
+                lambda: papers_module.search_papers("world models planning"),
+                args.runs * 50,
+            ),
+            "papers_by_author": median_time(
+                lambda: papers_module.papers_by_author("yann-lecun", "2024-01-01"),
+                args.runs * 50,
+            ),
+        }
+
+    print(
+        f"Imported {n_papers} papers of {len(server.authors)} authors in "
+        f"{import_duration:.2f}s ({n_papers / import_duration:.0f} papers/s), "
+        f"{args.latency * 1000:.0f}ms server latency"
+    )
+    for name, duration in timings.items():
+        print(f"{name:<32} {duration * 1e6:>10.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Load tests the Papers with Code client against the local stand-in server.
+
+Replays agent-like sessions, a `search_author` then a `get_author_papers` call
+on a random synthetic author, from `--threads` threads for `--duration`
+seconds, through the pooled `HttpClient`, and reports the throughput, the
+latency percentiles of the calls, and the errors, retries and 429s. The
+server draws its latencies from `--latency` and injects the `--error`
+statuses and the `--rate-limit`.
+
+With `--base-url`, the sessions target an already running server instead,
+e.g. one started with `scripts/mock_papers_with_code.py`, and the server side
+counters are not reported.
+
+Usage:
+    python scripts/benchmark_papers_with_code_load.py --authors 5000 \\
+        --latency lognormal:0.03,0.6 --error 429=0.02 --error 503=0.02 \\
+        --rate-limit 200
+"""
+
+import argparse
+import contextlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from benchmark_utils import FRAMEWORKS, percentiles, use_framework
+from mock_papers_with_code import MockPapersWithCode, make_authors, parse_error
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--base-url", help="URL of an already running server.")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--latency", default="lognormal:0.03,0.6")
+    parser.add_argument(
+        "--error", type=parse_error, action="append", default=[], metavar="STATUS=RATE"
+    )
+    parser.add_argument("--rate-limit", type=float)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools.http_client import HttpClient
+
+    # The same seed gives the same synthetic authors as the server.
+    authors = list(make_authors(args.authors, args.seed).values())
+
+    with contextlib.ExitStack() as stack:
+        server = None
+        base_url = args.base_url
+        if base_url is None:
+            server = stack.enter_context(
+                MockPapersWithCode(
+                    latency=args.latency,
+                    errors=dict(args.error),
+                    rate_limit=args.rate_limit,
+                    n_authors=args.authors,
+                    seed=args.seed,
+                )
+            )
+            base_url = server.base_url
+        client = HttpClient(base_url, backoff_factor=0.05)
+
+        latencies, failures = [], 0
+        lock = threading.Lock()
+        deadline = time.monotonic() + args.duration
+
+        def run_sessions(worker: int) -> None:
+            nonlocal failures
+            rng = random.Random(f"{args.seed}-{worker}")
+            while time.monotonic() < deadline:
+                author = rng.choice(authors)
+                for path, params in [
+                    ("/authors", {"q": author["full_name"]}),
+                    (f"/authors/{author['id']}/papers", {"items_per_page": 50}),
+                ]:
+                    start = time.perf_counter()
+                    try:
+                        client.get_json(path, params=params)
+                    except requests.exceptions.RequestException:
+                        with lock:
+                            failures += 1
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as executor:
+            list(executor.map(run_sessions, range(args.threads)))
+        elapsed = time.perf_counter() - start
+
+    latency = percentiles(latencies)
+    stats = client.stats
+    print(
+        f"{args.threads} threads for {elapsed:.1f}s against {base_url}, "
+        f"latency {args.latency}"
+    )
+    print(f"calls/sec     {len(latencies) / elapsed:>8.1f}")
+    for name, value in latency.items():
+        print(f"{name:<13} {value * 1000:>6.1f}ms")
+    print(f"failed calls  {failures:>8}")
+    print(f"requests      {stats.requests:>8}")
+    print(f"retries       {stats.retries:>8}")
+    if server is not None:
+        print(f"injected      {server.errors:>8}")
+        print(f"rate limited  {server.rate_limited:>8}")
+        print(f"connections   {server.connections:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmarks the execution of the tool calls of a reasoning step.
+
+Runs steps of `--calls` calls to slow stub tools, half sync (sleeping in a
+thread) and half async (sleeping on the loop), with latencies spread up to
+`--max-latency`, through `ReasoningAgent.execute_tools` of the llama-index
+workflow, and through the serial loop it ran before. Reports the step latency
+against the sum and the maximum of the tool latencies.
+
+Usage:
+    python scripts/benchmark_parallel_tools.py --calls 6 --max-latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmark_utils import use_framework
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=6)
+    parser.add_argument("--max-latency", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    use_framework("llama-index")
+    from llama_index.core.llms import MockLLM
+    from llama_index.core.tools import FunctionTool, ToolSelection
+    from llama_index.core.workflow import Context
+    from technology_scout.agent_workflow import ReasoningAgent, ToolCallEvent
+
+    def sync_tool(seconds: float) -> str:
+        """Sleeps in a thread."""
+        time.sleep(seconds)
+        return "done"
+
+    async def async_tool(seconds: float) -> str:
+        """Sleeps on the event loop."""
+        await asyncio.sleep(seconds)
+        return "done"
+
+    agent = ReasoningAgent(
+        llm=MockLLM(),
+        tools=[
+            FunctionTool.from_defaults(sync_tool),
+            FunctionTool.from_defaults(async_tool),
+        ],
+    )
+    latencies = [
+        args.max_latency * (index + 1) / args.calls for index in range(args.calls)
+    ]
+    tool_calls = [
+        ToolSelection(
+            tool_id=f"call_{index}",
+            tool_name="sync_tool" if index % 2 else "async_tool",
+            tool_kwargs={"seconds": seconds},
+        )
+        for index, seconds in enumerate(latencies)
+    ]
+
+    async def serial() -> None:
+        # What execute_tools ran before: one call after the other.
+        for tool_call in tool_calls:
+            tool = agent.tools_by_name[tool_call.tool_name]
+            await tool.acall(**tool_call.tool_kwargs)
+
+    async def concurrent() -> None:
+        await agent.execute_tools(Context(agent), ToolCallEvent(tool_calls=tool_calls))
+
+    print(
+        f"{args.calls} tool calls of {min(latencies) * 1000:.0f} to "
+        f"{max(latencies) * 1000:.0f}ms: {sum(latencies) * 1000:.0f}ms in total, "
+        f"{max(latencies) * 1000:.0f}ms for the slowest"
+    )
+    print(f"{'execution':<12} {'step':>9}")
+    for name, run in [("serial", serial), ("concurrent", concurrent)]:
+        durations = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            asyncio.run(run())
+            durations.append(time.perf_counter() - start)
+        print(f"{name:<12} {min(durations) * 1000:>7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmarks parsing a page of papers from the raw body of the response.
+
+Parses the 100 KB `data/yann_lecuns_paper_response.json` (50 papers) the way
+the tools did, decoding the JSON then validating it with a freshly subscripted
+`ApiResponse[list[PaperAuthorPaper]]`, then with the cached validator on the
+raw bytes, and with projections keeping only some fields in slotted records.
+Reports the median parse time, the peak memory allocated while parsing, and
+the memory retained by the parsed page. `--copies` repeats the papers in the
+page, to measure large lists.
+
+The memory is traced by `tracemalloc`, which sees the Python objects only:
+the buffers of the Rust JSON parser are not counted, and the short strings it
+caches across parses, e.g. the author names, are counted once.
+
+Usage:
+    python scripts/benchmark_parsing.py --framework langgraph --copies 1
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+from benchmark_utils import FRAMEWORKS, ROOT_DIR, use_framework
+
+FIXTURE_PATH = ROOT_DIR / "data" / "yann_lecuns_paper_response.json"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--copies", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools.query_papers_with_code import (
+        ApiResponse,
+        PaperAuthorPaper,
+        paper_projection,
+        parse_page,
+    )
+
+    fixture = json.loads(FIXTURE_PATH.read_bytes())
+    fixture["results"] = fixture["results"] * args.copies
+    body = json.dumps(fixture).encode()
+
+    parsers = {
+        "json.loads + model_validate (before)": lambda: ApiResponse[
+            list[PaperAuthorPaper]
+        ].model_validate(json.loads(body)),
+        "validate_json, cached": lambda: parse_page(body, PaperAuthorPaper),
+        "id/title/published/authors": lambda: parse_page(
+            body, paper_projection(["id", "title", "published", "authors"])
+        ),
+        "id/title": lambda: parse_page(body, paper_projection(["id", "title"])),
+    }
+
+    print(f"{len(fixture['results'])} papers, {len(body) / 1024:.0f} KiB")
+    print(f"{'':<38} {'median':>9} {'peak':>9} {'retained':>9}")
+    for name, parse in parsers.items():
+        parse()  # Builds the cached validators and projections.
+        durations = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            parse()
+            durations.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        page = parse()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del page
+
+        print(
+            f"{name:<38} {statistics.median(durations) * 1000:>7.2f}ms "
+            f"{peak / 1024:>6.0f}KiB {retained / 1024:>6.0f}KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
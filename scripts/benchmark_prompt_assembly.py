@@ -0,0 +1,136 @@
+"""Benchmarks the assembly of the prompts of the llama-index workflow.
+
+Replays a run of `--steps` reasoning steps, each calling a tool whose
+observation is `--observation-chars` long, with the tools of the agent, and
+assembles the prompt of every step:
+
+- re-rendered: the ReAct formatter renders the system header, the tools and
+  the whole reasoning trace again at each step, as the workflow did;
+- incremental: the system message is rendered once and each step appends its
+  messages, without a token budget, and with `--budget` tokens of
+  observations.
+
+Reports the time spent assembling the prompts, the tokens of the last prompt
+and of all of them, and the share of these tokens in the prefix shared with
+the previous prompt, which providers with prompt caching do not process again.
+
+Usage:
+    python scripts/benchmark_prompt_assembly.py --steps 15 --budget 2000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmark_utils import get_token_counter, use_framework
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--steps", type=int, default=15)
+    parser.add_argument("--observation-chars", type=int, default=2000)
+    parser.add_argument("--budget", type=int, default=2000)
+    args = parser.parse_args()
+
+    # The agent is never run against the model.
+    os.environ.setdefault("OPENAI_API_KEY", "unused")
+    use_framework("llama-index")
+    from llama_index.core.agent.react.types import (
+        ActionReasoningStep,
+        ObservationReasoningStep,
+    )
+    from llama_index.core.workflow import Context, StartEvent
+    from technology_scout.agent_workflow import PrepEvent, ReasoningAgent
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools.search_influencers import search_influencers_tool
+    from technology_scout.tools.select_from_db import select_from_db_tool
+
+    tools = [
+        papers_module.search_author_tool,
+        papers_module.get_author_papers_tool,
+        papers_module.get_paper_tool,
+        papers_module.search_papers_tool,
+        papers_module.search_authors_tool,
+        papers_module.get_papers_for_authors_tool,
+        select_from_db_tool,
+        search_influencers_tool,
+    ]
+    count_tokens = get_token_counter()
+    steps = []
+    for index in range(args.steps):
+        steps.append(
+            ActionReasoningStep(
+                thought=f"I need the papers of the author {index}.",
+                action="get_author_papers",
+                action_input={"author_id": f"author-{index}"},
+            )
+        )
+        steps.append(
+            ObservationReasoningStep(
+                observation=f"{index} " * (args.observation_chars // 2)
+            )
+        )
+
+    def text(prompt) -> str:
+        return "".join(
+            f"{message.role.value}: {message.content}\n" for message in prompt
+        )
+
+    async def incremental(agent: ReasoningAgent) -> tuple[list, float]:
+        ctx = Context(agent)
+        await agent.new_user_msg(ctx, StartEvent(input="Compare the authors."))
+        prompts, elapsed = [], 0.0
+        for index in range(0, len(steps), 2):
+            start = time.perf_counter()
+            for step in steps[index : index + 2]:
+                await agent.add_messages(ctx, [agent.render_step(step)])
+            event = await agent.prepare_chat_history(ctx, PrepEvent())
+            elapsed += time.perf_counter() - start
+            prompts.append(text(event.input))
+        return prompts, elapsed
+
+    async def re_rendered(agent: ReasoningAgent) -> tuple[list, float]:
+        ctx = Context(agent)
+        await agent.new_user_msg(ctx, StartEvent(input="Compare the authors."))
+        chat_history = (await ctx.get("memory")).get()
+        prompts, elapsed = [], 0.0
+        for index in range(0, len(steps), 2):
+            start = time.perf_counter()
+            prompt = agent.formatter.format(
+                tools, chat_history, current_reasoning=steps[: index + 2]
+            )
+            elapsed += time.perf_counter() - start
+            prompts.append(text(prompt))
+        return prompts, elapsed
+
+    print(
+        f"{args.steps} steps, observations of {args.observation_chars} characters, "
+        f"{len(tools)} tools"
+    )
+    print(
+        f"{'assembly':<26} {'time':>9} {'last prompt':>11} {'all prompts':>11} "
+        f"{'cached':>7}"
+    )
+    for name, assemble, budget in [
+        ("re-rendered", re_rendered, None),
+        ("incremental", incremental, None),
+        (f"incremental, budget {args.budget}", incremental, args.budget),
+    ]:
+        agent = ReasoningAgent(tools=tools, observation_token_budget=budget)
+        prompts, elapsed = asyncio.run(assemble(agent))
+        tokens = [count_tokens(prompt) for prompt in prompts]
+        cached = sum(
+            count_tokens(os.path.commonprefix([previous, prompt]))
+            for previous, prompt in zip(prompts, prompts[1:])
+        )
+        print(
+            f"{name:<26} {elapsed * 1000:>7.2f}ms {tokens[-1]:>11} "
+            f"{sum(tokens):>11} {cached / sum(tokens):>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
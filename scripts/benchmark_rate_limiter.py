@@ -0,0 +1,190 @@
+"""Benchmarks the client-side rate limiter against a rate limited server.
+
+Runs author searches from `--threads` threads for `--duration` seconds
+against the local stand-in server, which answers the requests above
+`--rate-limit` per second with a 429 and a `Retry-After`:
+
+- without a limiter, and with one at the rate of the server, reporting the
+  successful calls per second, the 429s, the failed calls and the latencies;
+- with `--crawl-threads` of the threads crawling, in a `batch()` block or
+  not, reporting the latencies of the calls of the sessions and of the
+  crawls;
+- from `--processes` processes sharing the threads, with a limiter per
+  process and with one shared through a SQLite file.
+
+Usage:
+    python scripts/benchmark_rate_limiter.py --rate-limit 50 --threads 32
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from benchmark_utils import FRAMEWORKS, percentiles, use_framework
+from mock_papers_with_code import MockPapersWithCode, make_authors
+
+AUTHORS = list(make_authors(1000, 0).values())
+
+
+def run_load(
+    base_url: str,
+    rate: float | None,
+    threads: int,
+    duration: float,
+    crawl_threads: int = 0,
+    lanes: bool = False,
+    path: Path | None = None,
+) -> dict:
+    """Searches random authors from threads, and returns the counters.
+
+    Args:
+        base_url (str): The URL of the server.
+        rate (float | None): The rate of the limiter, if any.
+        threads (int): The threads sending the requests.
+        duration (float): Seconds the threads send requests.
+        crawl_threads (int): How many of the threads crawl.
+        lanes (bool): Whether the crawls send batch requests.
+        path (Path | None): The file of a limiter shared across processes.
+    """
+    from technology_scout.tools.http_client import HttpClient
+    from technology_scout.tools.rate_limiter import RateLimit, RateLimiter, batch
+
+    limiter = None
+    if rate is not None:
+        limiter = RateLimiter(
+            {"127.0.0.1": RateLimit(rate, burst=max(1, int(rate / 10)))}, path=path
+        )
+    # A long enough backoff for the server to recover from a 429 storm.
+    client = HttpClient(base_url, backoff_factor=0.5, rate_limiter=limiter)
+
+    latencies = {"session": [], "crawl": []}
+    failures = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def search(worker: int) -> None:
+        nonlocal failures
+        rng = random.Random(worker)
+        role = "crawl" if worker < crawl_threads else "session"
+        with batch() if role == "crawl" and lanes else contextlib.nullcontext():
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    client.get_content(
+                        "/authors", {"q": rng.choice(AUTHORS)["full_name"]}
+                    )
+                except requests.exceptions.RequestException:
+                    with lock:
+                        failures += 1
+                    continue
+                with lock:
+                    latencies[role].append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(search, range(threads)))
+    return {"latencies": latencies, "failures": failures}
+
+
+def report(name: str, results: list[dict], duration: float, server) -> None:
+    """Prints the counters of a run."""
+    calls = sum(
+        len(latencies)
+        for result in results
+        for latencies in result["latencies"].values()
+    )
+    failures = sum(result["failures"] for result in results)
+    line = (
+        f"{name:<34} {calls / duration:>7.1f}/s {server.rate_limited:>6} {failures:>6}"
+    )
+    for role in ("session", "crawl"):
+        samples = [t for result in results for t in result["latencies"][role]]
+        if samples:
+            latency = percentiles(samples)
+            line += f"  {role} p50 {latency['p50'] * 1000:>5.0f}ms"
+            line += f" p95 {latency['p95'] * 1000:>5.0f}ms"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--rate-limit", type=float, default=50.0)
+    parser.add_argument("--latency", default="0.02")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--crawl-threads", type=int, default=24)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+
+    def server() -> MockPapersWithCode:
+        return MockPapersWithCode(
+            latency=args.latency, rate_limit=args.rate_limit, n_authors=1000
+        )
+
+    print(
+        f"{args.threads} threads for {args.duration:.0f}s, server limited to "
+        f"{args.rate_limit:.0f} requests/s"
+    )
+    print(f"{'':<34} {'calls':>9} {'429s':>6} {'failed':>6}")
+
+    for name, rate, crawl_threads, lanes in [
+        ("no limiter", None, 0, False),
+        ("limiter", args.rate_limit, 0, False),
+        ("limiter, crawls, one lane", args.rate_limit, args.crawl_threads, False),
+        ("limiter, crawls, batch lane", args.rate_limit, args.crawl_threads, True),
+    ]:
+        with server() as mock:
+            result = run_load(
+                mock.base_url,
+                rate,
+                args.threads,
+                args.duration,
+                crawl_threads=crawl_threads,
+                lanes=lanes,
+            )
+            report(name, [result], args.duration, mock)
+
+    # Forked processes inherit the framework's package on their path.
+    context = multiprocessing.get_context("fork")
+    threads = args.threads // args.processes
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in [
+            (f"{args.processes} processes, own limiters", None),
+            (
+                f"{args.processes} processes, shared file",
+                Path(directory) / "rate_limits.db",
+            ),
+        ]:
+            with (
+                server() as mock,
+                ProcessPoolExecutor(args.processes, mp_context=context) as executor,
+            ):
+                futures = [
+                    executor.submit(
+                        run_load,
+                        mock.base_url,
+                        args.rate_limit,
+                        threads,
+                        args.duration,
+                        path=path,
+                    )
+                    for _ in range(args.processes)
+                ]
+                report(
+                    name, [future.result() for future in futures], args.duration, mock
+                )
+
+
+if __name__ == "__main__":
+    main()
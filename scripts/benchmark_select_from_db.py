@@ -0,0 +1,78 @@
+"""Benchmarks `select_from_db` calls/sec with and without the connection manager.
+
+Usage:
+    python scripts/benchmark_select_from_db.py --framework langgraph --threads 8
+"""
+
+import argparse
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from benchmark_utils import FRAMEWORKS, use_framework
+
+QUERY = """
+SELECT name, twitter_username, nb_twitter_followers
+FROM influencers
+ORDER BY nb_twitter_followers DESC
+LIMIT 10
+"""
+
+
+def select_with_fresh_connection(path_to_database, query: str) -> pd.DataFrame:
+    """The original implementation: a new connection on every call."""
+    assert path_to_database.exists()
+    con = sqlite3.connect(path_to_database)
+    return pd.read_sql_query(query, con)
+
+
+def calls_per_second(fn, calls: int, threads: int) -> float:
+    """Runs `fn` `calls` times over `threads` threads and returns calls/sec."""
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(calls):
+            fn()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for future in [executor.submit(fn) for _ in range(calls)]:
+                future.result()
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools import select_from_db as module
+    from technology_scout.tools.database import ConnectionManager
+
+    variants = {
+        "fresh connection (before)": lambda: select_with_fresh_connection(
+            module.path_to_database, QUERY
+        ),
+        "connection manager (after)": lambda: module.select_from_db(QUERY),
+    }
+
+    in_memory_manager = ConnectionManager(module.path_to_database, in_memory=True)
+    variants["connection manager, in-memory (after)"] = lambda: pd.read_sql_query(
+        QUERY, in_memory_manager.get_connection()
+    )
+
+    print(f"{args.calls} calls over {args.threads} thread(s)")
+    for name, fn in variants.items():
+        fn()  # Warm-up
+        print(
+            f"{name:<40} {calls_per_second(fn, args.calls, args.threads):>10.0f} calls/s"
+        )
+
+    in_memory_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmarks the size of tool results in the prompt, default vs. compact serialization.
+
+The default rendering is what the frameworks put in the prompt when a tool
+returns a dataframe or pydantic models (`str(result)`). The compact one is the
+shared serializer used by the tool wrappers.
+
+With `--agent`, the existing test tasks are also run end-to-end through the
+agent of the framework, with the raw and the compact tools (needs
+OPENAI_API_KEY, and network access to the Papers with Code API for the paper
+tasks).
+
+Usage:
+    python scripts/benchmark_serialization.py --framework langgraph [--agent]
+"""
+
+import argparse
+import json
+import time
+
+import pandas as pd
+
+from benchmark_utils import FRAMEWORKS, ROOT_DIR, get_token_counter, use_framework
+
+SELECT_TASK = "Who is the most prominent AI personality?"
+PAPERS_TASK = (
+    "What's the title of the paper with id "
+    "learning-from-reward-free-offline-data-a-case? which is written by Yann Lecun. "
+    "Returns the title as received from PapersWithCode API."
+)
+
+
+def make_tool(framework: str, fn):
+    """Wraps a function into a tool of the framework."""
+    if framework == "langgraph":
+        from langchain_core.tools import tool
+
+        return tool(fn)
+    if framework == "llama-index":
+        from llama_index.core.tools import FunctionTool
+
+        return FunctionTool.from_defaults(fn)
+
+    from smolagents import tool
+
+    return tool(fn)
+
+
+def run_task(framework: str, tools: list, task: str) -> str:
+    """Runs a task through the agent of the framework."""
+    from technology_scout.agent import create_agent
+
+    agent = create_agent(tools=tools)
+    if framework == "langgraph":
+        result = agent.invoke({"messages": [{"role": "user", "content": task}]})
+        return result["messages"][-1].content
+    if framework == "llama-index":
+        return str(agent.query(task))
+    return str(agent.run(task))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--agent", action="store_true")
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools import select_from_db as db_module
+    from technology_scout.tools.serialization import (
+        DEFAULT_MAX_ROWS,
+        compact_output,
+        serialize,
+    )
+
+    count_tokens = get_token_counter()
+    fixture = json.loads(
+        (ROOT_DIR / "data" / "yann_lecuns_paper_response.json").read_text()
+    )
+    papers = [
+        papers_module.PaperAuthorPaper.model_validate(paper)
+        for paper in fixture["results"]
+    ]
+
+    results = {
+        "select top 10 (test task)": db_module.select_from_db(
+            "SELECT name, twitter_username, nb_twitter_followers "
+            "FROM influencers ORDER BY nb_twitter_followers DESC LIMIT 10"
+        ),
+        "select * from influencers": db_module.select_from_db(
+            "SELECT * FROM influencers"
+        ),
+        "get_author_papers (5 papers)": papers[:5],
+        "author papers page (50 papers)": papers,
+    }
+
+    print(f"{'result':<32} {'default':>10} {'compact':>10} {'saved':>7} {'time':>10}")
+    for name, result in results.items():
+        default_tokens = count_tokens(str(result))
+        compact = serialize(result)
+        compact_tokens = count_tokens(compact)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            serialize(result)
+        elapsed = (time.perf_counter() - start) / args.repeat
+
+        print(
+            f"{name:<32} {default_tokens:>10} {compact_tokens:>10} "
+            f"{1 - compact_tokens / default_tokens:>7.0%} {elapsed * 1e3:>8.2f}ms"
+        )
+        if isinstance(result, pd.DataFrame) and len(result) > pd.get_option(
+            "display.max_rows"
+        ):
+            print(
+                f"  note: the default repr only shows {pd.get_option('display.min_rows')}"
+                f" of the {len(result)} rows, the compact one shows"
+                f" {min(len(result), DEFAULT_MAX_ROWS)}"
+            )
+
+    if not args.agent:
+        return
+
+    tasks = {
+        SELECT_TASK: [db_module.select_from_db],
+        PAPERS_TASK: [papers_module.search_author, papers_module.get_author_papers],
+    }
+    print(f"\n{'task':<45} {'raw':>8} {'compact':>8}")
+    for task, functions in tasks.items():
+        timings = []
+        for wrap in (lambda fn: fn, compact_output):
+            tools = [make_tool(args.framework, wrap(fn)) for fn in functions]
+            start = time.perf_counter()
+            run_task(args.framework, tools, task)
+            timings.append(time.perf_counter() - start)
+        print(f"{task[:45]:<45} {timings[0]:>7.1f}s {timings[1]:>7.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmarks the collapsing of concurrent identical calls.
+
+Sends the same author search from `--concurrency` threads, then from as many
+asyncio tasks, to the local stand-in server, without the HTTP cache, with and
+without a single-flight group, and reports the requests the server received
+and the wall-clock time. It then runs the same query from as many threads on a
+cold query cache, with and without collapsing, and reports the executions.
+The query is a slow self-join, so that the threads overlap.
+
+Usage:
+    python scripts/benchmark_single_flight.py --framework langgraph --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark_utils import FRAMEWORKS, use_framework
+from mock_papers_with_code import MockPapersWithCode
+
+QUERY = """
+SELECT a.name, COUNT(*) AS n, SUM(length(b.name || c.name)) AS total
+FROM influencers AS a
+CROSS JOIN influencers AS b
+CROSS JOIN (SELECT name FROM influencers LIMIT 20) AS c
+GROUP BY a.name ORDER BY n DESC
+"""
+
+
+def run_threads(call, n: int) -> None:
+    """Runs a call from `n` threads at once."""
+    with ThreadPoolExecutor(n) as executor:
+        list(executor.map(lambda _: call(), range(n)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, default="langgraph")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    use_framework(args.framework)
+    from technology_scout.tools import query_papers_with_code as papers_module
+    from technology_scout.tools import select_from_db as select_module
+    from technology_scout.tools.async_http_client import AsyncHttpClient
+    from technology_scout.tools.http_client import HttpClient
+    from technology_scout.tools.single_flight import SingleFlight
+
+    n = args.concurrency
+    print(f"{n} concurrent identical calls, {args.latency * 1000:.0f}ms latency")
+    print(f"{'callers':<16} {'collapse':<9} {'executed':>8} {'wall':>9}")
+
+    with MockPapersWithCode(latency=args.latency) as server:
+        for collapse in (False, True):
+            flight = SingleFlight() if collapse else None
+            papers_module.client = HttpClient(server.base_url, single_flight=flight)
+            async_client = AsyncHttpClient(server.base_url, single_flight=flight)
+
+            async def search_all() -> None:
+                await asyncio.gather(
+                    *(
+                        async_client.get_content("/authors", {"q": "Yann LeCun"})
+                        for _ in range(n)
+                    )
+                )
+
+            for callers, run in (
+                (
+                    "API threads",
+                    lambda: run_threads(
+                        lambda: papers_module.search_author("Yann LeCun"), n
+                    ),
+                ),
+                ("API tasks", lambda: async_client.run(search_all())),
+            ):
+                requests = server.requests
+                start = time.perf_counter()
+                run()
+                duration = time.perf_counter() - start
+                print(
+                    f"{callers:<16} {str(collapse):<9} "
+                    f"{server.requests - requests:>8} {duration * 1000:>7.0f}ms"
+                )
+
+    cache = select_module.query_cache
+    # Imports pandas and opens the connection before timing.
+    select_module.select_from_db("SELECT 1")
+    for collapse in (False, True):
+        cache.clear()
+        misses = cache.stats.misses
+        start = time.perf_counter()
+        if collapse:
+            run_threads(lambda: select_module.select_from_db(QUERY), n)
+        else:
+            # What select_from_db ran before the single-flight group.
+            run_threads(lambda: select_module._run_query(QUERY), n)
+        duration = time.perf_counter() - start
+        print(
+            f"{'SQL threads':<16} {str(collapse):<9} "
+            f"{cache.stats.misses - misses:>8} {duration * 1000:>7.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
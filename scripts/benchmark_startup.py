@@ -0,0 +1,107 @@
+"""Benchmarks the startup time of the `main.py` of each framework.
+
+Each measurement runs in a fresh interpreter with `-X importtime`, and reports:
+
+- the time to import `technology_scout.main`, i.e. until the CLI can start;
+- the time to import the tools and create the agent (`build_agent`), which
+  the LangGraph CLI does in the background while the first question is typed;
+- the heaviest packages imported on the way.
+
+Usage:
+    python scripts/benchmark_startup.py --framework langgraph --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmark_utils import FRAMEWORKS, ROOT_DIR
+
+STAGES = {
+    "import main": "import technology_scout.main",
+    "build agent": (
+        "import technology_scout.main as main; "
+        "main.build_agent() if hasattr(main, 'build_agent') else None"
+    ),
+}
+
+
+def import_times(framework: str, code: str) -> tuple[float, list[tuple[int, int, str]]]:
+    """Runs `code` with `-X importtime`.
+
+    Returns:
+        tuple: The wall-clock time of the process in ms, and its imports as
+            (self us, cumulative us, module) rows.
+    """
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT_DIR / framework / "src"),
+        # Clients are created but never called.
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-benchmark"),
+    }
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    return wall_ms, rows
+
+
+def total_ms(rows: list[tuple[int, int, str]]) -> float:
+    """Returns the total import time, in ms."""
+    return sum(self_us for self_us, _, _ in rows) / 1000
+
+
+def heaviest_packages(
+    rows: list[tuple[int, int, str]], top: int
+) -> list[tuple[str, float]]:
+    """Returns the packages with the largest self import time, in ms."""
+    per_package = defaultdict(int)
+    for self_us, _, module in rows:
+        per_package[module.split(".")[0]] += self_us
+    ranked = sorted(per_package.items(), key=lambda item: -item[1])
+    return [(package, us / 1000) for package, us in ranked[:top]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--framework", choices=FRAMEWORKS, action="append")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    for framework in args.framework or FRAMEWORKS:
+        print(f"\n{framework}")
+        for stage, code in STAGES.items():
+            # The first run warms up the file system cache and the bytecode.
+            import_times(framework, code)
+            runs = [import_times(framework, code) for _ in range(args.runs)]
+            wall = statistics.median(wall_ms for wall_ms, _ in runs)
+            imports = statistics.median(total_ms(rows) for _, rows in runs)
+            packages = ", ".join(
+                f"{package} {ms:.0f}ms"
+                for package, ms in heaviest_packages(runs[-1][1], args.top)
+            )
+            print(
+                f"  {stage:<12} {wall:>6.0f} ms wall, {imports:>6.0f} ms imports"
+                f"   ({packages})"
+            )
+
+
+if __name__ == "__main__":
+    main()
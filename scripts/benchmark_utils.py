@@ -0,0 +1,47 @@
+"""Helpers shared by the benchmark scripts."""
+
+import statistics
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+FRAMEWORKS = ["langgraph", "llama-index", "smolagents"]
+
+
+def use_framework(framework: str) -> None:
+    """Makes the `technology_scout` package of a framework importable."""
+    if framework not in FRAMEWORKS:
+        raise ValueError(
+            f"Unknown framework {framework!r}, expected one of {FRAMEWORKS}"
+        )
+
+    sys.path.insert(0, str(ROOT_DIR / framework / "src"))
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Returns the p50/p95/p99 of a list of samples."""
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "p50": statistics.median(ordered),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+    }
+
+
+def get_token_counter():
+    """Returns a function counting the tokens of a text.
+
+    Uses the tokenizer of gpt-4o when `tiktoken` and its encoding files are
+    available, and falls back to an estimate of 4 characters per token.
+    """
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        return lambda text: -(-len(text) // 4)
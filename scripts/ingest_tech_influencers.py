@@ -0,0 +1,400 @@
+"""Incremental ingestion of the scraped AI personalities into `ai_watch.db`.
+
+Reads the JSON written by `scrap_tech_influencers.py` (the `TechInfluencers`
+object, or a bare list of influencers as in `data/tech_influencers.json`) as a
+stream, and upserts the influencers keyed by `twitter_username`:
+
+- only new or changed influencers are written, in batched transactions;
+- links are normalized into the `influencer_links` table, while the `links`
+  column of `influencers`, which the tools search, is kept in sync;
+- every insert and update is recorded in `influencer_history`.
+
+Run it from the repository root:
+
+    python scripts/ingest_tech_influencers.py data/tech_influencers.json
+
+On a new database, then apply the schema migrations the tools check for, from
+the directory of one of the frameworks:
+
+    python -m technology_scout.tools.migrations ../data/ai_watch.db
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_DATABASE = ROOT_DIR / "data" / "ai_watch.db"
+DEFAULT_BATCH_SIZE = 1000
+LINKS_SEPARATOR = ", "
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS influencers (
+    rank                INTEGER PRIMARY KEY,
+    name                TEXT,
+    bio                 TEXT,
+    twitter_username    TEXT,
+    nb_twitter_followers INTEGER,
+    type                TEXT,
+    gender              TEXT,
+    links               TEXT
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_influencers_twitter_username
+    ON influencers (twitter_username);
+
+CREATE TABLE IF NOT EXISTS influencer_links (
+    twitter_username TEXT NOT NULL
+        REFERENCES influencers (twitter_username) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (twitter_username, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS influencer_history (
+    id INTEGER PRIMARY KEY,
+    twitter_username TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    change TEXT NOT NULL,
+    previous TEXT,
+    current TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_influencer_history_twitter_username
+    ON influencer_history (twitter_username);
+"""
+
+# Ranks are unique: an influencer moving to a rank still held by another one
+# first parks its own rank at `-rank`, then the stale holder is moved past both
+# the last rank and the highest scraped one, so that it is never moved twice,
+# before the upsert gives every influencer of the batch its new rank.
+_PARK_RANK = (
+    "UPDATE influencers SET rank = -rank WHERE twitter_username = ? AND rank != ?"
+)
+_EVICT_RANK = """
+UPDATE influencers SET rank = MAX((SELECT MAX(rank) FROM influencers), ?) + 1
+WHERE rank = ? AND twitter_username IS NOT ?
+"""
+_UPSERT = """
+INSERT INTO influencers
+    (rank, name, bio, twitter_username, nb_twitter_followers, type, gender, links)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (twitter_username) DO UPDATE SET
+    rank = excluded.rank,
+    name = excluded.name,
+    bio = excluded.bio,
+    nb_twitter_followers = excluded.nb_twitter_followers,
+    type = excluded.type,
+    gender = excluded.gender,
+    links = excluded.links
+"""
+
+
+class Influencer(NamedTuple):
+    """An influencer, as compared and stored by the ingestion."""
+
+    rank: int
+    name: str
+    bio: str
+    twitter_username: str
+    nb_twitter_followers: int
+    type: str | None
+    gender: str | None
+    links: tuple[str, ...]
+
+    def to_row(self) -> tuple:
+        """Returns the row of the `influencers` table."""
+        return (*self[:-1], LINKS_SEPARATOR.join(self.links))
+
+
+@dataclass
+class IngestionStats:
+    """Counts of an ingestion run."""
+
+    read: int = 0
+    skipped: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+
+
+def iter_json_array(file: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yields the items of the first JSON array of a file, one at a time.
+
+    Only the item being decoded is held in memory, so files of any size can be
+    read. The array can be the document itself or the value of its first key,
+    as in `{"tech_influencers": [...]}`.
+    """
+    decoder = json.JSONDecoder()
+    separators = re.compile(r"[\s,]*")
+    delimiter = re.compile(r"\s*[,\]]")
+
+    buffer = ""
+    while "[" not in buffer:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        buffer += chunk
+    buffer = buffer[buffer.index("[") + 1 :]
+    position = 0
+
+    while True:
+        position = separators.match(buffer, position).end()
+        if buffer.startswith("]", position):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            end = None
+        # An item cut by the end of the buffer is complete only once the
+        # delimiter following it has been read.
+        if end is None or not delimiter.match(buffer, end):
+            chunk = file.read(chunk_size)
+            if not chunk:
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item
+        position = end
+
+
+def normalize_username(username: str | None) -> str | None:
+    """Returns the username as `@handle`, or None if it is empty."""
+    handle = (username or "").strip().lstrip("@")
+    return f"@{handle}" if handle else None
+
+
+def to_influencer(item: dict[str, Any], position: int) -> Influencer | None:
+    """Converts a scraped item, None if it has no twitter username.
+
+    The rank defaults to the position of the item in the scraped list.
+    """
+    twitter_username = normalize_username(item.get("twitter_username"))
+    if twitter_username is None:
+        return None
+
+    links = (link.strip() for link in item.get("links") or [] if link)
+    return Influencer(
+        rank=item.get("rank") or position,
+        name=item["name"],
+        bio=item.get("bio") or "",
+        twitter_username=twitter_username,
+        nb_twitter_followers=item.get("nb_twitter_followers"),
+        type=item.get("type"),
+        gender=item.get("gender"),
+        links=tuple(dict.fromkeys(link for link in links if link)),
+    )
+
+
+def ensure_schema(con: sqlite3.Connection) -> None:
+    """Creates the missing tables, and fills the links table on first use."""
+    con.executescript(SCHEMA)
+    if con.execute("SELECT 1 FROM influencer_links LIMIT 1").fetchone():
+        return
+
+    rows = con.execute(
+        "SELECT twitter_username, links FROM influencers "
+        "WHERE twitter_username IS NOT NULL AND links != ''"
+    )
+    with con:
+        con.executemany(
+            "INSERT INTO influencer_links VALUES (?, ?, ?)",
+            (
+                (username, position, url)
+                for username, links in rows.fetchall()
+                for position, url in enumerate(links.split(LINKS_SEPARATOR))
+            ),
+        )
+
+
+def load_influencers(con: sqlite3.Connection) -> dict[str, Influencer]:
+    """Returns the influencers stored in the database, by twitter username."""
+    links = defaultdict(list)
+    for username, url in con.execute(
+        "SELECT twitter_username, url FROM influencer_links "
+        "ORDER BY twitter_username, position"
+    ):
+        links[username].append(url)
+
+    return {
+        row[3]: Influencer(*row, links=tuple(links[row[3]]))
+        for row in con.execute(
+            "SELECT rank, name, bio, twitter_username, nb_twitter_followers, "
+            "type, gender FROM influencers WHERE twitter_username IS NOT NULL"
+        )
+    }
+
+
+def _history_entry(
+    previous: Influencer | None, current: Influencer, changed_at: str
+) -> tuple:
+    if previous is None:
+        return (
+            current.twitter_username,
+            changed_at,
+            "insert",
+            None,
+            json.dumps(current._asdict()),
+        )
+
+    changed = [
+        field
+        for field in Influencer._fields
+        if getattr(previous, field) != getattr(current, field)
+    ]
+    return (
+        current.twitter_username,
+        changed_at,
+        "update",
+        json.dumps({field: getattr(previous, field) for field in changed}),
+        json.dumps({field: getattr(current, field) for field in changed}),
+    )
+
+
+def write_batch(
+    con: sqlite3.Connection,
+    batch: list[Influencer],
+    existing: dict[str, Influencer],
+    changed_at: str,
+    max_rank: int,
+) -> None:
+    """Upserts a batch of new or changed influencers in one transaction."""
+    with con:
+        con.executemany(_PARK_RANK, ((row.twitter_username, row.rank) for row in batch))
+        con.executemany(
+            _EVICT_RANK, ((max_rank, row.rank, row.twitter_username) for row in batch)
+        )
+        con.executemany(_UPSERT, (row.to_row() for row in batch))
+
+        relinked = [
+            row
+            for row in batch
+            if row.twitter_username not in existing
+            or existing[row.twitter_username].links != row.links
+        ]
+        con.executemany(
+            "DELETE FROM influencer_links WHERE twitter_username = ?",
+            ((row.twitter_username,) for row in relinked),
+        )
+        con.executemany(
+            "INSERT INTO influencer_links VALUES (?, ?, ?)",
+            (
+                (row.twitter_username, position, url)
+                for row in relinked
+                for position, url in enumerate(row.links)
+            ),
+        )
+
+        con.executemany(
+            "INSERT INTO influencer_history "
+            "(twitter_username, changed_at, change, previous, current) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                _history_entry(existing.get(row.twitter_username), row, changed_at)
+                for row in batch
+            ),
+        )
+
+
+def _batched(rows: Iterable[Influencer], size: int) -> Iterator[list[Influencer]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(
+    source: Path,
+    path_to_database: Path = DEFAULT_DATABASE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> IngestionStats:
+    """Upserts the influencers of a scraped JSON file into the database.
+
+    Args:
+        source (Path): The JSON file written by the scraper.
+        path_to_database (Path): The SQLite database to update.
+        batch_size (int): The number of influencers written per transaction.
+
+    Returns:
+        IngestionStats: The counts of the run.
+
+    Raises:
+        ValueError: If two influencers of the file have the same rank.
+    """
+    start = time.perf_counter()
+    stats = IngestionStats()
+
+    # Later occurrences of a username win, as they would with one upsert each.
+    scraped: dict[str, Influencer] = {}
+    with open(source, encoding="utf-8") as file:
+        for position, item in enumerate(iter_json_array(file), start=1):
+            stats.read += 1
+            influencer = to_influencer(item, position)
+            if influencer is None:
+                stats.skipped += 1
+            else:
+                scraped[influencer.twitter_username] = influencer
+
+    holders: dict[int, str] = {}
+    for influencer in scraped.values():
+        holder = holders.setdefault(influencer.rank, influencer.twitter_username)
+        if holder != influencer.twitter_username:
+            raise ValueError(
+                f"{holder} and {influencer.twitter_username} have the same rank "
+                f"{influencer.rank} in {source}"
+            )
+
+    con = sqlite3.connect(path_to_database)
+    try:
+        con.execute("PRAGMA foreign_keys = ON")
+        ensure_schema(con)
+        existing = load_influencers(con)
+
+        changed = [
+            row for row in scraped.values() if existing.get(row.twitter_username) != row
+        ]
+        stats.unchanged = len(scraped) - len(changed)
+        stats.inserted = sum(row.twitter_username not in existing for row in changed)
+        stats.updated = len(changed) - stats.inserted
+
+        changed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        for batch in _batched(changed, batch_size):
+            write_batch(con, batch, existing, changed_at, max(holders, default=0))
+    finally:
+        con.close()
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", type=Path, help="JSON file written by the scraper")
+    parser.add_argument("--database", type=Path, default=DEFAULT_DATABASE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    stats = ingest(args.source, args.database, args.batch_size)
+    print(
+        f"Read {stats.read} influencers in {stats.seconds:.2f}s: "
+        f"{stats.inserted} inserted, {stats.updated} updated, "
+        f"{stats.unchanged} unchanged, {stats.skipped} skipped (no twitter username)"
+    )
+
+
+if __name__ == "__main__":
+    main()
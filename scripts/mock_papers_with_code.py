@@ -0,0 +1,467 @@
+"""Local stand-in for the Papers with Code API.
+
+Serves `/api/v1/authors?q=`, `/api/v1/authors/{id}/papers`, `/api/v1/papers?q=`
+and `/api/v1/papers/{id}`, the lists paginated with
+`page` and `items_per_page`, and linked with `next` and `previous`, so that
+the clients can be run and measured offline. The authors are Yann LeCun, with
+the papers of `data/yann_lecuns_paper_response.json`, and optionally
+thousands of synthetic authors, whose papers are generated on first request
+from a seed, so that every run serves the same data.
+
+Faults can be injected to load test the clients:
+
+- a latency drawn from a distribution, e.g. `0.05`, `uniform:0.01,0.1`,
+  `normal:0.05,0.02`, `exponential:0.05` or `lognormal:0.05,0.5` (median and
+  sigma),
+- a share of the requests answered with a given status, e.g. 429s or 503s,
+  with an optional `Retry-After` header,
+- a rate limit, above which requests get a 429 with the `Retry-After` of the
+  next free slot.
+
+The responses carry an `ETag`, and requests sending it back in
+`If-None-Match` get a `304`.
+
+Point the tools at the server with the `TECHNOLOGY_SCOUT_PAPERS_WITH_CODE_URL`
+environment variable.
+
+Usage:
+    python scripts/mock_papers_with_code.py --port 8000 --authors 5000 \\
+        --latency lognormal:0.05,0.5 --error 429=0.05 --error 503=0.01 \\
+        --rate-limit 20
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from benchmark_utils import ROOT_DIR
+
+FIXTURE_PATH = ROOT_DIR / "data" / "yann_lecuns_paper_response.json"
+API_PREFIX = "/api/v1"
+
+_PAPERS_PATH = re.compile(rf"^{API_PREFIX}/authors/([^/]+)/papers/?$")
+_PAPER_PATH = re.compile(rf"^{API_PREFIX}/papers/([^/]+)/?$")
+
+FIRST_NAMES = [
+    "Ada", "Alan", "Alex", "Amir", "Ana", "Chen", "Claire", "David", "Elena",
+    "Fatima", "Hiroshi", "Ines", "Jun", "Kai", "Lena", "Li", "Maria", "Mei",
+    "Nadia", "Noah", "Omar", "Priya", "Rafael", "Sara", "Tomas", "Wei", "Yuki",
+    "Zoe",
+]  # fmt: skip
+LAST_NAMES = [
+    "Bengio", "Chen", "Dubois", "Garcia", "Hinton", "Ivanova", "Kim", "Kumar",
+    "Larsen", "Martin", "Meier", "Nakamura", "Novak", "Okafor", "Petrov",
+    "Rossi", "Schmidt", "Silva", "Singh", "Tanaka", "Wang", "Weber", "Zhang",
+]  # fmt: skip
+METHODS = [
+    "Self-Supervised", "Contrastive", "Sparse", "Diffusion", "Energy-Based",
+    "Graph", "Recurrent", "Equivariant", "Latent", "Hierarchical",
+]  # fmt: skip
+TOPICS = [
+    "World Models", "Video Prediction", "Planning", "Representation Learning",
+    "Object Detection", "Language Modeling", "Reinforcement Learning",
+    "Image Segmentation", "Speech Recognition", "Protein Folding",
+]  # fmt: skip
+
+LatencySampler = Callable[[random.Random], float]
+
+
+def parse_latency(spec: float | str) -> LatencySampler:
+    """Returns a function drawing the latencies of a distribution, in seconds.
+
+    Args:
+        spec (float | str): A constant, e.g. `0.05`, or a distribution and its
+            parameters, e.g. `uniform:0.01,0.1`, `normal:0.05,0.02` (mean and
+            standard deviation), `exponential:0.05` (mean) or
+            `lognormal:0.05,0.5` (median and sigma).
+    """
+    name, _, parameters = str(spec).partition(":")
+    if not parameters:
+        latency = float(name)
+        return lambda rng: latency
+
+    values = [float(value) for value in parameters.split(",")]
+    samplers: dict[str, LatencySampler] = {
+        "uniform": lambda rng: rng.uniform(*values),
+        "normal": lambda rng: max(0.0, rng.gauss(*values)),
+        "exponential": lambda rng: rng.expovariate(1 / values[0]),
+        "lognormal": lambda rng: rng.lognormvariate(math.log(values[0]), values[1]),
+    }
+    if name not in samplers:
+        raise ValueError(
+            f"Unknown latency distribution {name!r}, expected one of {list(samplers)}"
+        )
+    return samplers[name]
+
+
+def load_fixture_papers() -> list[dict]:
+    """Returns the papers of Yann LeCun."""
+    with open(FIXTURE_PATH) as file:
+        fixture = json.load(file)
+
+    # The fixture holds the first page of the papers only, the other ones are
+    # renamed copies of it.
+    first_page = fixture["results"]
+    papers = []
+    for index in range(fixture["count"]):
+        paper = first_page[index % len(first_page)]
+        if index >= len(first_page):
+            paper = {**paper, "id": f"{paper['id']}-{index // len(first_page)}"}
+        papers.append(paper)
+    return papers
+
+
+def make_authors(n_synthetic: int, seed: int = 0) -> dict[str, dict]:
+    """Returns the authors served, by id: Yann LeCun, then synthetic ones.
+
+    The synthetic authors have a number of papers drawn from a long-tailed
+    distribution, as most authors have a few papers and some have hundreds.
+    """
+    rng = random.Random(seed)
+    authors = {"yann-lecun": {"id": "yann-lecun", "full_name": "Yann LeCun"}}
+    for _ in range(n_synthetic):
+        full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        author_id = base_id = full_name.lower().replace(" ", "-")
+        suffix = 1
+        while author_id in authors:
+            author_id = f"{base_id}-{suffix}"
+            suffix += 1
+        authors[author_id] = {
+            "id": author_id,
+            "full_name": full_name,
+            "n_papers": min(500, max(1, int(rng.lognormvariate(2.5, 1.0)))),
+        }
+    return authors
+
+
+@functools.lru_cache(maxsize=1024)
+def make_papers(author_id: str, full_name: str, n_papers: int, seed: int) -> list:
+    """Returns the synthetic papers of an author, most recent first."""
+    rng = random.Random(f"{seed}-{author_id}")
+    papers = []
+    for index in range(n_papers):
+        title = f"{rng.choice(METHODS)} {rng.choice(TOPICS)} at Scale {index}"
+        published = date(2012, 1, 1) + timedelta(days=rng.randrange(14 * 365))
+        arxiv_id = f"{published:%y%m}.{rng.randrange(100000):05d}"
+        coauthors = [
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            for _ in range(rng.randint(1, 8))
+        ]
+        papers.append(
+            {
+                "id": f"{author_id}-{title.lower().replace(' ', '-')}",
+                "arxiv_id": arxiv_id,
+                "nips_id": None,
+                "url_abs": f"https://arxiv.org/abs/{arxiv_id}v1",
+                "url_pdf": f"https://arxiv.org/pdf/{arxiv_id}v1.pdf",
+                "title": title,
+                "abstract": " ".join(
+                    f"We study {title.lower()} and report results on benchmark {i}."
+                    for i in range(rng.randint(5, 20))
+                ),
+                "authors": [full_name, *coauthors],
+                "published": published.isoformat(),
+                "conference": None,
+                "conference_url_abs": None,
+                "conference_url_pdf": None,
+                "proceeding": None,
+            }
+        )
+    papers.sort(key=lambda paper: paper["published"], reverse=True)
+    return papers
+
+
+class MockPapersWithCode(ThreadingHTTPServer):
+    """A threaded HTTP/1.1 server answering like the Papers with Code API.
+
+    Args:
+        port (int): The port to listen on, 0 to pick a free one.
+        latency (float | str): Seconds each response is delayed by, or their
+            distribution, see `parse_latency`.
+        error_rate (float): Share of the requests answered with a 503.
+        retry_after (int | None): The `Retry-After` of the injected errors,
+            in seconds.
+        errors (dict[int, float] | None): Share of the requests answered with
+            each status, e.g. `{429: 0.05, 500: 0.01}`, on top of `error_rate`.
+        rate_limit (float | None): Requests per second served at most; the
+            other ones get a 429.
+        burst (int | None): Requests served at once above the rate limit,
+            the rate limit by default.
+        n_authors (int): Synthetic authors served next to Yann LeCun.
+        seed (int): Seed of the synthetic authors, latencies and errors.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float | str = 0.0,
+        error_rate: float = 0.0,
+        retry_after: int | None = None,
+        errors: dict[int, float] | None = None,
+        rate_limit: float | None = None,
+        burst: int | None = None,
+        n_authors: int = 0,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = parse_latency(latency)
+        self.error_rates = {503: error_rate, **(errors or {})}
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.burst = burst or max(1, math.ceil(rate_limit or 1))
+        self.seed = seed
+        self.authors = make_authors(n_authors, seed)
+        self.fixture_papers = load_fixture_papers()
+        # The papers served so far, by id: the synthetic papers only exist
+        # once the papers of their author were generated.
+        self.papers_by_id = {paper["id"]: paper for paper in self.fixture_papers}
+
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+
+    @property
+    def base_url(self) -> str:
+        """The URL to use as the clients' `BASE_URL`."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "MockPapersWithCode":
+        """Serves in a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "MockPapersWithCode":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def papers(self, author_id: str) -> list[dict] | None:
+        """Returns the papers of an author, or None for an unknown author."""
+        author = self.authors.get(author_id)
+        if author is None:
+            return None
+        if author_id == "yann-lecun":
+            return self.fixture_papers
+        papers = make_papers(
+            author_id, author["full_name"], author["n_papers"], self.seed
+        )
+        with self._lock:
+            self.papers_by_id.update((paper["id"], paper) for paper in papers)
+        return papers
+
+    def admit(self) -> tuple[float, int | None, float | None]:
+        """Counts a request, and draws how it is answered.
+
+        Returns:
+            tuple[float, int | None, float | None]: The latency of the
+                response, the status of the error to answer with, if any, and
+                the seconds to ask the client to wait before retrying, if any.
+        """
+        with self._lock:
+            self.requests += 1
+            latency = self.latency(self._random)
+
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._refilled_at) * self.rate_limit,
+                )
+                self._refilled_at = now
+                if self._tokens < 1:
+                    self.rate_limited += 1
+                    return 0.0, 429, (1 - self._tokens) / self.rate_limit
+                self._tokens -= 1
+
+            draw = self._random.random()
+            for status, rate in self.error_rates.items():
+                if draw < rate:
+                    self.errors += 1
+                    return latency, status, self.retry_after
+                draw -= rate
+            return latency, None, None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keeps connections alive between requests, as the real API does.
+    protocol_version = "HTTP/1.1"
+    # Otherwise the body waits for the client to acknowledge the headers.
+    disable_nagle_algorithm = True
+    server: MockPapersWithCode
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        latency, error, retry_after = self.server.admit()
+        time.sleep(latency)
+        if error is not None:
+            headers = {}
+            if retry_after is not None:
+                # Retry-After holds whole seconds.
+                headers["Retry-After"] = str(math.ceil(retry_after))
+            self._send(error, {"detail": "Injected error"}, headers)
+            return
+
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path.rstrip("/") == f"{API_PREFIX}/authors":
+            query = params.get("q", "").lower()
+            results = [
+                {"id": author["id"], "full_name": author["full_name"]}
+                for author in self.server.authors.values()
+                if query in author["full_name"].lower()
+            ]
+            self._send(200, self._page(results, params))
+        elif match := _PAPERS_PATH.match(url.path):
+            papers = self.server.papers(match.group(1))
+            if papers is None:
+                self._send(404, {"detail": "Not found."})
+                return
+            self._send(200, self._page(papers, params))
+        elif url.path.rstrip("/") == f"{API_PREFIX}/papers":
+            words = params.get("q", "").lower().split()
+            with self.server._lock:
+                papers = list(self.server.papers_by_id.values())
+            results = [
+                paper
+                for paper in papers
+                if all(
+                    word in f"{paper['title']} {paper['abstract']}".lower()
+                    for word in words
+                )
+            ]
+            self._send(200, self._page(results, params))
+        elif match := _PAPER_PATH.match(url.path):
+            with self.server._lock:
+                paper = self.server.papers_by_id.get(match.group(1))
+            if paper is None:
+                self._send(404, {"detail": "Not found."})
+                return
+            self._send(200, paper)
+        else:
+            self._send(404, {"detail": "Not found."})
+
+    def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+        payload = json.dumps(body).encode()
+        headers = dict(headers or {})
+        if status == 200:
+            etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                with self.server._lock:
+                    self.server.not_modified += 1
+                status, payload = 304, b""
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _page(self, results: list, params: dict[str, str]) -> dict:
+        """Returns a page of results, with the links to its neighbours."""
+        page = int(params.get("page", 1))
+        items_per_page = int(params.get("items_per_page", 50))
+        url = f"http://{self.headers['Host']}{urlparse(self.path).path}"
+
+        def link(to_page: int) -> str | None:
+            if not 1 <= to_page <= math.ceil(len(results) / items_per_page):
+                return None
+            return f"{url}?{urlencode({**params, 'page': to_page})}"
+
+        start = (page - 1) * items_per_page
+        return {
+            "count": len(results),
+            "next": link(page + 1),
+            "previous": link(page - 1),
+            "results": results[start : start + items_per_page],
+        }
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def parse_error(value: str) -> tuple[int, float]:
+    """Parses a `STATUS=RATE` command line argument."""
+    status, _, rate = value.partition("=")
+    return int(status), float(rate)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", default="0", help="e.g. lognormal:0.05,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--error",
+        type=parse_error,
+        action="append",
+        default=[],
+        metavar="STATUS=RATE",
+        help="Share of the requests answered with a status, e.g. 429=0.05.",
+    )
+    parser.add_argument("--retry-after", type=int)
+    parser.add_argument("--rate-limit", type=float, help="Requests per second.")
+    parser.add_argument("--burst", type=int)
+    parser.add_argument("--authors", type=int, default=0, help="Synthetic authors.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockPapersWithCode(
+        args.port,
+        args.latency,
+        args.error_rate,
+        args.retry_after,
+        errors=dict(args.error),
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        n_authors=args.authors,
+        seed=args.seed,
+    )
+    print(f"Serving {len(server.authors)} authors on {server.base_url}")
+    print(f"export TECHNOLOGY_SCOUT_PAPERS_WITH_CODE_URL={server.base_url}")
+    # The tools leave the cache and the store of the real API alone when
+    # querying the stand-in; these keep them disabled explicitly.
+    print("export TECHNOLOGY_SCOUT_HTTP_CACHE_PATH=")
+    print("export TECHNOLOGY_SCOUT_PAPER_STORE_PATH=")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Tests for the incremental ingestion of the scraped influencers."""
+
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from ingest_tech_influencers import DEFAULT_DATABASE, ROOT_DIR, ingest
+
+SOURCE = ROOT_DIR / "data" / "tech_influencers.json"
+
+
+@pytest.fixture
+def database(tmp_path):
+    """A migrated copy of the database, into which the scraped file was ingested."""
+    path = tmp_path / "ai_watch.db"
+    shutil.copy(DEFAULT_DATABASE, path)
+    migrate(path)
+    ingest(SOURCE, path)
+    return path
+
+
+@pytest.fixture
+def scrape() -> list[dict]:
+    """The influencers of the scraped file."""
+    return json.loads(SOURCE.read_text())
+
+
+def write_scrape(tmp_path, scrape: list[dict]):
+    """Writes a scrape as the scraper does, and returns its path."""
+    path = tmp_path / "scrape.json"
+    path.write_text(json.dumps({"tech_influencers": scrape}))
+    return path
+
+
+def query(path, sql: str, params: tuple = ()) -> list[tuple]:
+    """Returns the rows of a query on the database."""
+    with sqlite3.connect(path) as con:
+        return con.execute(sql, params).fetchall()
+
+
+def ranks(path) -> dict[str, int]:
+    """Returns the ranks of the influencers, by twitter username."""
+    return dict(query(path, "SELECT twitter_username, rank FROM influencers"))
+
+
+def migrate(path) -> None:
+    """Applies the schema migrations of the tools, as documented."""
+    subprocess.run(
+        [sys.executable, "-m", "technology_scout.tools.migrations", str(path)],
+        cwd=ROOT_DIR / "llama-index",
+        env={**os.environ, "PYTHONPATH": "src"},
+        check=True,
+        capture_output=True,
+    )
+
+
+def history(path) -> list[tuple]:
+    """Returns the history rows, oldest first."""
+    return query(
+        path,
+        "SELECT twitter_username, change, previous, current FROM influencer_history "
+        "ORDER BY id",
+    )
+
+
+class TestIngest:
+    def test_new_database(self, tmp_path, scrape) -> None:
+        """Tests that a new database can be filled, then migrated."""
+        path = tmp_path / "new.db"
+
+        stats = ingest(SOURCE, path)
+        migrate(path)
+
+        assert stats.inserted == len(scrape)
+        assert ranks(path) == {
+            item["twitter_username"]: item["rank"] for item in scrape
+        }
+        assert query(path, "PRAGMA user_version") == [(1,)]
+        with sqlite3.connect(path) as con:
+            con.execute(
+                "INSERT INTO influencers_fts (influencers_fts) "
+                "VALUES ('integrity-check')"
+            )
+        assert (
+            query(
+                path,
+                "SELECT count(*) FROM influencers_fts WHERE influencers_fts MATCH ?",
+                (scrape[0]["name"].split()[0],),
+            )[0][0]
+            >= 1
+        )
+
+    def test_rerun_is_idempotent(self, tmp_path, database) -> None:
+        """Tests that ingesting the same file again writes nothing."""
+        dump = "SELECT * FROM influencers ORDER BY rank"
+        before = query(database, dump), history(database)
+
+        stats = ingest(SOURCE, database)
+
+        assert (stats.inserted, stats.updated) == (0, 0)
+        assert stats.unchanged == stats.read - stats.skipped
+        assert (query(database, dump), history(database)) == before
+
+    def test_swap_ranks(self, tmp_path, database, scrape) -> None:
+        """Tests that two influencers can exchange their ranks."""
+        first, second = scrape[0], scrape[1]
+        first["rank"], second["rank"] = second["rank"], first["rank"]
+        n_history = len(history(database))
+
+        stats = ingest(write_scrape(tmp_path, scrape), database)
+
+        assert (stats.inserted, stats.updated) == (0, 2)
+        assert ranks(database)[first["twitter_username"]] == first["rank"]
+        assert ranks(database)[second["twitter_username"]] == second["rank"]
+        changes = history(database)[n_history:]
+        assert [(username, change) for username, change, *_ in changes] == [
+            (first["twitter_username"], "update"),
+            (second["twitter_username"], "update"),
+        ]
+        assert json.loads(changes[0][3]) == {"rank": first["rank"]}
+
+    def test_new_influencer_takes_occupied_rank(
+        self, tmp_path, database, scrape
+    ) -> None:
+        """Tests that the holder of a rank taken by a new influencer is moved away."""
+        holder = scrape.pop(0)
+        newcomer = {
+            **holder,
+            "name": "Ada Lovelace",
+            "twitter_username": "@ada",
+            "links": ["https://example.com/ada"],
+        }
+        scrape.insert(0, newcomer)
+
+        stats = ingest(write_scrape(tmp_path, scrape), database)
+
+        assert (stats.inserted, stats.updated) == (1, 0)
+        stored = ranks(database)
+        assert stored["@ada"] == holder["rank"]
+        assert stored[holder["twitter_username"]] > max(item["rank"] for item in scrape)
+        assert len(set(stored.values())) == len(stored)
+
+    def test_links_are_replaced(self, tmp_path, database, scrape) -> None:
+        """Tests that new links replace the old ones, without duplicates."""
+        username = scrape[0]["twitter_username"]
+        scrape[0]["links"] = [
+            "https://example.com/a",
+            " https://example.com/b ",
+            "https://example.com/a",
+        ]
+
+        ingest(write_scrape(tmp_path, scrape), database)
+
+        assert query(
+            database,
+            "SELECT position, url FROM influencer_links WHERE twitter_username = ? "
+            "ORDER BY position",
+            (username,),
+        ) == [(0, "https://example.com/a"), (1, "https://example.com/b")]
+        assert query(
+            database,
+            "SELECT links FROM influencers WHERE twitter_username = ?",
+            (username,),
+        ) == [("https://example.com/a, https://example.com/b",)]
+
+    def test_full_text_index_stays_in_sync(self, tmp_path, database, scrape) -> None:
+        """Tests that the full-text index passes its integrity check after upserts."""
+        scrape[0]["rank"], scrape[1]["rank"] = scrape[1]["rank"], scrape[0]["rank"]
+        scrape[2]["bio"] = "Poetical science"
+        scrape.append(
+            {**scrape[3], "twitter_username": "@ada", "rank": len(scrape) + 1}
+        )
+
+        ingest(write_scrape(tmp_path, scrape), database)
+
+        with sqlite3.connect(database) as con:
+            con.execute(
+                "INSERT INTO influencers_fts (influencers_fts) "
+                "VALUES ('integrity-check')"
+            )
+        assert query(
+            database,
+            "SELECT i.twitter_username FROM influencers_fts "
+            "JOIN influencers AS i ON i.rank = influencers_fts.rowid "
+            "WHERE influencers_fts MATCH 'poetical'",
+        ) == [(scrape[2]["twitter_username"],)]
@@ -1,22 +1,20 @@
 """SmolAgents Technology Scout Agent."""
 
-import litellm
 from smolagents import CodeAgent, LiteLLMModel, Tool
 
 from technology_scout.observer import setup_langfuse_tracer
 
 
-setup_langfuse_tracer()
-
 # DEFAULT_MODEL_ID = "gemini/gemini-2.5-flash-preview-04-17"
 DEFAULT_MODEL_ID = "openai/gpt-4o"
 
 
-litellm._turn_on_debug()
-
-
 def get_model(model_id: str = DEFAULT_MODEL_ID) -> LiteLLMModel:
     """Get a model."""
+    # litellm takes seconds to import, so it is only imported with the model.
+    import litellm
+
+    litellm._turn_on_debug()
 
     return LiteLLMModel(
         model_id=model_id,
@@ -24,13 +22,16 @@ def get_model(model_id: str = DEFAULT_MODEL_ID) -> LiteLLMModel:
 
 
 def create_agent(
-    model: LiteLLMModel = get_model(),
+    model: LiteLLMModel | None = None,
     tools: list[Tool] | None = None,
 ) -> CodeAgent:
     """Create a technology scout agent."""
 
     setup_langfuse_tracer()
 
+    if model is None:
+        model = get_model()
+
     if tools is None:
         tools = []
 
@@ -1,17 +1,37 @@
 """Main module."""
 
-from smolagents import GradioUI
+from typing import TYPE_CHECKING
 
-from technology_scout.agent import create_agent
-from technology_scout.tools.select_from_db import select_from_db_tool
+if TYPE_CHECKING:
+    from smolagents import CodeAgent
+
+
+def build_agent() -> "CodeAgent":
+    """Imports the tools and creates the agent."""
+    from technology_scout.agent import create_agent
+    from technology_scout.tools.search_influencers import search_influencers_tool
+    from technology_scout.tools.select_from_db import (
+        fetch_next_page_tool,
+        select_from_db_paged_tool,
+        select_from_db_tool,
+    )
+
+    return create_agent(
+        tools=[
+            select_from_db_tool,
+            select_from_db_paged_tool,
+            fetch_next_page_tool,
+            search_influencers_tool,
+        ],
+    )
 
 
 def main() -> None:
     """Main function."""
+    # Gradio is only needed once the agent runs.
+    from smolagents import GradioUI
 
-    agent = create_agent(
-        tools=[select_from_db_tool],
-    )
+    agent = build_agent()
 
     ui = GradioUI(agent)
     ui.launch()
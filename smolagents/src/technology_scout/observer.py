@@ -1,45 +1,60 @@
 import os
 import base64
-
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from openinference.instrumentation.smolagents import SmolagentsInstrumentor
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+import threading
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
-LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
-LANGFUSE_AUTH = base64.b64encode(
-    f"{LANGFUSE_PUBLIC_KEY}:{LANGFUSE_SECRET_KEY}".encode()
-).decode()
 LANGFUSE_HOST = "https://cloud.langfuse.com"
 OTEL_EXPORTER_OTLP_ENDPOINT = "https://cloud.langfuse.com/api/public/otel"
-OTEL_EXPORTER_OTLP_HEADERS = f"Authorization=Basic {LANGFUSE_AUTH}"
 
-os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = OTEL_EXPORTER_OTLP_ENDPOINT
-os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = OTEL_EXPORTER_OTLP_HEADERS
+_trace_provider = None
+_lock = threading.Lock()
 
-# Create a TracerProvider for OpenTelemetry
-trace_provider = TracerProvider()
 
-# Add a SimpleSpanProcessor with the OTLPSpanExporter to send traces
-trace_provider.add_span_processor(SimpleSpanProcessor(OTLPSpanExporter()))
+def setup_langfuse_tracer() -> None:
+    """Setup the Langfuse tracer.
 
-trace.set_tracer_provider(trace_provider)
-tracer = trace.get_tracer(__name__)
+    Sends the traces of the smolagents runs to Langfuse through OpenTelemetry.
+    The exporter and the instrumentation are imported and configured on the
+    first call only, so that importing the agent stays fast; later calls do
+    nothing.
+    """
+    global _trace_provider
 
-# Instrument smolagents with the configured provider
-SmolagentsInstrumentor().instrument(tracer_provider=trace_provider)
+    with _lock:
+        if _trace_provider is not None:
+            return
 
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace import TracerProvider
+        from openinference.instrumentation.smolagents import SmolagentsInstrumentor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 
-def setup_langfuse_tracer() -> None:
-    """Setup the Langfuse tracer.
+        langfuse_public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
+        langfuse_secret_key = os.getenv("LANGFUSE_SECRET_KEY")
+        langfuse_auth = base64.b64encode(
+            f"{langfuse_public_key}:{langfuse_secret_key}".encode()
+        ).decode()
 
-    This function is used to setup the Langfuse tracer.
-    It does nothing.
-    It is a reminder to import the module where the agent is built.
-    """
+        os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = OTEL_EXPORTER_OTLP_ENDPOINT
+        os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = (
+            f"Authorization=Basic {langfuse_auth}"
+        )
+
+        # Create a TracerProvider for OpenTelemetry
+        trace_provider = TracerProvider()
+
+        # Add a SimpleSpanProcessor with the OTLPSpanExporter to send traces
+        trace_provider.add_span_processor(SimpleSpanProcessor(OTLPSpanExporter()))
+
+        trace.set_tracer_provider(trace_provider)
+
+        # Instrument smolagents with the configured provider
+        SmolagentsInstrumentor().instrument(tracer_provider=trace_provider)
+
+        _trace_provider = trace_provider
@@ -0,0 +1,327 @@
+"""Asyncio HTTP client for the JSON APIs queried by the tools.
+
+The async counterpart of `HttpClient`, built on `httpx.AsyncClient`, with the
+same timeouts, the same retries of transient failures and the same optional
+cache and rate limiter. It lets a tool send many requests at once, e.g. to fetch all the pages
+of a paginated list concurrently.
+
+An `httpx.AsyncClient` and its connections belong to the event loop that
+created them, so the client keeps one per event loop. Sync code runs its
+coroutines with `run`, on an event loop kept in a background thread, so that
+its connections are reused across calls too. The coroutines run in the context
+of the caller, e.g. with its request priority.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import random
+import threading
+import weakref
+from collections.abc import AsyncIterator, Coroutine, Iterator
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from technology_scout.tools.http_cache import CachedResponse, HttpCache, make_key
+from technology_scout.tools.rate_limiter import RateLimiter
+from technology_scout.tools.single_flight import SingleFlight
+from technology_scout.tools.http_client import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+    RETRY_STATUSES,
+    ClientStats,
+    parse_retry_after,
+    resolve_url,
+)
+
+# httpx imports its command line interface, and rich with it, so it is only
+# imported when a request is sent.
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncHttpClient:
+    """Sends GET requests to a JSON API from asyncio code.
+
+    Args:
+        base_url (str): The URL the request paths are appended to.
+        connect_timeout (float): Seconds to wait for a connection.
+        read_timeout (float): Seconds to wait for the server to send data.
+        max_retries (int): Retries of a request after a transient failure.
+        backoff_factor (float): Upper bound, in seconds, of the first backoff;
+            it doubles at each retry.
+        max_backoff (float): Longest wait between two attempts, including the
+            delays asked by `Retry-After`.
+        max_connections (int): Connections opened at most per event loop.
+        cache (HttpCache | None): The cache of the responses, if any.
+        single_flight (SingleFlight | None): Collapses the concurrent identical
+            requests into one, if given. Clients of the same API can share it.
+        rate_limiter (RateLimiter | None): Keeps the requests within the
+            budget of their host, if given. Shared by all the clients.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        max_connections: int = DEFAULT_POOL_MAXSIZE,
+        cache: HttpCache | None = None,
+        single_flight: SingleFlight | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_connections = max_connections
+        self.cache = cache
+        self.single_flight = single_flight
+        self.rate_limiter = rate_limiter
+
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, "httpx.AsyncClient"
+        ] = weakref.WeakKeyDictionary()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stats = ClientStats()
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    @property
+    def stats(self) -> ClientStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return ClientStats(
+                requests=self._stats.requests,
+                retries=self._stats.retries,
+                failures=self._stats.failures,
+            )
+
+    async def get_json(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        """Sends a GET request and returns the decoded JSON body.
+
+        See `get_content`.
+        """
+        return json.loads(await self.get_content(path, params))
+
+    async def get_content(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> bytes:
+        """Sends a GET request and returns the raw body.
+
+        The body can be validated straight from its bytes, without decoding it
+        into Python objects first. Concurrent identical requests share one
+        response with a single-flight group. With a cache, fresh responses are
+        returned without any request, and stale ones are revalidated, or
+        refreshed in the background in stale-while-revalidate mode.
+
+        Args:
+            path (str): The path of the endpoint, e.g. `/authors`, or a full
+                URL.
+            params (dict[str, Any] | None): The query string parameters.
+
+        Returns:
+            bytes: The body of the response.
+
+        Raises:
+            httpx.HTTPError: If the request still fails after the retries, or
+                fails with a status that is not retried.
+        """
+        url = resolve_url(self.base_url, path)
+        if self.single_flight is None:
+            return await self._get_content(url, params)
+        # The base URL tells apart the APIs sharing the single-flight group.
+        key = (self.base_url, make_key(url, params))
+        return await self.single_flight.ado(key, lambda: self._get_content(url, params))
+
+    async def _get_content(self, url: str, params: dict[str, Any] | None) -> bytes:
+        """Returns the body of a response, from the cache or the API."""
+        if self.cache is None:
+            return (await self._send(url, params)).content
+
+        key = make_key(url, params)
+        # The cache commits to its SQLite file, which must not block the
+        # event loop.
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            if cached.is_fresh():
+                return cached.body
+            if self.cache.can_serve_stale(cached):
+                self._refresh_in_background(url, params, cached)
+                return cached.body
+        return await self._fetch(url, params, key, cached)
+
+    async def _fetch(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        key: str,
+        cached: CachedResponse | None,
+    ) -> bytes:
+        """Requests a response, revalidating the cached one, and caches it."""
+        headers = cached.conditional_headers() if cached is not None else None
+        response = await self._send(url, params, headers)
+        if response.status_code == 304 and cached is not None:
+            await asyncio.to_thread(self.cache.mark_revalidated, key)
+            return cached.body
+
+        await asyncio.to_thread(
+            self.cache.put,
+            key,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return response.content
+
+    def _refresh_in_background(
+        self, url: str, params: dict[str, Any] | None, cached: CachedResponse
+    ) -> None:
+        """Refreshes a stale cached response, once at a time per key."""
+        import httpx
+
+        with self._lock:
+            if cached.key in self._refreshing:
+                return
+            self._refreshing.add(cached.key)
+
+        async def refresh() -> None:
+            try:
+                await self._fetch(url, params, cached.key, cached)
+            except httpx.HTTPError as error:
+                logger.info("Could not refresh %s: %s", url, error)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cached.key)
+
+        # The event loop only keeps weak references to its tasks.
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _send(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> "httpx.Response":
+        """Sends a GET request, retrying it after transient failures."""
+        import httpx
+
+        client = self._client()
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(url)
+            with self._lock:
+                self._stats.requests += 1
+            retry_after = None
+            try:
+                response = await client.get(url, params=params, headers=headers)
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                # Unlike requests, httpx raises for the 304 of a revalidation.
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as error:
+                retryable = (
+                    not isinstance(error, httpx.HTTPStatusError)
+                    or error.response.status_code in RETRY_STATUSES
+                )
+                if not retryable or attempt == self.max_retries:
+                    with self._lock:
+                        self._stats.failures += 1
+                    raise
+
+                if retry_after is not None and self.rate_limiter is not None:
+                    # The other requests to the host wait too.
+                    await self.rate_limiter.apause(url, retry_after)
+                delay = self._backoff(attempt, retry_after)
+                logger.info("GET %s failed (%r), retrying in %.2fs", url, error, delay)
+                with self._lock:
+                    self._stats.retries += 1
+                await asyncio.sleep(delay)
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Runs a coroutine from sync code and returns its result.
+
+        The coroutine runs on the client's background event loop, which is
+        started on the first call.
+        """
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="async_http_client",
+                    daemon=True,
+                ).start()
+        context = contextvars.copy_context()
+
+        async def run_in_context() -> T:
+            return await asyncio.get_running_loop().create_task(
+                coroutine, context=context
+            )
+
+        return asyncio.run_coroutine_threadsafe(run_in_context(), self._loop).result()
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """Iterates over an async iterator from sync code.
+
+        The items are produced on the client's background event loop, so the
+        iterator keeps running its tasks, e.g. prefetches, between two items.
+        Closing the generator closes the async iterator.
+        """
+
+        async def next_item() -> T:
+            return await anext(iterator)
+
+        try:
+            while True:
+                try:
+                    yield self.run(next_item())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if hasattr(iterator, "aclose"):
+                self.run(iterator.aclose())
+
+    def _client(self) -> "httpx.AsyncClient":
+        """Returns the `httpx.AsyncClient` of the running event loop."""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={"Accept": "application/json"},
+            )
+            self._clients[loop] = client
+        return client
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        """Returns the seconds to wait before the next attempt."""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        # Full jitter: concurrent requests failing together do not retry together.
+        ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, ceiling)
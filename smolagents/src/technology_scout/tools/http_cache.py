@@ -0,0 +1,386 @@
+"""Persistent SQLite cache of the responses of the JSON APIs.
+
+Responses are keyed by their URL and normalized query parameters, and
+stay fresh for the TTL of their endpoint. Once stale, they are revalidated
+with `If-None-Match` / `If-Modified-Since` when the server sent an `ETag` or
+a `Last-Modified` header, so that an unchanged response costs a `304` instead
+of a full download. In stale-while-revalidate mode, a stale response is
+returned at once while the client refreshes it in the background.
+
+The least recently used responses are evicted once the cache grows past its
+size limit. Their access times are only written once per `access_resolution`,
+so that the hits of a response do not each commit to the file. The cache can be inspected and pruned from the command line:
+
+    python -m technology_scout.tools.http_cache stats
+    python -m technology_scout.tools.http_cache list --endpoint papers
+    python -m technology_scout.tools.http_cache prune --expired
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from technology_scout.tools.local_database import LocalDatabase
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_ACCESS_RESOLUTION = 60.0
+DEFAULT_PATH = Path(__file__).parents[4] / "data" / "http_cache.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A response stored in the cache."""
+
+    key: str
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    expires_at: float
+
+    def json(self) -> Any:
+        """Returns the decoded JSON body."""
+        return json.loads(self.body)
+
+    def is_fresh(self) -> bool:
+        """Tells whether the response is within its TTL."""
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Returns the headers asking the server whether the response changed."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheStats:
+    """Counters of the lookups of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    revalidated: int = 0
+    evicted: int = 0
+
+
+def make_key(url: str, params: dict[str, Any] | None = None) -> str:
+    """Returns the cache key of a request: its URL and sorted parameters.
+
+    Parameters given in the URL, like in the `next` links, and in `params`
+    share the same key. The scheme and host are part of the key, so that the
+    responses of an API, e.g. a local stand-in, are never returned for
+    another one.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({name: str(value) for name, value in (params or {}).items()})
+    path = parts.path.rstrip("/") or "/"
+    if parts.netloc:
+        path = f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}"
+    return f"{path}?{urlencode(sorted(query.items()))}" if query else path
+
+
+class HttpCache:
+    """Stores the JSON responses of an API in a SQLite file.
+
+    The file is opened on first use.
+
+    Args:
+        path (Path): The SQLite file of the cache.
+        ttls (dict[str, float] | None): TTLs in seconds of the endpoints, by
+            regular expression searched in the cache keys. The first matching
+            expression wins.
+        default_ttl (float): TTL of the endpoints matching no expression.
+        stale_while_revalidate (float): Seconds after its TTL during which a
+            response is still returned, while it is refreshed in the
+            background. 0 disables the mode.
+        max_bytes (int): Size of the stored bodies past which the least
+            recently used responses are evicted.
+        access_resolution (float): Seconds during which the hits of a
+            response do not update its access time.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_PATH,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = DEFAULT_TTL,
+        stale_while_revalidate: float = 0.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        access_resolution: float = DEFAULT_ACCESS_RESOLUTION,
+    ) -> None:
+        self.path = Path(path)
+        self.ttls = [
+            (re.compile(pattern), ttl) for pattern, ttl in (ttls or {}).items()
+        ]
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_bytes = max_bytes
+        self.access_resolution = access_resolution
+
+        self._database = LocalDatabase(self.path, SCHEMA)
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def ttl_for(self, key: str) -> float:
+        """Returns the TTL of the endpoint of a cache key."""
+        for pattern, ttl in self.ttls:
+            if pattern.search(key):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Returns the stored response of a key, fresh or not, if there is one."""
+        with self._lock:
+            connection = self._database.connect()
+            row = connection.execute(
+                "SELECT key, body, etag, last_modified, fetched_at, expires_at, "
+                "accessed_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+
+            *fields, accessed_at = row
+            now = time.time()
+            if now - accessed_at >= self.access_resolution:
+                connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                connection.commit()
+            response = CachedResponse(*fields)
+            if response.is_fresh():
+                self._stats.hits += 1
+            return response
+
+    def can_serve_stale(self, response: CachedResponse) -> bool:
+        """Tells whether a stale response may be returned while it is refreshed.
+
+        Counts the response as a stale hit when it may.
+        """
+        if time.time() >= response.expires_at + self.stale_while_revalidate:
+            return False
+        with self._lock:
+            self._stats.stale_hits += 1
+        return True
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Stores a response, then evicts responses if the cache is too large."""
+        now = time.time()
+        with self._lock:
+            connection = self._database.connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    body,
+                    etag,
+                    last_modified,
+                    now,
+                    now + self.ttl_for(key),
+                    now,
+                    len(body),
+                ),
+            )
+            self._evict(connection, self.max_bytes)
+            connection.commit()
+
+    def mark_revalidated(self, key: str) -> None:
+        """Starts a new TTL for a response the server said is unchanged."""
+        now = time.time()
+        with self._lock:
+            connection = self._database.connect()
+            connection.execute(
+                "UPDATE responses SET fetched_at = ?, expires_at = ? WHERE key = ?",
+                (now, now + self.ttl_for(key), key),
+            )
+            connection.commit()
+            self._stats.revalidated += 1
+
+    def entries(self, pattern: str | None = None) -> list[dict[str, Any]]:
+        """Returns the stored responses, without their bodies, most recent first.
+
+        Args:
+            pattern (str | None): A regular expression the keys must contain.
+        """
+        with self._lock:
+            rows = (
+                self._database.connect()
+                .execute(
+                    "SELECT key, size, etag IS NOT NULL OR last_modified IS NOT NULL, "
+                    "fetched_at, expires_at, accessed_at "
+                    "FROM responses ORDER BY accessed_at DESC"
+                )
+                .fetchall()
+            )
+
+        matcher = re.compile(pattern) if pattern else None
+        return [
+            {
+                "key": key,
+                "size": size,
+                "revalidable": bool(revalidable),
+                "fetched_at": fetched_at,
+                "expires_at": expires_at,
+                "accessed_at": accessed_at,
+            }
+            for key, size, revalidable, fetched_at, expires_at, accessed_at in rows
+            if matcher is None or matcher.search(key)
+        ]
+
+    def size(self) -> tuple[int, int]:
+        """Returns the number of stored responses and the size of their bodies."""
+        with self._lock:
+            count, size = (
+                self._database.connect()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses")
+                .fetchone()
+            )
+        return count, size
+
+    def prune(
+        self,
+        expired: bool = False,
+        pattern: str | None = None,
+        max_bytes: int | None = None,
+    ) -> int:
+        """Deletes responses and returns how many were deleted.
+
+        Args:
+            expired (bool): Delete the responses past their TTL and their
+                stale-while-revalidate window.
+            pattern (str | None): Delete the responses whose key contains
+                this regular expression; with `expired`, only the expired ones.
+            max_bytes (int | None): Then evict the least recently used
+                responses until the cache holds at most this many bytes.
+        """
+        keys = []
+        if expired or pattern is not None:
+            cutoff = time.time() - self.stale_while_revalidate
+            keys = [
+                entry["key"]
+                for entry in self.entries(pattern)
+                if not expired or entry["expires_at"] < cutoff
+            ]
+
+        with self._lock:
+            connection = self._database.connect()
+            connection.executemany(
+                "DELETE FROM responses WHERE key = ?", [(key,) for key in keys]
+            )
+            deleted = len(keys)
+            if max_bytes is not None:
+                deleted += self._evict(connection, max_bytes)
+            connection.commit()
+        return deleted
+
+    def close(self) -> None:
+        """Closes the connection to the file."""
+        with self._lock:
+            self._database.close()
+
+    def _evict(self, connection: sqlite3.Connection, max_bytes: int) -> int:
+        """Deletes the least recently used responses past `max_bytes`."""
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= max_bytes:
+            return 0
+
+        evicted = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if total <= max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self._stats.evicted += len(evicted)
+        return len(evicted)
+
+
+def _format_time(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Inspect or prune the HTTP response cache."
+    )
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Number and size of the stored responses.")
+    list_parser = commands.add_parser("list", help="List the stored responses.")
+    list_parser.add_argument("--endpoint", help="Regular expression on the keys.")
+    prune_parser = commands.add_parser("prune", help="Delete stored responses.")
+    prune_parser.add_argument("--expired", action="store_true")
+    prune_parser.add_argument("--endpoint", help="Regular expression on the keys.")
+    prune_parser.add_argument("--max-bytes", type=int)
+    commands.add_parser("clear", help="Delete every stored response.")
+    args = parser.parse_args()
+
+    cache = HttpCache(args.path)
+    if args.command == "stats":
+        count, size = cache.size()
+        expired = sum(
+            1 for entry in cache.entries() if entry["expires_at"] < time.time()
+        )
+        print(
+            f"{args.path}: {count} responses, {size / 1024:.0f} KiB, {expired} expired"
+        )
+    elif args.command == "list":
+        for entry in cache.entries(args.endpoint):
+            state = "fresh" if entry["expires_at"] > time.time() else "expired"
+            print(
+                f"{_format_time(entry['fetched_at'])}  {state:<7}  "
+                f"{entry['size'] / 1024:>7.1f} KiB  {entry['key']}"
+            )
+    elif args.command == "prune":
+        deleted = cache.prune(args.expired, args.endpoint, args.max_bytes)
+        print(f"Deleted {deleted} responses")
+    else:
+        print(f"Deleted {cache.prune(pattern='')} responses")
+
+
+if __name__ == "__main__":
+    main()
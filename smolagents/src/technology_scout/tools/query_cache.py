@@ -0,0 +1,188 @@
+"""Bounded LRU cache for the results of database queries."""
+
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_MAXSIZE = 256
+
+# Queries whose result changes between two executions are never cached,
+# including those reading the clock: 'now', CURRENT_TIMESTAMP/DATE/TIME, and
+# the date and time functions without a time value, which default to now.
+_NON_DETERMINISTIC = re.compile(
+    r"\b(random|randomblob|changes|last_insert_rowid)\("
+    r"|'now'"
+    r"|\bcurrent_(timestamp|date|time)\b"
+    r"|\b(date|time|datetime|julianday|unixepoch)\(\s*\)",
+    re.IGNORECASE,
+)
+_PUNCTUATION = set("(),;=<>+*/|")
+
+
+def normalize_sql(query: str) -> str:
+    """Normalizes a SQL query so that equivalent spellings share a cache key.
+
+    Comments are dropped, whitespace runs are collapsed (and removed around
+    punctuation), trailing semicolons are stripped and the text is
+    case-folded, except inside string literals and quoted identifiers which
+    are kept verbatim.
+
+    Args:
+        query (str): The raw SQL query.
+
+    Returns:
+        str: The normalized query.
+    """
+    parts: list[str] = []
+    pending_space = False
+    i, n = 0, len(query)
+
+    def emit(text: str) -> None:
+        nonlocal pending_space
+        if (
+            pending_space
+            and parts
+            and parts[-1][-1] not in _PUNCTUATION
+            and text[0] not in _PUNCTUATION
+        ):
+            parts.append(" ")
+        pending_space = False
+        parts.append(text)
+
+    while i < n:
+        char = query[i]
+
+        if char.isspace():
+            pending_space = True
+            i += 1
+        elif query.startswith("--", i):
+            end = query.find("\n", i)
+            i = n if end == -1 else end
+            pending_space = True
+        elif query.startswith("/*", i):
+            end = query.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            pending_space = True
+        elif char in "'\"`[":
+            closing = "]" if char == "[" else char
+            j = i + 1
+            while j < n:
+                if query[j] == closing:
+                    # Quotes are escaped by doubling them.
+                    if closing != "]" and query.startswith(closing * 2, j):
+                        j += 2
+                        continue
+                    break
+                j += 1
+            emit(query[i : j + 1])
+            i = j + 1
+        else:
+            j = i
+            while (
+                j < n
+                and not query[j].isspace()
+                and query[j] not in "'\"`["
+                and not query.startswith("--", j)
+                and not query.startswith("/*", j)
+            ):
+                j += 1
+            emit(query[i:j].casefold())
+            i = j
+
+    return "".join(parts).rstrip(";")
+
+
+def is_cacheable(normalized_query: str) -> bool:
+    """Whether the result of a normalized query can be reused."""
+    return _NON_DETERMINISTIC.search(normalized_query) is None
+
+
+@dataclass
+class CacheStats:
+    """Counters used to size the cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class QueryResultCache:
+    """Thread-safe LRU cache of query results, tied to a database version.
+
+    Every lookup passes the current version of the database. Whenever it
+    differs from the version the cached entries were computed against, the
+    whole cache is dropped.
+
+    Args:
+        maxsize (int): Maximum number of results kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._version: Hashable = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self, query: str, version: Hashable, compute: Callable[[], Any]
+    ) -> Any:
+        """Returns the cached result of `query`, computing it on a miss.
+
+        Args:
+            query (str): The raw SQL query.
+            version (Hashable): The current version of the database.
+            compute (Callable[[], Any]): Computes the result on a miss.
+
+        Returns:
+            Any: The (possibly cached) result.
+        """
+        key = normalize_sql(query)
+        if not is_cacheable(key):
+            return compute()
+
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return self._entries[key]
+            self.stats.misses += 1
+
+        result = compute()
+
+        with self._lock:
+            if version != self._version:
+                # The database changed while the query was running.
+                return result
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+        return result
+
+    def clear(self) -> None:
+        """Drops every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def _check_version(self, version: Hashable) -> None:
+        if version != self._version:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._version = version
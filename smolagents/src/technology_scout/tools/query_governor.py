@@ -0,0 +1,387 @@
+"""Guards the execution of LLM-written SQL on the AI personalities database.
+
+Before a query runs, the governor checks that it is a single read-only
+statement, inspects its `EXPLAIN QUERY PLAN` to reject joins of full table
+scans over a row threshold, and adds a `LIMIT` when it has none. While it
+runs, a progress handler aborts it once its time budget is spent.
+
+Refused and aborted queries raise `QueryRejected`, whose message tells the
+agent what to change, and are counted in the governor's stats.
+"""
+
+import contextlib
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from technology_scout.tools.query_cache import normalize_sql
+
+DEFAULT_MAX_ROWS = 1000
+DEFAULT_TIME_BUDGET = 5.0
+DEFAULT_MAX_JOIN_ROWS = 1_000_000
+# Number of SQLite virtual machine instructions between two deadline checks.
+PROGRESS_INTERVAL = 1000
+
+READ_ONLY_STATEMENTS = {"select", "with", "values", "pragma"}
+# Pragmas that only describe the schema.
+READ_ONLY_PRAGMAS = {
+    "table_info",
+    "table_xinfo",
+    "table_list",
+    "index_list",
+    "index_info",
+    "index_xinfo",
+    "foreign_key_list",
+}
+# Pragmas SQLite runs itself, e.g. when a virtual table reads its config.
+_INTERNAL_PRAGMAS = {"data_version"}
+_DENIED_FUNCTIONS = {"load_extension"}
+_ALLOWED_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    sqlite3.SQLITE_RECURSIVE,
+}
+
+_TOKEN = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|\w+|\S""")
+_SCAN = re.compile(r"^SCAN (\S+)")
+_SEARCH = re.compile(r"^SEARCH (\S+)")
+_VIEW = re.compile(r"^(?:MATERIALIZE|CO-ROUTINE) (\S+)")
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class QueryRejected(Exception):
+    """Raised when the governor refuses to run a query, or aborts it.
+
+    Args:
+        reason (str): A short code: `not_read_only`, `multiple_statements`,
+            `invalid_query`, `full_scan_join` or `timeout`.
+        message (str): What is wrong with the query.
+        hint (str): What to change for the query to be accepted.
+    """
+
+    def __init__(self, reason: str, message: str, hint: str) -> None:
+        super().__init__(f"Query rejected ({reason}): {message} {hint}")
+        self.reason = reason
+        self.message = message
+        self.hint = hint
+
+    def to_dict(self) -> dict[str, str]:
+        """Returns the error as a dict, e.g. to log it."""
+        return {"reason": self.reason, "message": self.message, "hint": self.hint}
+
+
+@dataclass
+class GovernorStats:
+    """Counters of the queries seen by a governor."""
+
+    executed: int = 0
+    limits_injected: int = 0
+    aborted: int = 0
+    rejected: Counter = field(default_factory=Counter)
+
+
+def _tokens(sql: str) -> list[str]:
+    return _TOKEN.findall(sql)
+
+
+def _has_top_level_limit(tokens: list[str]) -> bool:
+    depth = 0
+    for token in tokens:
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token == "limit":
+            return True
+    return False
+
+
+class QueryGovernor:
+    """Checks and runs raw SQL queries under row, plan and time limits.
+
+    Args:
+        max_rows (int | None): The `LIMIT` added to queries that have none.
+        time_budget (float | None): Seconds a query may run before being
+            aborted.
+        max_join_rows (int): Joins of full table scans whose estimated number
+            of visited rows exceeds this are rejected.
+    """
+
+    def __init__(
+        self,
+        max_rows: int | None = DEFAULT_MAX_ROWS,
+        time_budget: float | None = DEFAULT_TIME_BUDGET,
+        max_join_rows: int = DEFAULT_MAX_JOIN_ROWS,
+    ) -> None:
+        self.max_rows = max_rows
+        self.time_budget = time_budget
+        self.max_join_rows = max_join_rows
+
+        self._stats = GovernorStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> GovernorStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return GovernorStats(
+                executed=self._stats.executed,
+                limits_injected=self._stats.limits_injected,
+                aborted=self._stats.aborted,
+                rejected=Counter(self._stats.rejected),
+            )
+
+    def prepare(
+        self, connection: sqlite3.Connection, query: str, inject_limit: bool = True
+    ) -> str:
+        """Checks a query and returns the SQL to run in its place.
+
+        Args:
+            connection (sqlite3.Connection): The connection the query will run on.
+            query (str): The raw SQL query.
+            inject_limit (bool): Whether to add `LIMIT max_rows` to queries
+                without a top-level `LIMIT`.
+
+        Returns:
+            str: The normalized query, with its `LIMIT` if one was added.
+
+        Raises:
+            QueryRejected: If the query is not a single read-only statement,
+                is invalid, or joins full scans over too many rows.
+        """
+        try:
+            sql = normalize_sql(query)
+            tokens = _tokens(sql)
+            self._classify(tokens)
+            self._check_plan(connection, sql)
+        except QueryRejected as error:
+            self._record_rejection(error, query)
+            raise
+
+        if (
+            inject_limit
+            and self.max_rows is not None
+            and tokens[0] != "pragma"
+            and not _has_top_level_limit(tokens)
+        ):
+            with self._lock:
+                self._stats.limits_injected += 1
+            return f"select * from ({sql}) limit {int(self.max_rows)}"
+        return sql
+
+    @contextlib.contextmanager
+    def time_limit(self, connection: sqlite3.Connection) -> Iterator[None]:
+        """Aborts what runs on the connection inside the block once over budget.
+
+        Raises:
+            QueryRejected: If the time budget ran out.
+        """
+        if self.time_budget is None:
+            yield
+            return
+
+        deadline = time.monotonic() + self.time_budget
+        expired = False
+
+        def check_deadline() -> bool:
+            nonlocal expired
+            expired = time.monotonic() > deadline
+            return expired
+
+        connection.set_progress_handler(check_deadline, PROGRESS_INTERVAL)
+        try:
+            yield
+        # The interruption surfaces as whatever error the caller (e.g. pandas)
+        # wraps SQLite's in.
+        except Exception:
+            if not expired:
+                raise
+            with self._lock:
+                self._stats.aborted += 1
+            logger.warning("Aborted query after %ss", self.time_budget)
+            raise QueryRejected(
+                "timeout",
+                f"The query was aborted after {self.time_budget:g} seconds.",
+                "Filter the rows earlier, join on indexed columns such as rank, "
+                "or bound recursive queries.",
+            ) from None
+        finally:
+            connection.set_progress_handler(None, PROGRESS_INTERVAL)
+
+    def execute(
+        self,
+        connection: sqlite3.Connection,
+        query: str,
+        run: Callable[[str], T],
+    ) -> T:
+        """Checks a query, then runs it within the time budget.
+
+        Args:
+            connection (sqlite3.Connection): The connection `run` uses.
+            query (str): The raw SQL query.
+            run (Callable[[str], T]): Runs the SQL returned by `prepare`.
+
+        Returns:
+            T: The result of `run`.
+
+        Raises:
+            QueryRejected: If the query is refused or aborted.
+        """
+        sql = self.prepare(connection, query)
+        with self.time_limit(connection):
+            result = run(sql)
+        with self._lock:
+            self._stats.executed += 1
+        return result
+
+    def _record_rejection(self, error: QueryRejected, query: str) -> None:
+        with self._lock:
+            self._stats.rejected[error.reason] += 1
+        logger.info("Rejected query (%s): %s", error.reason, query)
+
+    def _classify(self, tokens: list[str]) -> None:
+        if not tokens:
+            raise QueryRejected(
+                "invalid_query", "The query is empty.", "Write a SELECT query."
+            )
+        if ";" in tokens:
+            raise QueryRejected(
+                "multiple_statements",
+                "The query contains several statements.",
+                "Run a single SELECT statement per call.",
+            )
+        if tokens[0] not in READ_ONLY_STATEMENTS:
+            raise QueryRejected(
+                "not_read_only",
+                f"{tokens[0].upper()} statements are not allowed.",
+                "The database is read-only: only SELECT queries can be run.",
+            )
+
+    def _check_plan(self, connection: sqlite3.Connection, sql: str) -> None:
+        tables_read: set[str] = set()
+        denied: list[str] = []
+
+        def authorize(action, arg1, arg2, database, trigger) -> int:
+            if action == sqlite3.SQLITE_READ:
+                tables_read.add(arg1)
+            if action == sqlite3.SQLITE_FUNCTION and arg2 in _DENIED_FUNCTIONS:
+                denied.append(arg2)
+                return sqlite3.SQLITE_DENY
+            if action in _ALLOWED_ACTIONS or (
+                action == sqlite3.SQLITE_PRAGMA
+                and (arg1 in READ_ONLY_PRAGMAS or arg1 in _INTERNAL_PRAGMAS)
+            ):
+                return sqlite3.SQLITE_OK
+            # The first statement using a virtual table, e.g. the full-text
+            # index, loads its schema, which SQLite reports as an update of
+            # sqlite_master. Statements writing it are rejected beforehand.
+            if (
+                action == sqlite3.SQLITE_UPDATE
+                and arg1 == "sqlite_master"
+                and trigger is None
+            ):
+                return sqlite3.SQLITE_OK
+            denied.append(arg1 or str(action))
+            return sqlite3.SQLITE_DENY
+
+        connection.set_authorizer(authorize)
+        try:
+            plan = connection.execute(f"explain query plan {sql}").fetchall()
+        except sqlite3.DatabaseError as error:
+            if denied:
+                raise QueryRejected(
+                    "not_read_only",
+                    f"The query is not read-only ({', '.join(denied)}).",
+                    "The database is read-only: only SELECT queries can be run.",
+                ) from None
+            raise QueryRejected(
+                "invalid_query",
+                f"SQLite could not compile the query: {error}.",
+                "Check the syntax and the table and column names against "
+                "the database description.",
+            ) from None
+        finally:
+            connection.set_authorizer(None)
+
+        estimate = self._estimate_join_rows(connection, plan, tables_read)
+        if estimate > self.max_join_rows:
+            raise QueryRejected(
+                "full_scan_join",
+                f"The query joins full table scans over about {estimate:,} rows "
+                f"(limit {self.max_join_rows:,}).",
+                "Add a join condition between the tables (e.g. on rank), or "
+                "filter each table with a WHERE clause before joining.",
+            )
+
+    def _estimate_join_rows(
+        self,
+        connection: sqlite3.Connection,
+        plan: list[tuple[int, int, int, str]],
+        tables_read: set[str],
+    ) -> int:
+        """Returns the largest number of rows a nest of full scans visits.
+
+        Nested loops are the `SCAN` and `SEARCH` entries sharing a parent in
+        the plan. An indexed `SEARCH` counts for one row, a `SCAN` for the
+        rows of its table, or of the largest table read when it scans an
+        alias or a subquery.
+        """
+        children = defaultdict(list)
+        for node_id, parent, _, detail in plan:
+            children[parent].append((node_id, detail))
+
+        row_counts: dict[str, int] = {}
+
+        def table_rows(name: str) -> int:
+            if name not in row_counts:
+                try:
+                    (count,) = connection.execute(
+                        f'select count(*) from "{name}"'
+                    ).fetchone()
+                except sqlite3.DatabaseError:
+                    count = 0
+                row_counts[name] = count
+            return row_counts[name]
+
+        def largest_table() -> int:
+            return max((table_rows(name) for name in tables_read), default=1)
+
+        views: dict[str, int] = {}
+        largest = 1
+        # Children are listed before the loops that use them, so materialized
+        # subqueries are estimated before being scanned.
+        for parent in sorted(children, key=lambda parent: -parent):
+            scans = []
+            for node_id, detail in children[parent]:
+                if match := _SCAN.match(detail):
+                    name = match.group(1)
+                    if name == "CONSTANT":
+                        scans.append(1)
+                    elif name in views:
+                        scans.append(views[name])
+                    elif name in tables_read:
+                        scans.append(table_rows(name))
+                    else:
+                        scans.append(largest_table())
+                elif _SEARCH.match(detail):
+                    scans.append(1)
+                elif match := _VIEW.match(detail):
+                    views[match.group(1)] = views.pop(f"#{node_id}", largest_table())
+
+            if scans:
+                views[f"#{parent}"] = math.prod(scans)
+            if len(scans) > 1:
+                largest = max(largest, math.prod(scans))
+
+        return largest
@@ -1,15 +1,115 @@
 """Tools to query the Papers with Code API."""
 
-from typing import Generic, TypeVar
+import asyncio
+import contextlib
+import functools
+import inspect
+import logging
+import math
+import os
+import sqlite3
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from datetime import date
+from pathlib import Path
+from typing import Any, Generic, TypeVar
 
 import requests
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from smolagents import tool
 
-T = TypeVar("T", bound=BaseModel)
+from technology_scout.tools.async_http_client import AsyncHttpClient
+from technology_scout.tools.http_cache import DEFAULT_MAX_BYTES, DEFAULT_PATH, HttpCache
+from technology_scout.tools.http_client import HttpClient
+from technology_scout.tools.paper_store import DEFAULT_PATH as DEFAULT_STORE_PATH
+from technology_scout.tools.paper_store import PaperStore
+from technology_scout.tools.parsing import projection, type_adapter
+from technology_scout.tools.rate_limiter import RateLimiter, parse_limits
+from technology_scout.tools.serialization import compact_output
+from technology_scout.tools.single_flight import SingleFlight
 
+# The results are models, or projections of models for bulk crawls.
+T = TypeVar("T")
 
-BASE_URL = "https://paperswithcode.com/api/v1"
+
+DEFAULT_BASE_URL = "https://paperswithcode.com/api/v1"
+# Overridden to query e.g. the local stand-in server of the scripts.
+BASE_URL = os.getenv("TECHNOLOGY_SCOUT_PAPERS_WITH_CODE_URL", DEFAULT_BASE_URL)
+
+logger = logging.getLogger(__name__)
+
+# Papers per page, and pages fetched at once, when fetching all the papers of
+# an author.
+ITEMS_PER_PAGE = 50
+PAGE_CONCURRENCY = int(os.getenv("TECHNOLOGY_SCOUT_PAGE_CONCURRENCY", "8"))
+
+# Seconds the responses of the API are cached, by endpoint. Authors rarely
+# change, their lists of papers grow with each new paper.
+CACHE_TTLS = {
+    r"/authors/[^/?]+/papers(\?|$)": 24 * 60 * 60,
+    r"/authors(\?|$)": 7 * 24 * 60 * 60,
+}
+
+
+def _local_path(variable: str, default: Path) -> str:
+    """Returns the path of a local file of the API data, empty to disable it.
+
+    The default files hold the data of the real API. When `BASE_URL` is
+    overridden, they are left alone, and a file is only used if its path is
+    given.
+    """
+    if BASE_URL.rstrip("/") != DEFAULT_BASE_URL:
+        default = ""
+    return os.getenv(variable, str(default))
+
+
+# An empty path disables the cache.
+_cache_path = _local_path("TECHNOLOGY_SCOUT_HTTP_CACHE_PATH", DEFAULT_PATH)
+http_cache = (
+    HttpCache(
+        _cache_path,
+        ttls=CACHE_TTLS,
+        stale_while_revalidate=float(
+            os.getenv("TECHNOLOGY_SCOUT_HTTP_CACHE_STALE_WHILE_REVALIDATE", "0")
+        ),
+        max_bytes=int(
+            os.getenv("TECHNOLOGY_SCOUT_HTTP_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        ),
+    )
+    if _cache_path
+    else None
+)
+
+# The papers fetched by the tools are written through to a local store. An
+# empty path disables it.
+_store_path = _local_path("TECHNOLOGY_SCOUT_PAPER_STORE_PATH", DEFAULT_STORE_PATH)
+paper_store = PaperStore(_store_path) if _store_path else None
+
+# The budgets of the requests by host, as `host=rate/burst` pairs. With a
+# path, the budgets are shared with the other processes using the same file.
+DEFAULT_RATE_LIMITS = "paperswithcode.com=5/10"
+_rate_limit_path = os.getenv("TECHNOLOGY_SCOUT_RATE_LIMIT_PATH")
+rate_limiter = RateLimiter(
+    parse_limits(os.getenv("TECHNOLOGY_SCOUT_RATE_LIMITS", DEFAULT_RATE_LIMITS)),
+    path=_rate_limit_path or None,
+)
+
+# Shared by the tools, so that the connections to the API are reused, that
+# concurrent identical requests, sync or async, are sent once, and that all
+# the requests share the budget of the API.
+api_flight = SingleFlight()
+client = HttpClient(
+    BASE_URL, cache=http_cache, single_flight=api_flight, rate_limiter=rate_limiter
+)
+async_client = AsyncHttpClient(
+    BASE_URL, cache=http_cache, single_flight=api_flight, rate_limiter=rate_limiter
+)
 
 
 class ApiResponse(BaseModel, Generic[T]):
@@ -24,6 +124,12 @@ class Author(BaseModel):
     full_name: str
 
 
+class AuthorMatch(BaseModel):
+    name: str
+    id: str
+    full_name: str
+
+
 class PaperAuthorPaper(BaseModel):
     id: str
     arxiv_id: str | None = None
@@ -40,6 +146,159 @@ class PaperAuthorPaper(BaseModel):
     proceeding: str | None = None
 
 
+class AuthorPaper(PaperAuthorPaper):
+    author_id: str
+
+
+def page_adapter(model: type[T]) -> TypeAdapter[ApiResponse[list[T]]]:
+    """Returns the cached validator of the pages of `model` results."""
+    return type_adapter(ApiResponse[list[model]])
+
+
+def parse_page(body: bytes, model: type[T]) -> ApiResponse[list[T]]:
+    """Validates a page of results straight from the raw JSON body."""
+    return page_adapter(model).validate_json(body)
+
+
+def paper_projection(fields: list[str]) -> type:
+    """Returns a slotted record of the given fields of the papers.
+
+    Fetching pages of these records instead of `PaperAuthorPaper` skips the
+    other fields while parsing, e.g. to crawl papers without their abstracts.
+    """
+    return projection(PaperAuthorPaper, fields)
+
+
+# The fields of the papers returned by the tools, unless they are asked for
+# others: the abstracts, URLs and conference fields would dominate the tokens
+# of every observation.
+DEFAULT_PAPER_FIELDS = ("id", "title", "published", "authors")
+
+
+def project_papers(
+    papers: Iterable[PaperAuthorPaper],
+    fields: Sequence[str] = DEFAULT_PAPER_FIELDS,
+    max_abstract_chars: int | None = None,
+) -> list:
+    """Keeps only some fields of papers, and cuts their abstracts.
+
+    Args:
+        papers (Iterable[PaperAuthorPaper]): The papers.
+        fields (Sequence[str]): The fields to keep.
+        max_abstract_chars (int | None): The length the abstracts are cut to,
+            if any.
+
+    Returns:
+        list: The projections of the papers, see `projection`.
+
+    Raises:
+        ValueError: If a field is not a field of the papers.
+    """
+    records = []
+    for paper in papers:
+        record_type = projection(type(paper), fields)
+        values = {name: getattr(paper, name) for name in fields}
+        abstract = values.get("abstract")
+        if max_abstract_chars is not None and len(abstract or "") > max_abstract_chars:
+            values["abstract"] = abstract[: max(max_abstract_chars - 1, 0)] + "…"
+        records.append(record_type(**values))
+    return records
+
+
+def with_fields(
+    fn: Callable[..., Any],
+    default_fields: Sequence[str] | None = DEFAULT_PAPER_FIELDS,
+    keep: Sequence[str] = (),
+) -> Callable[..., Any]:
+    """Adds the `fields` and `max_abstract_chars` options to a paper tool.
+
+    The wrapper returns the projections of the papers returned by `fn` on the
+    `fields` asked for, or else on `default_fields`, or on all the fields if
+    that is None, always with the `keep` fields. The options are added to the
+    signature and to the docstring, so that the frameworks describe them to
+    the LLM. The functions themselves keep returning the full papers.
+
+    Args:
+        fn (Callable[..., Any]): Returns a paper, a list of papers or None.
+        default_fields (Sequence[str] | None): The fields returned by default.
+        keep (Sequence[str]): The fields always returned.
+
+    Returns:
+        Callable[..., Any]: The wrapped function.
+    """
+    signature = inspect.signature(fn)
+    signature = signature.replace(
+        parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(
+                "fields",
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=None,
+                annotation=list[str] | None,
+            ),
+            inspect.Parameter(
+                "max_abstract_chars",
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=None,
+                annotation=int | None,
+            ),
+        ],
+        return_annotation=Any,
+    )
+    defaults = ", ".join(default_fields) if default_fields else "all of them"
+    options = (
+        f"    fields (list[str] | None): The fields of the papers to return, among "
+        f"{', '.join(PaperAuthorPaper.model_fields)}. Defaults to {defaults}\n"
+        "    max_abstract_chars (int | None): The length the abstracts are cut to, "
+        "if any"
+    )
+
+    def project(result: Any, fields: list[str] | None, max_abstract_chars: int | None):
+        papers = result if isinstance(result, list) else [result]
+        if result is None or not papers:
+            return result
+        names = fields or default_fields or list(type(papers[0]).model_fields)
+        records = project_papers(
+            papers, list(dict.fromkeys([*keep, *names])), max_abstract_chars
+        )
+        return records if isinstance(result, list) else records[0]
+
+    def split(args: tuple, kwargs: dict) -> tuple[dict, list[str] | None, int | None]:
+        arguments = signature.bind(*args, **kwargs).arguments
+        return (
+            arguments,
+            arguments.pop("fields", None),
+            arguments.pop("max_abstract_chars", None),
+        )
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            arguments, fields, max_abstract_chars = split(args, kwargs)
+            return project(await fn(**arguments), fields, max_abstract_chars)
+
+    else:
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            arguments, fields, max_abstract_chars = split(args, kwargs)
+            return project(fn(**arguments), fields, max_abstract_chars)
+
+    wrapper.__signature__ = signature
+    wrapper.__annotations__ = {
+        **fn.__annotations__,
+        "fields": list[str] | None,
+        "max_abstract_chars": int | None,
+        "return": Any,
+    }
+    # The options are listed at the end of the arguments.
+    doc = inspect.cleandoc(fn.__doc__)
+    assert "\n\nReturns:" in doc, f"{fn.__name__} documents no return value"
+    wrapper.__doc__ = doc.replace("\n\nReturns:", f"\n{options}\n\nReturns:", 1)
+    return wrapper
+
+
 def search_author(name: str) -> list[Author]:
     """Searches authors by name.
 
@@ -49,46 +308,544 @@ def search_author(name: str) -> list[Author]:
     Returns:
         ApiResponse[list[Author]]: List of matching authors
     """
-    endpoint = f"{BASE_URL}/authors"
     params = {"q": name}
 
     try:
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        response_json = response.json()
-        response = ApiResponse[list[Author]].model_validate(response_json)
+        response = parse_page(client.get_content("/authors", params=params), Author)
 
         return response.results
 
     except requests.exceptions.RequestException as e:
-        print(f"Error searching for author: {e}")
+        logger.warning("Error searching for author: %s", e)
         return []
 
 
-def get_author_papers(author_id: int) -> list[PaperAuthorPaper]:
+def get_author_papers(author_id: str) -> list[PaperAuthorPaper]:
     """Get papers for a specific author by their ID.
 
     Args:
-        author_id (int): The ID of the author
+        author_id (str): The ID of the author
 
     Returns:
         list[PaperAuthorPaper]: List of papers by the author
     """
-    endpoint = f"{BASE_URL}/authors/{author_id}/papers"
     params = {"page": 1, "items_per_page": 5}
 
     try:
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        response_json = response.json()
-        response = ApiResponse[list[PaperAuthorPaper]].model_validate(response_json)
+        body = client.get_content(f"/authors/{author_id}/papers", params=params)
+        response = parse_page(body, PaperAuthorPaper)
 
-        return response.results
+    except requests.exceptions.RequestException as e:
+        logger.warning("Error getting author papers: %s", e)
+        return []
+
+    store_papers(response.results, author_id)
+    return response.results
+
+
+async def gather_limited(
+    coroutines: Iterable[Awaitable[T]], max_concurrency: int = PAGE_CONCURRENCY
+) -> list[T]:
+    """Awaits coroutines concurrently, at most `max_concurrency` at a time.
+
+    Returns:
+        list[T]: Their results, in order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_when_allowed(coroutine: Awaitable[T]) -> T:
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*map(run_when_allowed, coroutines))
+
+
+async def fetch_all_pages(
+    path: str,
+    model: type[T],
+    params: dict[str, Any] | None = None,
+    items_per_page: int = ITEMS_PER_PAGE,
+    max_concurrency: int = PAGE_CONCURRENCY,
+) -> list[T]:
+    """Fetches the results of all the pages of a paginated endpoint.
+
+    The first page gives the total `count` of results, then the other pages
+    are fetched concurrently, at most `max_concurrency` at a time.
+
+    Args:
+        path (str): The path of the endpoint.
+        model (type[T]): The model of the results.
+        params (dict[str, Any] | None): The other query string parameters.
+        items_per_page (int): The number of results per page.
+        max_concurrency (int): The number of pages fetched at once.
+
+    Returns:
+        list[T]: The results of all the pages, in order.
+    """
+    params = {**(params or {}), "items_per_page": items_per_page}
+
+    async def fetch_page(page: int) -> ApiResponse[list[T]]:
+        body = await async_client.get_content(path, params={**params, "page": page})
+        return parse_page(body, model)
+
+    first_page = await fetch_page(1)
+    n_pages = math.ceil(first_page.count / items_per_page)
+
+    other_pages = await gather_limited(
+        (fetch_page(page) for page in range(2, n_pages + 1)), max_concurrency
+    )
+    return [result for page in [first_page, *other_pages] for result in page.results]
+
+
+async def aget_all_author_papers(author_id: str) -> list[PaperAuthorPaper]:
+    """Get all the papers of a specific author by their ID.
+
+    Args:
+        author_id (str): The ID of the author
+
+    Returns:
+        list[PaperAuthorPaper]: All the papers of the author
+    """
+    import httpx
+
+    try:
+        papers = await fetch_all_pages(f"/authors/{author_id}/papers", PaperAuthorPaper)
+
+    except httpx.HTTPError as e:
+        logger.warning("Error getting author papers: %s", e)
+        return []
+
+    store_papers(papers, author_id, complete=True)
+    return papers
+
+
+def get_all_author_papers(author_id: str) -> list[PaperAuthorPaper]:
+    """Get all the papers of a specific author by their ID.
+
+    Args:
+        author_id (str): The ID of the author
+
+    Returns:
+        list[PaperAuthorPaper]: All the papers of the author
+    """
+    return async_client.run(aget_all_author_papers(author_id))
+
+
+async def aiter_pages(
+    path: str, model: type[T], params: dict[str, Any] | None = None
+) -> AsyncIterator[ApiResponse[list[T]]]:
+    """Iterates over the pages of a paginated endpoint, following `next`.
+
+    The next page is requested as soon as a page arrives, so that it downloads
+    while the current one is processed. Closing the iterator cancels it.
+
+    Args:
+        path (str): The path of the endpoint.
+        model (type[T]): The model of the results.
+        params (dict[str, Any] | None): The query string parameters.
+
+    Yields:
+        ApiResponse[list[T]]: The pages, in order.
+    """
+
+    async def fetch_page(
+        url: str, page_params: dict[str, Any] | None = None
+    ) -> ApiResponse[list[T]]:
+        body = await async_client.get_content(url, params=page_params)
+        return parse_page(body, model)
+
+    prefetch = asyncio.ensure_future(fetch_page(path, params))
+    try:
+        while prefetch is not None:
+            page = await prefetch
+            prefetch = (
+                asyncio.ensure_future(fetch_page(page.next)) if page.next else None
+            )
+            yield page
+    finally:
+        if prefetch is not None and not prefetch.cancel() and not prefetch.cancelled():
+            # The prefetch already failed, and its error is not needed anymore.
+            prefetch.exception()
+
+
+async def aiter_author_papers(
+    author_id: str, items_per_page: int = ITEMS_PER_PAGE
+) -> AsyncIterator[PaperAuthorPaper]:
+    """Iterates over the papers of an author, as their pages arrive.
+
+    Args:
+        author_id (str): The ID of the author
+        items_per_page (int): The number of papers per page
+
+    Yields:
+        PaperAuthorPaper: The papers of the author
+    """
+    pages = aiter_pages(
+        f"/authors/{author_id}/papers",
+        PaperAuthorPaper,
+        params={"items_per_page": items_per_page},
+    )
+    async with contextlib.aclosing(pages):
+        async for page in pages:
+            for paper in page.results:
+                yield paper
+
+
+def iter_author_papers(
+    author_id: str, items_per_page: int = ITEMS_PER_PAGE
+) -> Iterator[PaperAuthorPaper]:
+    """Iterates over the papers of an author, as their pages arrive.
+
+    The sync version of `aiter_author_papers`.
+    """
+    return async_client.iterate(aiter_author_papers(author_id, items_per_page))
+
+
+def paper_matches(
+    paper: PaperAuthorPaper,
+    paper_id: str | None = None,
+    title_contains: str | None = None,
+    published_after: str | None = None,
+    published_before: str | None = None,
+) -> bool:
+    """Tells whether a paper meets all the given criteria."""
+    if paper_id is not None and paper.id != paper_id:
+        return False
+    if title_contains is not None and title_contains.lower() not in paper.title.lower():
+        return False
+    if published_after is not None or published_before is not None:
+        # ISO dates compare in the order of the dates.
+        if paper.published is None:
+            return False
+        if published_after is not None and paper.published < published_after:
+            return False
+        if published_before is not None and paper.published > published_before:
+            return False
+    return True
+
+
+async def afind_author_paper(
+    author_id: str,
+    paper_id: str | None = None,
+    title_contains: str | None = None,
+    published_after: str | None = None,
+    published_before: str | None = None,
+) -> PaperAuthorPaper | None:
+    """Find the first paper of an author that meets all the given criteria.
+
+    The papers are read page by page, and the search stops at the first match.
+
+    Args:
+        author_id (str): The ID of the author
+        paper_id (str | None): The ID of the paper
+        title_contains (str | None): A text in the title, case insensitive
+        published_after (str | None): The earliest publication date, as YYYY-MM-DD
+        published_before (str | None): The latest publication date, as YYYY-MM-DD
+
+    Returns:
+        PaperAuthorPaper | None: The first matching paper, or None
+    """
+    import httpx
+
+    criteria = {
+        "paper_id": paper_id,
+        "title_contains": title_contains,
+        "published_after": published_after,
+        "published_before": published_before,
+    }
+    if all(value is None for value in criteria.values()):
+        raise ValueError(
+            "Give at least one of paper_id, title_contains, published_after or "
+            "published_before."
+        )
+    for bound in (published_after, published_before):
+        if bound is not None:
+            date.fromisoformat(bound)
+
+    try:
+        papers = aiter_author_papers(author_id)
+        async with contextlib.aclosing(papers):
+            async for paper in papers:
+                if paper_matches(paper, **criteria):
+                    return paper
+
+    except httpx.HTTPError as e:
+        logger.warning("Error getting author papers: %s", e)
+    return None
+
+
+def find_author_paper(
+    author_id: str,
+    paper_id: str | None = None,
+    title_contains: str | None = None,
+    published_after: str | None = None,
+    published_before: str | None = None,
+) -> PaperAuthorPaper | None:
+    """Find the first paper of an author that meets all the given criteria.
+
+    The papers are read page by page, and the search stops at the first match.
+
+    Args:
+        author_id (str): The ID of the author
+        paper_id (str | None): The ID of the paper
+        title_contains (str | None): A text in the title, case insensitive
+        published_after (str | None): The earliest publication date, as YYYY-MM-DD
+        published_before (str | None): The latest publication date, as YYYY-MM-DD
+
+    Returns:
+        PaperAuthorPaper | None: The first matching paper, or None
+    """
+    return async_client.run(
+        afind_author_paper(
+            author_id, paper_id, title_contains, published_after, published_before
+        )
+    )
+
+
+def store_papers(
+    papers: list[PaperAuthorPaper],
+    author_id: str | None = None,
+    complete: bool = False,
+) -> None:
+    """Writes papers through to the local store, if there is one."""
+    if paper_store is None or not papers:
+        return
+    try:
+        paper_store.put_papers(
+            (paper.model_dump() for paper in papers), author_id, complete
+        )
+    except sqlite3.Error as e:
+        logger.warning("Error storing papers: %s", e)
+
+
+def get_paper(paper_id: str) -> PaperAuthorPaper | None:
+    """Get a paper by its ID.
+
+    The paper is looked up in the local store of the papers already fetched,
+    then in the API.
+
+    Args:
+        paper_id (str): The ID of the paper
+
+    Returns:
+        PaperAuthorPaper | None: The paper, or None if it was not found
+    """
+    if paper_store is not None:
+        stored = paper_store.get_paper(paper_id)
+        if stored is not None:
+            return PaperAuthorPaper.model_validate(stored)
+
+    try:
+        body = client.get_content(f"/papers/{paper_id}")
+        paper = PaperAuthorPaper.model_validate_json(body)
 
     except requests.exceptions.RequestException as e:
-        print(f"Error getting author papers: {e}")
+        logger.warning("Error getting paper: %s", e)
+        return None
+
+    store_papers([paper])
+    return paper
+
+
+def search_papers(query: str, top_k: int = 10) -> list[PaperAuthorPaper]:
+    """Search papers by words of their title or abstract, best matches first.
+
+    The papers already fetched are searched first, in the local store, then
+    the API when none of them match.
+
+    Args:
+        query (str): The words to search for
+        top_k (int): The maximum number of papers to return
+
+    Returns:
+        list[PaperAuthorPaper]: The matching papers
+    """
+    if paper_store is not None:
+        stored = paper_store.search(query, top_k)
+        if stored:
+            return [PaperAuthorPaper.model_validate(paper) for paper in stored]
+
+    params = {"q": query, "items_per_page": top_k}
+    try:
+        response = parse_page(
+            client.get_content("/papers", params=params), PaperAuthorPaper
+        )
+
+    except requests.exceptions.RequestException as e:
+        logger.warning("Error searching papers: %s", e)
         return []
 
+    store_papers(response.results)
+    return response.results
+
+
+async def apapers_by_author(
+    author_id: str, since: str | None = None
+) -> list[PaperAuthorPaper]:
+    """Get the papers of an author, most recent first.
+
+    Answered from the local store once all the papers of the author were
+    fetched, otherwise fetches them all from the API.
+
+    Args:
+        author_id (str): The ID of the author
+        since (str | None): The earliest publication date, as YYYY-MM-DD
+
+    Returns:
+        list[PaperAuthorPaper]: The papers of the author
+    """
+    if since is not None:
+        date.fromisoformat(since)
+
+    if paper_store is not None:
+        stored = paper_store.papers_by_author(author_id, since)
+        if stored is not None:
+            return [PaperAuthorPaper.model_validate(paper) for paper in stored]
+
+    papers = await aget_all_author_papers(author_id)
+    return [paper for paper in papers if paper_matches(paper, published_after=since)]
+
+
+def papers_by_author(
+    author_id: str, since: str | None = None
+) -> list[PaperAuthorPaper]:
+    """Get the papers of an author, most recent first.
+
+    Answered from the local store once all the papers of the author were
+    fetched, otherwise fetches them all from the API.
+
+    Args:
+        author_id (str): The ID of the author
+        since (str | None): The earliest publication date, as YYYY-MM-DD
+
+    Returns:
+        list[PaperAuthorPaper]: The papers of the author
+    """
+    return async_client.run(apapers_by_author(author_id, since))
+
+
+async def asearch_authors(names: list[str], per_name: int = 1) -> list[AuthorMatch]:
+    """Search several authors by name at once.
+
+    The names are searched concurrently, and the matches merged into one list.
+
+    Args:
+        names (list[str]): The names of the authors to search for
+        per_name (int): The maximum number of matches per name
+
+    Returns:
+        list[AuthorMatch]: The matches, with the name they match, in the order
+            of the names
+    """
+    import httpx
+
+    async def search(name: str) -> list[AuthorMatch]:
+        try:
+            body = await async_client.get_content("/authors", params={"q": name})
+        except httpx.HTTPError as e:
+            logger.warning("Error searching for author %r: %s", name, e)
+            return []
+        authors = parse_page(body, Author).results[:per_name]
+        return [AuthorMatch(name=name, **author.model_dump()) for author in authors]
+
+    matches = await gather_limited(map(search, dict.fromkeys(names)))
+    return [match for name_matches in matches for match in name_matches]
+
+
+def search_authors(names: list[str], per_name: int = 1) -> list[AuthorMatch]:
+    """Search several authors by name at once.
+
+    The names are searched concurrently, and the matches merged into one list.
+
+    Args:
+        names (list[str]): The names of the authors to search for
+        per_name (int): The maximum number of matches per name
+
+    Returns:
+        list[AuthorMatch]: The matches, with the name they match, in the order
+            of the names
+    """
+    return async_client.run(asearch_authors(names, per_name))
+
+
+async def aget_papers_for_authors(
+    author_ids: list[str], per_author: int = 5
+) -> list[AuthorPaper]:
+    """Get the papers of several authors at once.
+
+    The papers of the authors are fetched concurrently, or read from the local
+    store once all the papers of an author were fetched, and merged into one
+    list.
+
+    Args:
+        author_ids (list[str]): The IDs of the authors
+        per_author (int): The maximum number of papers per author
+
+    Returns:
+        list[AuthorPaper]: The papers, with the ID of their author, in the
+            order of the authors
+    """
+    import httpx
+
+    async def get_papers(author_id: str) -> list[PaperAuthorPaper]:
+        if paper_store is not None:
+            stored = paper_store.papers_by_author(author_id)
+            if stored is not None:
+                return [
+                    PaperAuthorPaper.model_validate(paper)
+                    for paper in stored[:per_author]
+                ]
+
+        params = {"page": 1, "items_per_page": per_author}
+        try:
+            body = await async_client.get_content(
+                f"/authors/{author_id}/papers", params=params
+            )
+        except httpx.HTTPError as e:
+            logger.warning("Error getting the papers of author %r: %s", author_id, e)
+            return []
+        papers = parse_page(body, PaperAuthorPaper).results
+        store_papers(papers, author_id)
+        return papers
+
+    author_ids = list(dict.fromkeys(author_ids))
+    papers = await gather_limited(map(get_papers, author_ids))
+    return [
+        AuthorPaper(author_id=str(author_id), **paper.model_dump())
+        for author_id, author_papers in zip(author_ids, papers)
+        for paper in author_papers
+    ]
+
+
+def get_papers_for_authors(
+    author_ids: list[str], per_author: int = 5
+) -> list[AuthorPaper]:
+    """Get the papers of several authors at once.
+
+    The papers of the authors are fetched concurrently, or read from the local
+    store once all the papers of an author were fetched, and merged into one
+    list.
+
+    Args:
+        author_ids (list[str]): The IDs of the authors
+        per_author (int): The maximum number of papers per author
+
+    Returns:
+        list[AuthorPaper]: The papers, with the ID of their author, in the
+            order of the authors
+    """
+    return async_client.run(aget_papers_for_authors(author_ids, per_author))
+
 
-search_author_tool = tool(search_author)
-get_author_papers_tool = tool(get_author_papers)
+search_author_tool = tool(compact_output(search_author))
+get_author_papers_tool = tool(compact_output(with_fields(get_author_papers)))
+# smolagents runs its tools synchronously, from the agent's own thread.
+get_all_author_papers_tool = tool(compact_output(with_fields(get_all_author_papers)))
+find_author_paper_tool = tool(compact_output(with_fields(find_author_paper)))
+get_paper_tool = tool(compact_output(with_fields(get_paper, default_fields=None)))
+search_papers_tool = tool(compact_output(with_fields(search_papers)))
+papers_by_author_tool = tool(compact_output(with_fields(papers_by_author)))
+search_authors_tool = tool(compact_output(search_authors))
+get_papers_for_authors_tool = tool(
+    compact_output(with_fields(get_papers_for_authors, keep=["author_id"]))
+)
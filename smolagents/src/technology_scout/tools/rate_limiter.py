@@ -0,0 +1,364 @@
+"""Client-side rate limiting of the requests sent to the APIs.
+
+Every request takes a token from the token bucket of its host before it is
+sent: a bucket holds up to `burst` tokens and refills at `rate` tokens per
+second, so the requests of all the agents of the process, or of all the
+processes sharing a SQLite file, stay within the budget of the API instead of
+being throttled with 429 responses. When the API still answers 429 with a
+`Retry-After` header, the whole host is paused for that long.
+
+The requests waiting for a token are served by priority, then in order:
+interactive sessions go ahead of the batch crawls, which run in a `batch()`
+block. The priority is a context variable, so it follows the asyncio tasks.
+Across processes, the requests of each process are ordered, and the processes
+share the tokens first come, first served.
+
+The limits are read from `host=rate/burst` pairs, `*` being any other host:
+
+    TECHNOLOGY_SCOUT_RATE_LIMITS="paperswithcode.com=5/10,*=20/20"
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from urllib.parse import urlparse
+
+from technology_scout.tools.local_database import LocalDatabase
+
+# The shortest wait between two checks of a bucket, so that the waiting
+# requests never spin.
+MIN_WAIT = 0.001
+# Seconds a process waits for another one holding the lock of the shared file.
+SHARED_BUSY_TIMEOUT = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    paused_until REAL NOT NULL
+)
+"""
+
+
+class Priority(IntEnum):
+    """The lanes of the waiting requests; lower values are served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+request_priority: ContextVar[Priority] = ContextVar(
+    "request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextlib.contextmanager
+def batch() -> Iterator[None]:
+    """Sends the requests of the block behind the interactive ones."""
+    token = request_priority.set(Priority.BATCH)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """The budget of a host.
+
+    Args:
+        rate (float): Requests per second, on average.
+        burst (int): Requests sent at once after an idle period.
+    """
+
+    rate: float
+    burst: int = 1
+
+
+def parse_limits(spec: str) -> dict[str, RateLimit]:
+    """Parses `host=rate/burst` pairs, e.g. `paperswithcode.com=5/10,*=20`."""
+    limits = {}
+    for pair in filter(None, (part.strip() for part in spec.split(","))):
+        host, _, budget = pair.partition("=")
+        rate, _, burst = budget.partition("/")
+        if not host or not rate:
+            raise ValueError(f"Invalid rate limit {pair!r}, expected host=rate/burst")
+        limits[host.strip()] = RateLimit(float(rate), int(burst or 1))
+    return limits
+
+
+@dataclass
+class LaneStats:
+    """Counters of the requests of one priority lane."""
+
+    acquired: int = 0
+    waited: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+    max_queue_depth: int = 0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_time / self.acquired if self.acquired else 0.0
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+    paused_until: float = 0.0
+
+
+class RateLimiter:
+    """Token buckets of the hosts, shared by the clients of a process.
+
+    Args:
+        limits (dict[str, RateLimit]): The budgets by host; `*` applies to the
+            other hosts, which are not limited otherwise.
+        path (Path | None): A SQLite file holding the buckets, to share them
+            with the other processes using it. The buckets are kept in memory
+            without one.
+    """
+
+    def __init__(self, limits: dict[str, RateLimit], path: Path | None = None) -> None:
+        self.limits = dict(limits)
+        self.path = Path(path) if path is not None else None
+
+        self._buckets: dict[str, _Bucket] = {}
+        self._queues: dict[str, list[tuple[int, int]]] = {}
+        self._tickets = itertools.count()
+        self._stats = {priority: LaneStats() for priority in Priority}
+        self._database = (
+            LocalDatabase(
+                self.path,
+                SCHEMA,
+                timeout=SHARED_BUSY_TIMEOUT,
+                isolation_level=None,
+            )
+            if self.path is not None
+            else None
+        )
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        # Serializes the use of the connection to the shared file.
+        self._file_lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict[Priority, LaneStats]:
+        """A snapshot of the counters, by lane."""
+        with self._lock:
+            return {
+                priority: LaneStats(**vars(stats))
+                for priority, stats in self._stats.items()
+            }
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of requests waiting for a token."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def limit(self, host: str) -> RateLimit | None:
+        """Returns the budget of a host, if it has one."""
+        return self.limits.get(host, self.limits.get("*"))
+
+    def acquire(self, url: str) -> float:
+        """Waits for a token of the host of a URL, and returns the wait.
+
+        The request is served in the lane of the current `request_priority`.
+        """
+        host = urlparse(url).hostname or ""
+        if self.limit(host) is None:
+            return 0.0
+        ticket, start, served = self._enqueue(host), time.monotonic(), False
+        try:
+            with self._condition:
+                while (delay := self._try_take(host, ticket)) > 0:
+                    self._condition.wait(delay)
+            served = True
+        finally:
+            wait = self._dequeue(host, ticket, start, served)
+        return wait
+
+    async def aacquire(self, url: str) -> float:
+        """Waits for a token from asyncio code. See `acquire`.
+
+        With a shared file, whose lock another process may hold for up to
+        `SHARED_BUSY_TIMEOUT` seconds, the buckets are updated in a thread,
+        off the event loop.
+        """
+        host = urlparse(url).hostname or ""
+        if self.limit(host) is None:
+            return 0.0
+        ticket, start, served = self._enqueue(host), time.monotonic(), False
+        try:
+            while True:
+                if self.path is None:
+                    with self._lock:
+                        delay = self._try_take(host, ticket)
+                else:
+                    with self._lock:
+                        ahead = self._ahead(host, ticket)
+                    delay = await asyncio.to_thread(
+                        self._take, host, needed=ahead + 1, take=ahead == 0
+                    )
+                if delay == 0:
+                    break
+                await asyncio.sleep(delay)
+            served = True
+        finally:
+            wait = self._dequeue(host, ticket, start, served)
+        return wait
+
+    def pause(self, url: str, seconds: float) -> None:
+        """Sends no request to the host of a URL for some time.
+
+        Used when the API asks to slow down, e.g. with a 429 `Retry-After`.
+        """
+        host = urlparse(url).hostname or ""
+        if self.limit(host) is None:
+            return
+        if self.path is None:
+            with self._lock:
+                self._pause(host, time.time() + seconds)
+        else:
+            self._pause(host, time.time() + seconds)
+
+    async def apause(self, url: str, seconds: float) -> None:
+        """Pauses the host of a URL from asyncio code. See `pause`."""
+        if self.path is None:
+            self.pause(url, seconds)
+        else:
+            await asyncio.to_thread(self.pause, url, seconds)
+
+    def close(self) -> None:
+        """Closes the connection to the shared file."""
+        with self._file_lock:
+            if self._database is not None:
+                self._database.close()
+
+    def _enqueue(self, host: str) -> tuple[int, int]:
+        ticket = (request_priority.get(), next(self._tickets))
+        with self._lock:
+            queue = self._queues.setdefault(host, [])
+            heapq.heappush(queue, ticket)
+            depth = sum(1 for queued in queue if queued[0] == ticket[0])
+            stats = self._stats[Priority(ticket[0])]
+            stats.max_queue_depth = max(stats.max_queue_depth, depth)
+        return ticket
+
+    def _dequeue(
+        self, host: str, ticket: tuple[int, int], start: float, served: bool
+    ) -> float:
+        """Removes a served, cancelled or interrupted request from the queue.
+
+        Returns:
+            float: The seconds the request waited.
+        """
+        wait = time.monotonic() - start
+        with self._condition:
+            queue = self._queues[host]
+            if queue[0] == ticket:
+                heapq.heappop(queue)
+            else:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+            if served:
+                stats = self._stats[Priority(ticket[0])]
+                stats.acquired += 1
+                stats.wait_time += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                if wait >= MIN_WAIT:
+                    stats.waited += 1
+            # The next request may take a token now.
+            self._condition.notify_all()
+        return wait
+
+    def _try_take(self, host: str, ticket: tuple[int, int]) -> float:
+        """Takes a token for the request if it is its turn.
+
+        Called with the lock held.
+
+        Returns:
+            float: 0 if the token was taken, or else the seconds to wait
+                before trying again.
+        """
+        ahead = self._ahead(host, ticket)
+        return self._take(host, needed=ahead + 1, take=ahead == 0)
+
+    def _ahead(self, host: str, ticket: tuple[int, int]) -> int:
+        """Returns the number of requests of the host served before a request.
+
+        They each take a token first. Called with the lock held.
+        """
+        return sum(1 for queued in self._queues[host] if queued < ticket)
+
+    def _take(self, host: str, needed: int, take: bool) -> float:
+        """Refills a bucket and takes a token if `take` and it holds one.
+
+        Returns:
+            float: 0 if a token was taken, or else the seconds until the bucket
+                holds `needed` tokens.
+        """
+        limit = self.limit(host)
+        now = time.time()
+        with self._bucket(host) as bucket:
+            bucket.tokens = min(
+                float(limit.burst),
+                bucket.tokens + (now - bucket.updated_at) * limit.rate,
+            )
+            bucket.updated_at = now
+            if now < bucket.paused_until:
+                return bucket.paused_until - now
+            if take and bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return max((needed - bucket.tokens) / limit.rate, MIN_WAIT)
+
+    def _pause(self, host: str, paused_until: float) -> None:
+        with self._bucket(host) as bucket:
+            bucket.paused_until = max(bucket.paused_until, paused_until)
+
+    @contextlib.contextmanager
+    def _bucket(self, host: str) -> Iterator[_Bucket]:
+        """Yields the bucket of a host, and saves its changes.
+
+        Called with the lock held when the buckets are kept in memory.
+        """
+        if self.path is None:
+            limit = self.limit(host)
+            yield self._buckets.setdefault(
+                host, _Bucket(float(limit.burst), time.time())
+            )
+            return
+
+        with self._file_lock:
+            connection = self._database.connect()
+            # Holds the write lock of the file until the changes are committed,
+            # so that the processes update the bucket one at a time.
+            connection.execute("BEGIN IMMEDIATE")
+            with connection:
+                row = connection.execute(
+                    "SELECT tokens, updated_at, paused_until FROM buckets "
+                    "WHERE host = ?",
+                    (host,),
+                ).fetchone()
+                bucket = (
+                    _Bucket(*row)
+                    if row
+                    else _Bucket(float(self.limit(host).burst), time.time())
+                )
+                yield bucket
+                connection.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                    (host, bucket.tokens, bucket.updated_at, bucket.paused_until),
+                )
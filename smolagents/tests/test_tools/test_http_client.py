@@ -0,0 +1,171 @@
+"""Tests for the pooled HTTP client of the Papers with Code tools."""
+
+import json
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from technology_scout.tools import http_client, query_papers_with_code
+from technology_scout.tools.http_client import HttpClient, parse_retry_after
+
+AUTHORS = {
+    "count": 1,
+    "next": None,
+    "previous": None,
+    "results": [{"id": "yann-lecun", "full_name": "Yann LeCun"}],
+}
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    """Answers with the given (status, headers) responses, then with 200s."""
+
+    daemon_threads = True
+
+    def __init__(self, responses: list[tuple[int, dict]] | None = None) -> None:
+        super().__init__(("127.0.0.1", 0), ScriptedHandler)
+        self.responses = list(responses or [])
+        self.requests = 0
+        self.connections = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self) -> "ScriptedServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: ScriptedServer
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        status, headers = (
+            self.server.responses.pop(0) if self.server.responses else (200, {})
+        )
+        payload = json.dumps(AUTHORS if status == 200 else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Records the backoff delays instead of waiting for them."""
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+
+class TestRetries:
+    def test_transient_errors_are_retried(self, sleeps: list[float]) -> None:
+        """Tests that 5xx responses are retried until one succeeds."""
+        with ScriptedServer([(503, {}), (502, {})]) as server:
+            client = HttpClient(server.base_url)
+            assert client.get_json("/authors") == AUTHORS
+
+        assert server.requests == 3
+        assert client.stats.retries == 2
+        assert len(sleeps) == 2
+
+    def test_retry_after_is_honored(self, sleeps: list[float]) -> None:
+        """Tests that a 429 waits for the delay of its Retry-After header."""
+        with ScriptedServer([(429, {"Retry-After": "2"})]) as server:
+            HttpClient(server.base_url).get_json("/authors")
+
+        assert sleeps == [2.0]
+
+    def test_backoff_is_capped(self, sleeps: list[float]) -> None:
+        """Tests that the backoff never exceeds max_backoff."""
+        responses = [(500, {}), (429, {"Retry-After": "120"})]
+        with ScriptedServer(responses) as server:
+            HttpClient(server.base_url, max_backoff=1.0).get_json("/authors")
+
+        assert sleeps[0] <= 0.5
+        assert sleeps[1] == 1.0
+
+    def test_gives_up_after_max_retries(self, sleeps: list[float]) -> None:
+        """Tests that the last error is raised once the retries are spent."""
+        with ScriptedServer([(500, {})] * 3) as server:
+            client = HttpClient(server.base_url, max_retries=2)
+            with pytest.raises(requests.exceptions.HTTPError):
+                client.get_json("/authors")
+
+        assert server.requests == 3
+        assert client.stats.failures == 1
+
+    def test_client_errors_are_not_retried(self, sleeps: list[float]) -> None:
+        """Tests that a 404 fails at once."""
+        with ScriptedServer([(404, {})]) as server:
+            client = HttpClient(server.base_url)
+            with pytest.raises(requests.exceptions.HTTPError):
+                client.get_json("/authors")
+
+        assert server.requests == 1
+        assert sleeps == []
+
+
+class TestConnectionPooling:
+    def test_connection_is_reused(self) -> None:
+        """Tests that successive requests share one kept-alive connection."""
+        with ScriptedServer() as server:
+            client = HttpClient(server.base_url)
+            for _ in range(5):
+                client.get_json("/authors", params={"q": "Yann LeCun"})
+
+        assert server.requests == 5
+        assert server.connections == 1
+
+
+class TestParseRetryAfter:
+    def test_seconds_and_dates(self) -> None:
+        """Tests both forms of the Retry-After header."""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(formatdate(0, usegmt=True)) == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestTools:
+    def test_search_author_uses_the_shared_client(self, monkeypatch) -> None:
+        """Tests that the tools send their requests through the pooled client."""
+        with ScriptedServer() as server:
+            monkeypatch.setattr(
+                query_papers_with_code, "client", HttpClient(server.base_url)
+            )
+            authors = query_papers_with_code.search_author("Yann LeCun")
+
+        assert [author.id for author in authors] == ["yann-lecun"]
+
+
+def main() -> None:
+    """Main function."""
+
+    test_connection_pooling = TestConnectionPooling()
+    test_connection_pooling.test_connection_is_reused()
+
+    test_parse_retry_after = TestParseRetryAfter()
+    test_parse_retry_after.test_seconds_and_dates()
+
+
+if __name__ == "__main__":
+    main()
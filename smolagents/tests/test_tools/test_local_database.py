@@ -0,0 +1,47 @@
+"""Tests for the connection of the stores to their SQLite file."""
+
+import tempfile
+from pathlib import Path
+
+from technology_scout.tools.local_database import LocalDatabase
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY)"
+
+
+class TestLocalDatabase:
+    def test_opened_on_first_use(self, tmp_path: Path) -> None:
+        """Tests that the file, its directory and its schema are created on first use."""
+        path = tmp_path / "store" / "local.db"
+        database = LocalDatabase(path, SCHEMA, pragmas={"synchronous": "NORMAL"})
+        assert not path.exists()
+
+        connection = database.connect()
+
+        assert database.connect() is connection
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        assert connection.execute("PRAGMA synchronous").fetchone() == (1,)
+        assert connection.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+        database.close()
+
+    def test_reopened_after_close(self, tmp_path: Path) -> None:
+        """Tests that a closed database opens its file again."""
+        database = LocalDatabase(tmp_path / "local.db", SCHEMA, timeout=1.0)
+        with database.connect() as connection:
+            connection.execute("INSERT INTO t VALUES (1)")
+        database.close()
+
+        assert database.connect() is not connection
+        assert database.connect().execute("SELECT id FROM t").fetchall() == [(1,)]
+        database.close()
+
+
+def main() -> None:
+    """Main function."""
+
+    test_local_database = TestLocalDatabase()
+    with tempfile.TemporaryDirectory() as directory:
+        test_local_database.test_opened_on_first_use(Path(directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Tests for the fast parsing of the Papers with Code responses."""
+
+import dataclasses
+import json
+from pathlib import Path
+
+import pytest
+from technology_scout.tools.http_cache import HttpCache, make_key
+from technology_scout.tools.http_client import HttpClient
+from technology_scout.tools.query_papers_with_code import (
+    ApiResponse,
+    PaperAuthorPaper,
+    page_adapter,
+    paper_projection,
+    parse_page,
+)
+
+FIXTURE_PATH = Path(__file__).parents[3] / "data" / "yann_lecuns_paper_response.json"
+
+
+@pytest.fixture(scope="module")
+def body() -> bytes:
+    """The raw body of the first page of Yann LeCun's papers."""
+    return FIXTURE_PATH.read_bytes()
+
+
+class TestParsePage:
+    def test_same_as_model_validate(self, body: bytes) -> None:
+        """Tests that validating the bytes gives the models of the decoded JSON."""
+        expected = ApiResponse[list[PaperAuthorPaper]].model_validate(json.loads(body))
+        assert parse_page(body, PaperAuthorPaper) == expected
+
+    def test_validators_are_cached(self) -> None:
+        """Tests that the validator of a model is built once."""
+        assert page_adapter(PaperAuthorPaper) is page_adapter(PaperAuthorPaper)
+
+
+class TestPaperProjection:
+    def test_only_the_fields_are_kept(self, body: bytes) -> None:
+        """Tests that the records hold the requested fields only, in slots."""
+        record_type = paper_projection(["id", "title", "published"])
+        page = parse_page(body, record_type)
+
+        record = page.results[0]
+        assert record.id == "v-jepa-2-self-supervised-video-models-enable"
+        assert record.published == "2025-06-11"
+        assert [field.name for field in dataclasses.fields(record)] == [
+            "id",
+            "title",
+            "published",
+        ]
+        assert not hasattr(record, "__dict__")
+        assert not hasattr(record, "abstract")
+        assert page.count == 164
+
+    def test_optional_fields_keep_their_default(self) -> None:
+        """Tests that an optional field may be missing from the JSON."""
+        record_type = paper_projection(["id", "conference"])
+        page = parse_page(
+            b'{"count": 1, "next": null, "previous": null, "results": [{"id": "a"}]}',
+            record_type,
+        )
+        assert page.results == [record_type(id="a", conference=None)]
+
+    def test_projections_are_cached(self) -> None:
+        """Tests that the same fields give the same class."""
+        assert paper_projection(["id", "title"]) is paper_projection(("id", "title"))
+
+    def test_unknown_fields(self) -> None:
+        """Tests that an unknown field is refused."""
+        with pytest.raises(ValueError, match="stars"):
+            paper_projection(["id", "stars"])
+
+
+class TestGetContent:
+    def test_cached_bodies_are_returned_as_is(self, tmp_path: Path) -> None:
+        """Tests that a cached body is returned without being decoded."""
+        cache = HttpCache(tmp_path / "cache.db")
+        cache.put(
+            make_key("http://127.0.0.1:9/authors", {"q": "LeCun"}), b'{"count": 0}'
+        )
+        # Nothing listens on port 9: the body must come from the cache.
+        client = HttpClient("http://127.0.0.1:9", cache=cache)
+
+        assert client.get_content("/authors", params={"q": "LeCun"}) == (
+            b'{"count": 0}'
+        )
+        assert client.get_json("/authors", params={"q": "LeCun"}) == {"count": 0}
+
+
+def main() -> None:
+    """Main function."""
+
+    test_paper_projection = TestPaperProjection()
+    test_paper_projection.test_only_the_fields_are_kept(FIXTURE_PATH.read_bytes())
+
+
+if __name__ == "__main__":
+    main()
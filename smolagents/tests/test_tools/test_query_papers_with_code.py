@@ -1,3 +1,16 @@
+import asyncio
+import inspect
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
 from technology_scout.agent import create_agent
 from technology_scout.tools.query_papers_with_code import (
     search_author,
@@ -6,6 +19,10 @@ from technology_scout.tools.query_papers_with_code import (
     get_author_papers_tool,
 )
 from technology_scout.tools.query_papers_with_code import Author, PaperAuthorPaper
+from technology_scout.tools import query_papers_with_code
+from technology_scout.tools.async_http_client import AsyncHttpClient
+from technology_scout.tools.paper_store import PaperStore
+from technology_scout.tools.serialization import serialize
 
 
 class TestSearchAuthor:
@@ -37,6 +54,281 @@ class TestGetAuthorPapers:
         assert "yann lecun" in authors_names_lowered
 
 
+class AuthorsServer(ThreadingHTTPServer):
+    """Serves authors by name and their papers, after `delay` seconds."""
+
+    daemon_threads = True
+
+    def __init__(self, papers: dict[str, list[dict]], delay: float = 0.1) -> None:
+        super().__init__(("127.0.0.1", 0), AuthorsHandler)
+        self.papers = papers
+        self.delay = delay
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self) -> "AuthorsServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class AuthorsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: AuthorsServer
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/api/v1/authors":
+            author_id = params["q"].lower().replace(" ", "-")
+            results = (
+                [{"id": author_id, "full_name": params["q"]}]
+                if author_id in self.server.papers
+                else []
+            )
+        else:
+            author_id = url.path.split("/")[-2]
+            if author_id not in self.server.papers:
+                self._send(404, {})
+                return
+            results = self.server.papers[author_id][: int(params["items_per_page"])]
+        self._send(
+            200,
+            {"count": len(results), "next": None, "previous": None, "results": results},
+        )
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def make_papers(author_id: str, n: int) -> list[dict]:
+    """Returns papers of an author."""
+    return [
+        {
+            "id": f"{author_id}-paper-{index}",
+            "title": f"Paper {index} of {author_id}",
+            "abstract": "",
+            "authors": [author_id],
+        }
+        for index in range(n)
+    ]
+
+
+@pytest.fixture
+def authors_server(monkeypatch, tmp_path: Path):
+    """Serves three authors to the tools, with an empty store."""
+    papers = {
+        author_id: make_papers(author_id, 10)
+        for author_id in ("yann-lecun", "yoshua-bengio", "geoffrey-hinton")
+    }
+    with AuthorsServer(papers, delay=0.2) as server:
+        monkeypatch.setattr(
+            query_papers_with_code, "async_client", AsyncHttpClient(server.base_url)
+        )
+        monkeypatch.setattr(
+            query_papers_with_code, "paper_store", PaperStore(tmp_path / "papers.db")
+        )
+        yield server
+
+
+class TestLocalFiles:
+    def test_other_api_leaves_the_local_files_alone(self, tmp_path: Path) -> None:
+        """Tests that the cache and the store are disabled for another API, unless given."""
+        env = {
+            **os.environ,
+            "TECHNOLOGY_SCOUT_PAPERS_WITH_CODE_URL": "http://127.0.0.1:9/api/v1",
+            "TECHNOLOGY_SCOUT_PAPER_STORE_PATH": str(tmp_path / "papers.db"),
+        }
+        env.pop("TECHNOLOGY_SCOUT_HTTP_CACHE_PATH", None)
+        code = (
+            "from technology_scout.tools import query_papers_with_code as module; "
+            "print(module.http_cache, module.paper_store.path)"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.split() == ["None", str(tmp_path / "papers.db")]
+
+
+class TestBatchedAuthorTools:
+    def test_search_authors(self, authors_server: AuthorsServer) -> None:
+        """Tests that the names are searched concurrently, and the matches merged."""
+        names = ["Yann LeCun", "Yoshua Bengio", "Nobody", "Geoffrey Hinton"]
+
+        start = time.perf_counter()
+        matches = query_papers_with_code.search_authors(names + ["Yann LeCun"])
+        duration = time.perf_counter() - start
+
+        assert [(match.name, match.id) for match in matches] == [
+            ("Yann LeCun", "yann-lecun"),
+            ("Yoshua Bengio", "yoshua-bengio"),
+            ("Geoffrey Hinton", "geoffrey-hinton"),
+        ]
+        assert authors_server.requests == 4
+        # The four requests, of 0.2s each, are sent at once.
+        assert duration < 0.6
+
+    def test_author_ids_are_strings(self) -> None:
+        """Tests that the tools take the author ids as the slugs `search_authors` returns."""
+        annotations = {
+            name: inspect.signature(function).parameters
+            for name, function in vars(query_papers_with_code).items()
+            if inspect.isfunction(function)
+            and function.__module__ == query_papers_with_code.__name__
+        }
+        author_params = {
+            (name, param.name): param.annotation
+            for name, params in annotations.items()
+            for param in params.values()
+            if param.name in ("author_id", "author_ids")
+        }
+
+        assert ("get_papers_for_authors", "author_ids") in author_params
+        assert ("papers_by_author", "author_id") in author_params
+        assert {
+            key: annotation
+            for key, annotation in author_params.items()
+            if annotation not in (str, str | None, list[str])
+        } == {}
+
+    def test_get_papers_for_authors(self, authors_server: AuthorsServer) -> None:
+        """Tests that the papers of the authors are merged in one compact table."""
+        papers = query_papers_with_code.get_papers_for_authors(
+            ["yann-lecun", "unknown", "yoshua-bengio"], per_author=2
+        )
+
+        assert [(paper.author_id, paper.id) for paper in papers] == [
+            ("yann-lecun", "yann-lecun-paper-0"),
+            ("yann-lecun", "yann-lecun-paper-1"),
+            ("yoshua-bengio", "yoshua-bengio-paper-0"),
+            ("yoshua-bengio", "yoshua-bengio-paper-1"),
+        ]
+        table = serialize(papers)
+        assert table.splitlines()[0] == "id\ttitle\tabstract\tauthors\tauthor_id"
+        assert len(table.splitlines()) == 5
+
+    def test_stored_authors_are_not_fetched(
+        self, authors_server: AuthorsServer
+    ) -> None:
+        """Tests that the authors whose papers are all stored are answered locally."""
+        query_papers_with_code.paper_store.put_papers(
+            make_papers("yann-lecun", 3), author_id="yann-lecun", complete=True
+        )
+
+        papers = query_papers_with_code.get_papers_for_authors(
+            ["yann-lecun", "geoffrey-hinton"], per_author=5
+        )
+
+        assert len(papers) == 8
+        assert authors_server.requests == 1
+
+
+def fetch_papers(author_id: str) -> list[PaperAuthorPaper]:
+    """Returns papers of an author, with long abstracts.
+
+    Args:
+        author_id (str): The ID of the author
+
+    Returns:
+        list[PaperAuthorPaper]: List of papers by the author
+    """
+    return [
+        PaperAuthorPaper(
+            **{**paper, "abstract": "word " * 100, "published": "2024-01-01"}
+        )
+        for paper in make_papers(author_id, 3)
+    ]
+
+
+class TestFieldProjection:
+    def test_default_fields(self) -> None:
+        """Tests that the tools return a few fields of the papers by default."""
+        papers = query_papers_with_code.with_fields(fetch_papers)("yann-lecun")
+
+        assert len(papers) == 3
+        assert serialize(papers).splitlines()[0] == "id\ttitle\tpublished\tauthors"
+
+    def test_fields_on_demand(self) -> None:
+        """Tests that other fields are returned when asked for, abstracts cut."""
+        tool = query_papers_with_code.with_fields(fetch_papers)
+
+        papers = tool("yann-lecun", fields=["id", "abstract"], max_abstract_chars=20)
+
+        assert [paper.id for paper in papers] == [
+            f"yann-lecun-paper-{index}" for index in range(3)
+        ]
+        assert papers[0].abstract == "word " * 3 + "word…"
+        with pytest.raises(ValueError):
+            tool("yann-lecun", fields=["citations"])
+
+    def test_full_record_by_default(self) -> None:
+        """Tests that a tool without default fields returns the whole papers."""
+        tool = query_papers_with_code.with_fields(fetch_papers, default_fields=None)
+
+        paper = tool("yann-lecun")[0]
+
+        assert paper.abstract == "word " * 100
+        assert paper.url_abs is None
+
+    def test_options_are_described(self) -> None:
+        """Tests that the options are in the signature and the docstring."""
+        tool = query_papers_with_code.with_fields(fetch_papers)
+
+        assert list(inspect.signature(tool).parameters) == [
+            "author_id",
+            "fields",
+            "max_abstract_chars",
+        ]
+        assert "\n    fields (list[str] | None): " in tool.__doc__
+        assert "\n    max_abstract_chars (int | None): " in tool.__doc__
+
+    def test_kept_fields(self, authors_server: AuthorsServer) -> None:
+        """Tests that the fields to keep are returned along the asked ones."""
+        tool = query_papers_with_code.with_fields(
+            query_papers_with_code.get_papers_for_authors, keep=["author_id"]
+        )
+
+        papers = tool(["yann-lecun"], per_author=2, fields=["title"])
+
+        assert [(paper.author_id, paper.title) for paper in papers] == [
+            ("yann-lecun", "Paper 0 of yann-lecun"),
+            ("yann-lecun", "Paper 1 of yann-lecun"),
+        ]
+
+    def test_async(self, authors_server: AuthorsServer) -> None:
+        """Tests that the coroutines are projected too."""
+        tool = query_papers_with_code.with_fields(
+            query_papers_with_code.aget_papers_for_authors
+        )
+
+        papers = asyncio.run(tool(["yann-lecun"], per_author=1))
+
+        assert serialize(papers).splitlines()[0] == "id\ttitle\tauthors"
+
+
 class TestSearchAuthorToolUsageByAgent:
     def test_on_simple_task(self) -> None:
         """Tests that the tool is used correctly by the agent."""
@@ -0,0 +1,69 @@
+"""Tests for the search_influencers tool."""
+
+import shutil
+
+import pandas as pd
+import pytest
+from technology_scout.tools import search_influencers as search_influencers_module
+from technology_scout.tools.database import ConnectionManager
+from technology_scout.tools.migrations import migrate
+from technology_scout.tools.search_influencers import (
+    search_influencers,
+    to_fts_query,
+)
+from technology_scout.tools.select_from_db import path_to_database
+
+
+@pytest.fixture(autouse=True)
+def migrated_database(tmp_path, monkeypatch):
+    """Points the tool to a migrated copy of the database."""
+    path = tmp_path / "ai_watch.db"
+    shutil.copy(path_to_database, path)
+    migrate(path)
+    manager = ConnectionManager(path)
+    monkeypatch.setattr(search_influencers_module, "path_to_database", path)
+    monkeypatch.setattr(search_influencers_module, "connection_manager", manager)
+    yield path
+    manager.close()
+
+
+class TestToFtsQuery:
+    def test_quotes_words(self) -> None:
+        """Tests that FTS5 operators in the text are not interpreted."""
+        assert to_fts_query('robots AND "humans"') == '"robots"* OR "AND"* OR "humans"*'
+
+    def test_empty(self) -> None:
+        """Tests that a text without words gives an empty query."""
+        assert to_fts_query("  ?! ") == ""
+
+
+class TestSearchInfluencers:
+    def test_on_topic(self) -> None:
+        """Tests that the tool finds people by a word of their bio."""
+        result = search_influencers("podcast")
+        assert isinstance(result, pd.DataFrame)
+        assert "Lex Fridman" in result["name"].tolist()
+
+    def test_name_matches_first(self) -> None:
+        """Tests that a match on the name ranks first."""
+        result = search_influencers("LeCun")
+        assert result["name"].iloc[0] == "Yann LeCun"
+
+    def test_top_k(self) -> None:
+        """Tests that at most top_k rows are returned."""
+        assert len(search_influencers("ai", top_k=3)) <= 3
+
+    def test_no_words(self) -> None:
+        """Tests that a text without words returns an empty dataframe."""
+        assert search_influencers("?!").empty
+
+
+def main() -> None:
+    """Main function."""
+
+    test_to_fts_query = TestToFtsQuery()
+    test_to_fts_query.test_quotes_words()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Tests for the compact serialization of tool results."""
+
+import asyncio
+import inspect
+
+import pandas as pd
+from technology_scout.tools.parsing import projection
+from technology_scout.tools.query_papers_with_code import Author, PaperAuthorPaper
+from technology_scout.tools.serialization import (
+    EMPTY_RESULT,
+    compact_output,
+    serialize,
+    to_compact_table,
+)
+
+
+def make_paper(**fields) -> PaperAuthorPaper:
+    """Returns a paper with the required fields filled."""
+    return PaperAuthorPaper(
+        **{
+            "id": "paper-id",
+            "title": "A Title",
+            "abstract": "An abstract.",
+            "authors": ["Yann LeCun", "Someone Else"],
+            **fields,
+        }
+    )
+
+
+class TestToCompactTable:
+    def test_header_once(self) -> None:
+        """Tests that column names appear once, as a header line."""
+        result = to_compact_table(["a", "b"], [(1, "x"), (2, "y")])
+        assert result == "a\tb\n1\tx\n2\ty"
+
+    def test_null_columns_are_dropped(self) -> None:
+        """Tests that columns null on every row are dropped."""
+        result = to_compact_table(["a", "b"], [(1, None), (2, None)])
+        assert result.splitlines()[0] == "a"
+
+    def test_long_values_are_truncated(self) -> None:
+        """Tests that values are truncated to the maximum field length."""
+        result = to_compact_table(["a"], [("x" * 100,)], max_field_chars=10)
+        assert result.splitlines()[1] == "x" * 9 + "…"
+
+    def test_values_stay_on_one_line(self) -> None:
+        """Tests that tabs and newlines inside values do not break the table."""
+        result = to_compact_table(["a", "b"], [("x\ty\nz", 1)])
+        assert result.splitlines()[1] == "x y z\t1"
+
+    def test_max_rows(self) -> None:
+        """Tests that rows beyond the maximum are summarized."""
+        result = to_compact_table(["a"], [(i,) for i in range(5)], max_rows=2)
+        assert result.splitlines()[1:] == ["0", "1", "[... 3 more rows]"]
+
+
+class TestSerialize:
+    def test_dataframe(self) -> None:
+        """Tests that dataframes are rendered as a table."""
+        df = pd.DataFrame({"name": ["Lex Fridman"], "followers": [4200000]})
+        assert serialize(df) == "name\tfollowers\nLex Fridman\t4200000"
+
+    def test_models(self) -> None:
+        """Tests that null fields of pydantic models are elided."""
+        result = serialize([make_paper(), make_paper(id="other")])
+        header = result.splitlines()[0].split("\t")
+
+        assert header == ["id", "title", "abstract", "authors"]
+        assert "Yann LeCun; Someone Else" in result
+
+    def test_single_model(self) -> None:
+        """Tests that a single model is rendered as a one-row table."""
+        result = serialize(Author(id="yann-lecun", full_name="Yann LeCun"))
+        assert result == "id\tfull_name\nyann-lecun\tYann LeCun"
+
+    def test_projections(self) -> None:
+        """Tests that the dataclass projections of models are rendered as a table."""
+        record_type = projection(PaperAuthorPaper, ["id", "title"])
+
+        records = [record_type(id="a", title="A Title"), record_type(id="b", title="B")]
+
+        assert serialize(records) == "id\ttitle\na\tA Title\nb\tB"
+        assert serialize(records[0]) == "id\ttitle\na\tA Title"
+
+    def test_empty(self) -> None:
+        """Tests that empty results have an explicit rendering."""
+        assert serialize([]) == EMPTY_RESULT
+        assert serialize(None) == EMPTY_RESULT
+
+    def test_is_shorter_than_default(self) -> None:
+        """Tests that the compact rendering is shorter than the default one."""
+        papers = [make_paper(id=f"paper-{i}") for i in range(10)]
+        assert len(serialize(papers)) < len(str(papers)) / 2
+
+
+class TestCompactOutput:
+    def test_keeps_metadata(self) -> None:
+        """Tests that the wrapper keeps the name and docstring of the function."""
+
+        def get_authors(name: str) -> list[Author]:
+            """Gets authors."""
+            return [Author(id="id", full_name=name)]
+
+        wrapped = compact_output(get_authors)
+
+        assert wrapped.__name__ == "get_authors"
+        assert wrapped.__doc__ == "Gets authors."
+        assert wrapped.__annotations__["return"] is str
+        assert get_authors.__annotations__["return"] == list[Author]
+        assert wrapped("Yann LeCun") == "id\tfull_name\nid\tYann LeCun"
+
+    def test_documents_text_result(self) -> None:
+        """Tests that the docstring of the wrapper documents a text result."""
+
+        def get_authors(name: str) -> list[Author]:
+            """Gets authors.
+
+            Args:
+                name (str): The name of the authors.
+
+            Returns:
+                list[Author]: The matching authors.
+            """
+            return []
+
+        wrapped = compact_output(get_authors)
+
+        assert wrapped.__doc__.endswith(
+            "Returns:\n    str: The matching authors, as a compact text table."
+        )
+        assert "name (str): The name of the authors." in wrapped.__doc__
+
+    def test_async(self) -> None:
+        """Tests that coroutine functions are wrapped into coroutine functions."""
+
+        async def get_authors(name: str) -> list[Author]:
+            """Gets authors."""
+            return [Author(id="id", full_name=name)]
+
+        wrapped = compact_output(get_authors)
+
+        assert inspect.iscoroutinefunction(wrapped)
+        result = asyncio.run(wrapped("Yann LeCun"))
+        assert result == "id\tfull_name\nid\tYann LeCun"
+
+
+def main() -> None:
+    """Main function."""
+
+    test_serialize = TestSerialize()
+    test_serialize.test_dataframe()
+    test_serialize.test_models()
+    test_serialize.test_is_shorter_than_default()
+
+
+if __name__ == "__main__":
+    main()